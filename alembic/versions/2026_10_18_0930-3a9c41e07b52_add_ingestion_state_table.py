@@ -0,0 +1,42 @@
+"""add ingestion state table
+
+Revision ID: 3a9c41e07b52
+Revises: d814d975d80f
+Create Date: 2026-10-18 09:30:12.418207
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3a9c41e07b52"
+down_revision: str | Sequence[str] | None = "d814d975d80f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ingestion_state",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("season", sa.String(length=10), nullable=False),
+        sa.Column("last_round", sa.Integer(), nullable=True),
+        sa.Column("content_digest", sa.String(length=64), nullable=True),
+        sa.Column("rows_loaded", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("closed", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_ingestion_state_season", "ingestion_state", ["season"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ingestion_state_season", table_name="ingestion_state")
+    op.drop_table("ingestion_state")
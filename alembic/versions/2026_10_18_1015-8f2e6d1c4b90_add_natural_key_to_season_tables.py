@@ -0,0 +1,59 @@
+"""add natural key to season gameweek tables
+
+Revision ID: 8f2e6d1c4b90
+Revises: 3a9c41e07b52
+Create Date: 2026-10-18 10:15:47.902311
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8f2e6d1c4b90"
+down_revision: str | Sequence[str] | None = "3a9c41e07b52"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+seasons = [
+    "2016_17",
+    "2017_18",
+    "2018_19",
+    "2019_20",
+    "2020_21",
+    "2021_22",
+    "2022_23",
+    "2023_24",
+    "2024_25",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for season in seasons:
+        table = f"player_gameweek_history_{season}"
+
+        # Earlier loads could insert the same row twice; keep one copy of each
+        op.execute(
+            f"""
+            DELETE FROM {table} a
+            USING {table} b
+            WHERE a.ctid < b.ctid
+              AND a.element = b.element
+              AND a.fixture = b.fixture
+              AND a.round = b.round
+            """
+        )
+        op.create_unique_constraint(
+            f"uq_{table}_element_fixture_round",
+            table,
+            ["element", "fixture", "round"],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for season in seasons:
+        table = f"player_gameweek_history_{season}"
+        op.drop_constraint(f"uq_{table}_element_fixture_round", table, type_="unique")
@@ -0,0 +1,41 @@
+"""add rejected rows table
+
+Revision ID: c57a0e93d1f4
+Revises: 8f2e6d1c4b90
+Create Date: 2026-10-18 10:40:05.133870
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c57a0e93d1f4"
+down_revision: str | Sequence[str] | None = "8f2e6d1c4b90"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "rejected_rows",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("table_name", sa.String(length=100), nullable=False),
+        sa.Column("source_line", sa.Integer(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=False),
+        sa.Column("row_data", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_rejected_rows_table_name", "rejected_rows", ["table_name"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_rejected_rows_table_name", table_name="rejected_rows")
+    op.drop_table("rejected_rows")
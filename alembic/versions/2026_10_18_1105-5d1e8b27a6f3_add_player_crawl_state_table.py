@@ -0,0 +1,43 @@
+"""add player crawl state table
+
+Revision ID: 5d1e8b27a6f3
+Revises: c57a0e93d1f4
+Create Date: 2026-10-18 11:05:41.207316
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d1e8b27a6f3"
+down_revision: str | Sequence[str] | None = "c57a0e93d1f4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "player_crawl_state",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("fpl_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("content_digest", sa.String(length=64), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("last_success_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_player_crawl_state_fpl_id", "player_crawl_state", ["fpl_id"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_player_crawl_state_fpl_id", table_name="player_crawl_state")
+    op.drop_table("player_crawl_state")
@@ -0,0 +1,29 @@
+"""add element digest to player crawl state
+
+Revision ID: 9b4e6c2d7a15
+Revises: 5d1e8b27a6f3
+Create Date: 2026-10-18 11:40:12.584903
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4e6c2d7a15"
+down_revision: str | Sequence[str] | None = "5d1e8b27a6f3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("player_crawl_state", sa.Column("element_digest", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("player_crawl_state", "element_digest")
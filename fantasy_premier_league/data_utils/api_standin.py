@@ -0,0 +1,420 @@
+"""
+Local stand-in for the FPL API that replays recorded payloads.
+
+Payloads are kept in a directory that mirrors the API's paths:
+``bootstrap-static/`` is stored as ``bootstrap-static.json``,
+``element-summary/12/`` as ``element-summary/12.json``, and so on. They
+can be recorded from the live API, or generated synthetically where the
+API cannot be reached (CI, air-gapped machines).
+
+The server answers ``/api/<path>/`` from that directory and can inject
+latency, 5xx errors and 429 responses with a Retry-After header, so the
+loaders' throughput and rate control can be measured and tuned against
+it. Point the loaders at it with FPL_API_BASE_URL.
+"""
+
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from fantasy_premier_league.data_utils.gameweek_live import finished_gameweeks, fixtures_frame
+from fantasy_premier_league.data_utils.http_client import fpl_api_url, get_http_client, http_get
+
+API_PREFIX = "/api/"
+
+# Stats of a gameweek in the element-summary history and the event-live endpoint
+_GAMEWEEK_STATS = (
+    "minutes",
+    "goals_scored",
+    "assists",
+    "clean_sheets",
+    "goals_conceded",
+    "own_goals",
+    "penalties_saved",
+    "penalties_missed",
+    "yellow_cards",
+    "red_cards",
+    "saves",
+    "bonus",
+    "bps",
+    "influence",
+    "creativity",
+    "threat",
+    "ict_index",
+    "total_points",
+)
+
+
+def payload_path(directory: Path | str, api_path: str) -> Path:
+    """Get the file an API path (e.g. "element-summary/12/") is stored in."""
+    return Path(directory) / f"{api_path.strip('/')}.json"
+
+
+def _save(directory: Path | str, api_path: str, payload: Any) -> None:
+    path = payload_path(directory, api_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def record_payloads(
+    directory: Path | str, element_ids: list[int] | None = None, gameweeks: list[int] | None = None
+) -> int:
+    """
+    Record live API payloads for replay.
+
+    Fetches bootstrap-static, fixtures, the event-live payload of each
+    gameweek and the element summary of each player.
+
+    Args:
+        directory: Directory to store the payloads in
+        element_ids: Players to record (defaults to every player in bootstrap-static)
+        gameweeks: Gameweeks to record (defaults to every gameweek with a scored fixture)
+
+    Returns:
+        Number of payloads recorded
+    """
+    api_paths = ["bootstrap-static/", "fixtures/"]
+    payloads = {path: _fetch_json(path) for path in api_paths}
+    if gameweeks is None:
+        gameweeks = finished_gameweeks(fixtures_frame(payloads["fixtures/"]))
+    if element_ids is None:
+        element_ids = [element["id"] for element in payloads["bootstrap-static/"]["elements"]]
+    api_paths += [f"event/{gameweek}/live/" for gameweek in gameweeks]
+    api_paths += [f"element-summary/{element_id}/" for element_id in element_ids]
+
+    for api_path in api_paths:
+        payload = payloads[api_path] if api_path in payloads else _fetch_json(api_path)
+        _save(directory, api_path, payload)
+    return len(api_paths)
+
+
+def _fetch_json(api_path: str) -> Any:
+    response = http_get(fpl_api_url(api_path))
+    response.raise_for_status()
+    return response.json()
+
+
+def synthetic_payloads(
+    directory: Path | str, *, players: int = 700, teams: int = 20, gameweeks: int = 10, seed: int = 0
+) -> int:
+    """
+    Generate a consistent synthetic season for replay.
+
+    Every team plays one fixture per gameweek; every player has a
+    history row per gameweek in their element summary and a matching
+    entry in the event-live payload.
+
+    Args:
+        directory: Directory to store the payloads in
+        players: Number of players
+        teams: Number of teams (even)
+        gameweeks: Number of played gameweeks
+        seed: Random seed, so runs are repeatable
+
+    Returns:
+        Number of payloads written
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 8, 16, 19, 0)
+
+    fixtures = []
+    team_ids = list(range(1, teams + 1))
+    for gameweek in range(1, gameweeks + 1):
+        rng.shuffle(team_ids)
+        kickoff = (start + timedelta(weeks=gameweek - 1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for home, away in zip(team_ids[::2], team_ids[1::2], strict=True):
+            fixtures.append(
+                {
+                    "id": len(fixtures) + 1,
+                    "event": gameweek,
+                    "team_h": home,
+                    "team_a": away,
+                    "team_h_score": rng.randint(0, 4),
+                    "team_a_score": rng.randint(0, 4),
+                    "kickoff_time": kickoff,
+                    "finished": True,
+                }
+            )
+    fixture_of = {
+        (fixture["event"], team): fixture for fixture in fixtures for team in (fixture["team_h"], fixture["team_a"])
+    }
+
+    teams_data = [
+        {
+            "id": team,
+            "name": f"Team {team}",
+            "short_name": f"T{team:02d}",
+            "code": 100 + team,
+            **{
+                f"strength_{kind}_{side}": rng.randint(1000, 1400)
+                for kind in ("attack", "defence", "overall")
+                for side in ("home", "away")
+            },
+        }
+        for team in range(1, teams + 1)
+    ]
+    elements = [
+        {
+            "id": element,
+            "first_name": f"First{element}",
+            "second_name": f"Second{element}",
+            "web_name": f"Player{element}",
+            "team": (element - 1) % teams + 1,
+            "element_type": rng.randint(1, 4),
+            "now_cost": rng.randint(40, 130),
+        }
+        for element in range(1, players + 1)
+    ]
+
+    live: dict[int, list[dict[str, Any]]] = {gameweek: [] for gameweek in range(1, gameweeks + 1)}
+    written = 0
+    for element in elements:
+        history = []
+        for gameweek in range(1, gameweeks + 1):
+            fixture = fixture_of[(gameweek, element["team"])]
+            was_home = fixture["team_h"] == element["team"]
+            stats = _random_stats(rng)
+            history.append(
+                {
+                    "element": element["id"],
+                    "fixture": fixture["id"],
+                    "opponent_team": fixture["team_a"] if was_home else fixture["team_h"],
+                    "was_home": was_home,
+                    "kickoff_time": fixture["kickoff_time"],
+                    "team_h_score": fixture["team_h_score"],
+                    "team_a_score": fixture["team_a_score"],
+                    "round": gameweek,
+                    "value": element["now_cost"],
+                    "selected": rng.randint(0, 2_000_000),
+                    **stats,
+                }
+            )
+            live[gameweek].append(
+                {"id": element["id"], "stats": stats, "explain": [{"fixture": fixture["id"], "stats": []}]}
+            )
+        history_past = [
+            {
+                "season_name": "2023/24",
+                "start_cost": element["now_cost"],
+                "end_cost": element["now_cost"],
+                **_random_stats(rng),
+            }
+        ]
+        _save(
+            directory,
+            f"element-summary/{element['id']}/",
+            {"fixtures": [], "history": history, "history_past": history_past},
+        )
+        written += 1
+
+    _save(directory, "bootstrap-static/", {"teams": teams_data, "elements": elements, "events": []})
+    _save(directory, "fixtures/", fixtures)
+    for gameweek, entries in live.items():
+        _save(directory, f"event/{gameweek}/live/", {"elements": entries})
+    return written + 2 + len(live)
+
+
+def _random_stats(rng: random.Random) -> dict[str, Any]:
+    """Random per-gameweek stats in the API's types (ICT values are strings)."""
+    minutes = rng.choice((0, 0, 90, 90, 90, 60, 25))
+    stats: dict[str, Any] = {name: rng.randint(0, 2) if minutes else 0 for name in _GAMEWEEK_STATS}
+    stats["minutes"] = minutes
+    stats["bps"] = rng.randint(0, 40) if minutes else 0
+    for name in ("influence", "creativity", "threat", "ict_index"):
+        stats[name] = f"{rng.uniform(0, 50) if minutes else 0:.1f}"
+    stats["total_points"] = rng.randint(1, 12) if minutes else 0
+    return stats
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """
+    Latency and faults a StandInServer injects.
+
+    Attributes:
+        latency: Seconds added to every response
+        jitter: Up to this many extra seconds added at random
+        error_rate: Fraction of requests answered with 503
+        throttle_rate: Fraction of requests answered with 429
+        retry_after: Retry-After sent with 429 responses, in whole seconds
+        seed: Random seed for the injected latency and faults
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: int = 1
+    seed: int | None = None
+
+
+class StandInServer:
+    """
+    Threaded HTTP server replaying recorded FPL API payloads with injected faults.
+
+    Use as a context manager; base_url is the API root to set as FPL_API_BASE_URL.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        *,
+        port: int = 0,
+        faults: FaultProfile | None = None,
+    ) -> None:
+        """
+        Initialize the server (it starts serving in start()).
+
+        Args:
+            directory: Directory holding the payloads
+            port: Port to listen on (0 picks a free one)
+            faults: Latency and faults to inject (none if None)
+        """
+        self.directory = Path(directory)
+        self.faults = faults if faults is not None else FaultProfile()
+        self.responses: Counter[int] = Counter()
+        self._random = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """API root served, without a trailing slash."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX.rstrip('/')}"
+
+    def start(self) -> "StandInServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _draw(self) -> tuple[float, int]:
+        """Pick a request's delay and injected status (0 for none)."""
+        with self._lock:
+            delay = self.faults.latency + self._random.uniform(0, self.faults.jitter)
+            roll = self._random.random()
+        if roll < self.faults.throttle_rate:
+            return delay, HTTPStatus.TOO_MANY_REQUESTS
+        if roll < self.faults.throttle_rate + self.faults.error_rate:
+            return delay, HTTPStatus.SERVICE_UNAVAILABLE
+        return delay, 0
+
+    def _count(self, status: int) -> None:
+        with self._lock:
+            self.responses[status] += 1
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                delay, injected = server._draw()
+                if delay:
+                    time.sleep(delay)
+
+                path = self.path.split("?", 1)[0]
+                body = b""
+                headers = {}
+                if injected:
+                    status = injected
+                    if injected == HTTPStatus.TOO_MANY_REQUESTS:
+                        headers["Retry-After"] = str(server.faults.retry_after)
+                elif not path.startswith(API_PREFIX):
+                    status = HTTPStatus.NOT_FOUND
+                else:
+                    file = payload_path(server.directory, path.removeprefix(API_PREFIX))
+                    if file.is_file() and server.directory.resolve() in file.resolve().parents:
+                        status = HTTPStatus.OK
+                        body = file.read_bytes()
+                        headers["Content-Type"] = "application/json"
+                        if "gzip" in self.headers.get("Accept-Encoding", ""):
+                            body = gzip.compress(body, compresslevel=1)
+                            headers["Content-Encoding"] = "gzip"
+                    else:
+                        status = HTTPStatus.NOT_FOUND
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                server._count(int(status))
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record, generate or replay FPL API payloads")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Record payloads from the live API (or FPL_API_BASE_URL)")
+    record.add_argument("directory", type=Path)
+    record.add_argument("--limit", type=int, default=None, help="Record only the first N players' summaries")
+
+    generate = commands.add_parser("generate", help="Generate a synthetic season")
+    generate.add_argument("directory", type=Path)
+    generate.add_argument("--players", type=int, default=700)
+    generate.add_argument("--gameweeks", type=int, default=10)
+
+    serve = commands.add_parser("serve", help="Replay payloads over HTTP")
+    serve.add_argument("directory", type=Path)
+    serve.add_argument("--port", type=int, default=8700)
+    serve.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    serve.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds at random")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    serve.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    serve.add_argument("--retry-after", type=int, default=1, help="Retry-After of 429 responses, in whole seconds")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        element_ids = None
+        if args.limit is not None:
+            elements = _fetch_json("bootstrap-static/")["elements"]
+            element_ids = [element["id"] for element in elements[: args.limit]]
+        print(f"Recorded {record_payloads(args.directory, element_ids)} payloads to {args.directory}")
+        get_http_client().report()
+    elif args.command == "generate":
+        count = synthetic_payloads(args.directory, players=args.players, gameweeks=args.gameweeks)
+        print(f"Generated {count} payloads in {args.directory}")
+    else:
+        server = StandInServer(
+            args.directory,
+            port=args.port,
+            faults=FaultProfile(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.retry_after),
+        )
+        print(f"Serving {args.directory} at {server.base_url} (set FPL_API_BASE_URL to use it)")
+        try:
+            server.start()
+            server._thread.join()
+        except KeyboardInterrupt:
+            server.stop()
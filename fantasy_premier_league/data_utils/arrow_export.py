@@ -0,0 +1,208 @@
+"""
+Arrow IPC export of the complete gameweek history.
+
+The season tables and player_gameweek_history are read out of Postgres
+with COPY, combined into one table and written as an uncompressed Arrow
+IPC (Feather v2) file with dictionary-encoded strings. Readers memory-map
+the file, so processes on the same host share one page-cached copy of the
+data instead of each deserializing its own.
+"""
+
+import argparse
+import os
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+import pyarrow as pa
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, Integer, Table
+
+from fantasy_premier_league.data_utils.bulk_writer import quote_identifier
+from fantasy_premier_league.data_utils.http_cache import default_cache_dir
+from fantasy_premier_league.database import get_engine
+from fantasy_premier_league.models import player_gameweek_history  # noqa: F401 (registers the season tables)
+from fantasy_premier_league.models.base import Base
+from fantasy_premier_league.models.column_plan import column_plan
+from fantasy_premier_league.models.player_history import PlayerGameweekHistory
+
+SEASON_TABLE_PREFIX = "player_gameweek_history_"
+
+# Column holding the table each exported row came from
+SOURCE_COLUMN = "source_table"
+
+# player_gameweek_history columns renamed to their season-table equivalents
+_HISTORY_RENAMES = {"gameweek": "round", "fixture_id": "fixture", "opponent_team_id": "opponent_team"}
+
+
+def default_export_path() -> Path:
+    """Get the default location of the exported file."""
+    return default_cache_dir() / "exports" / "gameweek_history.arrow"
+
+
+def history_tables() -> list[Table]:
+    """
+    Get the tables making up the gameweek history.
+
+    Returns:
+        The season tables in season order, followed by player_gameweek_history
+    """
+    season_tables = sorted(
+        (table for name, table in Base.metadata.tables.items() if name.startswith(SEASON_TABLE_PREFIX)),
+        key=lambda table: table.name,
+    )
+    return [*season_tables, PlayerGameweekHistory.__table__]
+
+
+def _polars_dtype(column_type: Any) -> pl.DataType:
+    """Get the Polars type a column is read as (booleans are converted after reading)."""
+    if isinstance(column_type, BigInteger):
+        return pl.Int64
+    if isinstance(column_type, Integer):
+        return pl.Int32
+    if isinstance(column_type, Float):
+        return pl.Float64
+    if isinstance(column_type, DateTime):
+        return pl.Datetime("us")
+    return pl.String
+
+
+def _read_table(cursor: Any, table: Table) -> pl.DataFrame:
+    """Read a whole table with COPY TO STDOUT."""
+    specs = column_plan(table).columns
+    buffer = BytesIO()
+    cursor.copy_expert(f"COPY {quote_identifier(table.name)} TO STDOUT WITH (FORMAT csv, HEADER)", buffer)
+    buffer.seek(0)
+    frame = pl.read_csv(buffer, schema_overrides={spec.name: _polars_dtype(spec.type) for spec in specs})
+    # COPY writes booleans as t/f
+    booleans = [spec.name for spec in specs if isinstance(spec.type, Boolean)]
+    return frame.with_columns([(pl.col(name) == "t").alias(name) for name in booleans])
+
+
+def _combine(frames: dict[str, pl.DataFrame]) -> pl.DataFrame:
+    """Stack the tables' rows into one frame with a season and source table column."""
+    combined = []
+    for table_name, frame in frames.items():
+        if table_name.startswith(SEASON_TABLE_PREFIX):
+            season = table_name.removeprefix(SEASON_TABLE_PREFIX).replace("_", "-")
+            rows = frame.with_columns(pl.lit(season).alias("season"))
+        else:
+            rows = frame.rename({old: new for old, new in _HISTORY_RENAMES.items() if old in frame.columns})
+        combined.append(rows.with_columns(pl.lit(table_name).alias(SOURCE_COLUMN)))
+    return pl.concat(combined, how="diagonal_relaxed")
+
+
+def _dictionary_encode_strings(table: pa.Table) -> pa.Table:
+    """Dictionary-encode every string column, with one dictionary per column."""
+    # A single chunk per column, as the IPC file format allows one dictionary per field
+    table = table.combine_chunks()
+    for index, field in enumerate(table.schema):
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            table = table.set_column(index, field.name, table.column(index).dictionary_encode())
+    return table
+
+
+def write_history_file(frame: pl.DataFrame, path: Path | str) -> Path:
+    """
+    Write a frame as an uncompressed Arrow IPC file with dictionary-encoded strings.
+
+    The file is written next to its destination and moved into place, so
+    readers never map a partially written file.
+
+    Args:
+        frame: Rows to write
+        path: Destination file
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = _dictionary_encode_strings(frame.to_arrow())
+
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".part", delete=False) as f:
+        temp_path = f.name
+    try:
+        # Uncompressed, so readers can use the mapped buffers without decoding them
+        with pa.OSFile(temp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    except Exception:
+        os.unlink(temp_path)
+        raise
+    os.replace(temp_path, path)
+    return path
+
+
+def export_gameweek_history(path: Path | str | None = None) -> int:
+    """
+    Export every gameweek history table to one Arrow IPC file.
+
+    The season tables' rows get a season column derived from the table
+    name; player_gameweek_history's gameweek, fixture_id and
+    opponent_team_id are renamed to round, fixture and opponent_team.
+    Every row is tagged with the table it came from.
+
+    Args:
+        path: Destination file (defaults to default_export_path())
+
+    Returns:
+        Number of rows exported
+    """
+    path = Path(path) if path is not None else default_export_path()
+    connection = get_engine().raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            # One snapshot for all tables, so the export is consistent
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            frames = {table.name: _read_table(cursor, table) for table in history_tables()}
+        connection.rollback()
+    finally:
+        connection.close()
+
+    frame = _combine(frames)
+    write_history_file(frame, path)
+    print(f"Exported {frame.height} rows of gameweek history to {path}")
+    return frame.height
+
+
+def open_gameweek_history(path: Path | str | None = None) -> pa.Table:
+    """
+    Memory-map an exported history file as an Arrow table.
+
+    The table's buffers point into the mapped file, so no data is copied
+    and processes mapping the same file share the operating system's
+    page cache.
+
+    Args:
+        path: Exported file (defaults to default_export_path())
+
+    Returns:
+        Arrow table backed by the mapped file
+    """
+    source = pa.memory_map(str(path if path is not None else default_export_path()), "r")
+    return pa.ipc.open_file(source).read_all()
+
+
+def read_gameweek_history(path: Path | str | None = None, columns: list[str] | None = None) -> pl.DataFrame:
+    """
+    Read an exported history file into a Polars DataFrame through a memory map.
+
+    Dictionary-encoded string columns are read as Categorical.
+
+    Args:
+        path: Exported file (defaults to default_export_path())
+        columns: Columns to read (all if omitted)
+
+    Returns:
+        The exported gameweek history
+    """
+    return pl.read_ipc(path if path is not None else default_export_path(), columns=columns, memory_map=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the gameweek history to an Arrow IPC file")
+    parser.add_argument("--output", type=Path, default=None, help="Destination file (defaults to the cache directory)")
+    args = parser.parse_args()
+
+    export_gameweek_history(args.output)
@@ -0,0 +1,360 @@
+"""
+Bulk write helpers for Fantasy Premier League data loading.
+
+This module streams pandas or Polars DataFrames into PostgreSQL tables with
+COPY FROM STDIN, so a whole season can be written in one round-trip
+instead of one INSERT and commit per row. Upserts COPY into a temporary
+staging table and merge it with a single INSERT ... ON CONFLICT. Batches
+the database refuses are bisected under SAVEPOINTs, so a few bad rows
+are isolated without giving up bulk writes for the rest.
+"""
+
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from dataclasses import dataclass
+from io import BytesIO, StringIO
+from typing import Any, Literal
+from uuid import uuid4
+
+import pandas as pd
+import polars as pl
+import psycopg2
+from psycopg2.extras import execute_values
+from sqlalchemy import Integer, Table
+
+from fantasy_premier_league.models.column_plan import column_plan
+
+
+@dataclass(frozen=True)
+class MergeRule:
+    """
+    How an upsert merges incoming rows with the stored ones.
+
+    Attributes:
+        conflict_columns: Columns of the natural key (a unique constraint on the table)
+        on_conflict: "update" to overwrite existing rows, "nothing" to keep them
+        exclude_from_update: Columns never overwritten on existing rows (besides
+            the primary key and the natural key)
+    """
+
+    conflict_columns: Sequence[str]
+    on_conflict: Literal["update", "nothing"] = "update"
+    exclude_from_update: Iterable[str] = ()
+
+
+# Staging column numbering the rows in the order they were copied
+_COPY_ORDER = "_copy_order"
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a PostgreSQL identifier (needed for mixed-case columns like "GW")."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def prepare_frame_for_copy(
+    df: pd.DataFrame | pl.DataFrame, table: Table
+) -> pd.DataFrame | pl.DataFrame:
+    """
+    Restrict a frame to the table's columns and make it COPY-safe.
+
+    Integer columns are rounded into nullable integers, because COPY
+    (unlike a bound INSERT parameter) rejects text such as "3.0" for
+    an integer column.
+
+    Args:
+        df: Frame holding the rows to write
+        table: Target SQLAlchemy table
+
+    Returns:
+        Frame with the table's columns in table order
+    """
+    plan = column_plan(table)
+    columns = [name for name in plan.names if name in df.columns]
+    if isinstance(df, pl.DataFrame):
+        integers = {col.name for col in plan.columns if isinstance(col.type, Integer)}
+        return df.select(
+            pl.col(name).cast(pl.Float64, strict=False).round(0).cast(pl.Int64)
+            if name in integers
+            else pl.col(name)
+            for name in columns
+        )
+
+    frame = df[columns].copy()
+
+    for column in plan.columns:
+        if column.name in frame.columns and isinstance(column.type, Integer):
+            frame[column.name] = (
+                pd.to_numeric(frame[column.name], errors="coerce").round().astype("Int64")
+            )
+
+    return frame
+
+
+def copy_dataframe(cursor: Any, table: Table, df: pd.DataFrame | pl.DataFrame) -> int:
+    """
+    Stream a DataFrame into a table with COPY FROM STDIN.
+
+    The caller owns the transaction: nothing is committed here.
+
+    Args:
+        cursor: psycopg2 cursor
+        table: Target SQLAlchemy table
+        df: Frame holding the rows to write
+
+    Returns:
+        Number of rows copied
+    """
+    frame = prepare_frame_for_copy(df, table)
+    if len(frame) == 0:
+        return 0
+
+    _copy_frame(cursor, quote_identifier(table.name), frame)
+    return len(frame)
+
+
+def upsert_dataframe(
+    cursor: Any,
+    table: Table,
+    df: pd.DataFrame | pl.DataFrame,
+    rule: MergeRule,
+) -> tuple[int, int]:
+    """
+    Insert or update a DataFrame's rows by natural key in one statement.
+
+    Rows are COPY'd into a temporary table shaped like the target, then
+    merged with INSERT ... ON CONFLICT. Duplicate keys within the frame
+    collapse to the last row, and rows identical to the stored ones are
+    not rewritten. The caller owns the transaction: nothing is committed
+    here.
+
+    Args:
+        cursor: psycopg2 cursor
+        table: Target SQLAlchemy table, with a unique constraint on the rule's key
+        df: Frame holding the rows to write
+        rule: Natural key and update behaviour of the merge
+
+    Returns:
+        Tuple of (rows inserted, rows updated)
+    """
+    frame = prepare_frame_for_copy(df, table)
+    if len(frame) == 0:
+        return 0, 0
+
+    target = quote_identifier(table.name)
+    staging = quote_identifier(f"_stage_{table.name}")
+    # Dropped explicitly on success; a rollback discards it along with the rows
+    cursor.execute(f"CREATE TEMP TABLE {staging} (LIKE {target} INCLUDING DEFAULTS)")
+
+    # Rows without ids get fresh UUIDs, as the ORM's client-side default would
+    columns = list(frame.columns)
+    if "id" in column_plan(table).names and "id" not in columns:
+        cursor.execute(
+            f"ALTER TABLE {staging} ALTER COLUMN id SET DEFAULT gen_random_uuid()"
+        )
+        columns.insert(0, "id")
+    # Numbers the rows in COPY order, so the last duplicate of a key wins
+    cursor.execute(f"ALTER TABLE {staging} ADD COLUMN {_COPY_ORDER} bigserial")
+    _copy_frame(cursor, staging, frame)
+
+    column_list = ", ".join(quote_identifier(name) for name in columns)
+    key_list = ", ".join(quote_identifier(name) for name in rule.conflict_columns)
+    sql = (
+        f"INSERT INTO {target} ({column_list}) "
+        f"SELECT DISTINCT ON ({key_list}) {column_list} FROM {staging} "
+        f"ORDER BY {key_list}, {_COPY_ORDER} DESC "
+        + _on_conflict_clause(table, columns, rule)
+    )
+
+    # xmax is 0 only for freshly inserted row versions
+    cursor.execute(sql + "RETURNING (xmax = 0)")
+    inserted = sum(1 for (is_insert,) in cursor.fetchall() if is_insert)
+    updated_count = cursor.rowcount - inserted
+
+    cursor.execute(f"DROP TABLE {staging}")
+    return inserted, updated_count
+
+
+def upsert_rows(
+    cursor: Any,
+    table: Table,
+    rows: Sequence[dict[str, Any]],
+    conflict_columns: Sequence[str],
+    *,
+    exclude_from_update: Iterable[str] = (),
+) -> tuple[int, int, int]:
+    """
+    Insert or update records by natural key in one multi-row statement.
+
+    Meant for small reference tables (teams, players) where a single
+    INSERT ... VALUES ... ON CONFLICT is one round-trip, without the
+    staging table upsert_dataframe() uses. Duplicate keys within rows
+    collapse to the last record, and rows identical to the stored ones
+    are not rewritten. The caller owns the transaction.
+
+    Args:
+        cursor: psycopg2 cursor
+        table: Target SQLAlchemy table, with a unique constraint on conflict_columns
+        rows: Records keyed by column name, all with the same keys
+        conflict_columns: Columns of the natural key
+        exclude_from_update: Columns never overwritten on existing rows (besides
+            the primary key and the natural key)
+
+    Returns:
+        Tuple of (rows inserted, rows updated, rows unchanged)
+    """
+    unique = {tuple(row[name] for name in conflict_columns): row for row in rows}
+    if not unique:
+        return 0, 0, 0
+
+    plan = column_plan(table)
+    first = next(iter(unique.values()))
+    columns = [name for name in plan.names if name in first]
+    # Rows without ids get fresh UUIDs, as the ORM's client-side default would
+    with_ids = "id" in plan.names and "id" not in columns
+    if with_ids:
+        columns.insert(0, "id")
+    values = [
+        tuple(
+            str(uuid4()) if name == "id" and with_ids else row[name] for name in columns
+        )
+        for row in unique.values()
+    ]
+
+    column_list = ", ".join(quote_identifier(name) for name in columns)
+    sql = (
+        f"INSERT INTO {quote_identifier(table.name)} ({column_list}) VALUES %s "
+        + _on_conflict_clause(
+            table,
+            columns,
+            MergeRule(conflict_columns, exclude_from_update=exclude_from_update),
+        )
+        # xmax is 0 only for freshly inserted row versions
+        + "RETURNING (xmax = 0)"
+    )
+    # One page, so all rows go out in a single statement
+    returned = execute_values(cursor, sql, values, page_size=len(values), fetch=True)
+    inserted = sum(1 for (is_insert,) in returned if is_insert)
+    updated = len(returned) - inserted
+    return inserted, updated, len(values) - len(returned)
+
+
+def _on_conflict_clause(table: Table, columns: Sequence[str], rule: MergeRule) -> str:
+    """Build the ON CONFLICT clause of an upsert; updates skip unchanged rows."""
+    target = quote_identifier(table.name)
+    key_list = ", ".join(quote_identifier(name) for name in rule.conflict_columns)
+    clause = f"ON CONFLICT ({key_list}) "
+
+    skipped = {*(column.name for column in table.primary_key), *rule.conflict_columns}
+    skipped.update(rule.exclude_from_update)
+    updated = [quote_identifier(name) for name in columns if name not in skipped]
+    if rule.on_conflict != "update" or not updated:
+        return clause + "DO NOTHING "
+
+    new_values = ", ".join(f"EXCLUDED.{name}" for name in updated)
+    old_values = ", ".join(f"{target}.{name}" for name in updated)
+    return clause + (
+        f"DO UPDATE SET ({', '.join(updated)}) = ROW({new_values}) "
+        f"WHERE ({old_values}) IS DISTINCT FROM ({new_values}) "
+    )
+
+
+def write_isolating(
+    cursor: Any,
+    df: pd.DataFrame | pl.DataFrame,
+    write: Callable[[Any, Any], tuple[int, int]],
+    batch_size: int = 5000,
+) -> tuple[int, int, list[tuple[Hashable, str]]]:
+    """
+    Write a frame in batches, isolating the rows the database refuses.
+
+    Each batch is written under a SAVEPOINT. If it fails, it is rolled back
+    to the savepoint and split in half, recursively, so k bad rows among n
+    cost O(k log n) extra round-trips and every good row is still written.
+    The caller owns the transaction: nothing is committed here.
+
+    Args:
+        cursor: psycopg2 cursor
+        df: Frame holding the rows to write
+        write: Called as write(cursor, rows); returns (inserted, updated)
+        batch_size: Rows per batch before any bisection
+
+    Returns:
+        Tuple of (rows inserted, rows updated, (row, error text) of each
+        refused row, where row is the index label for a pandas frame and
+        the row position for a Polars frame)
+    """
+    inserted = 0
+    updated = 0
+    rejects: list[tuple[Hashable, str]] = []
+
+    # Refused rows are reported by index label, or by position for Polars frames
+    labels = range(len(df)) if isinstance(df, pl.DataFrame) else df.index
+    for start in range(0, len(df), max(1, batch_size)):
+        stop = start + batch_size
+        batch_inserted, batch_updated = _write_bisecting(
+            cursor, _slice_rows(df, start, stop), labels[start:stop], write, rejects
+        )
+        inserted += batch_inserted
+        updated += batch_updated
+
+    return inserted, updated, rejects
+
+
+def _slice_rows(
+    df: pd.DataFrame | pl.DataFrame, start: int, stop: int
+) -> pd.DataFrame | pl.DataFrame:
+    """Take rows start:stop of a pandas or Polars frame by position."""
+    if isinstance(df, pl.DataFrame):
+        return df.slice(start, stop - start)
+    return df.iloc[start:stop]
+
+
+def _write_bisecting(
+    cursor: Any,
+    rows: pd.DataFrame | pl.DataFrame,
+    labels: Sequence[Hashable],
+    write: Callable[[Any, Any], tuple[int, int]],
+    rejects: list[tuple[Hashable, str]],
+) -> tuple[int, int]:
+    """Write rows under a savepoint, bisecting on failure down to single rows."""
+    cursor.execute("SAVEPOINT bulk_batch")
+    try:
+        result = write(cursor, rows)
+    except psycopg2.DatabaseError as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT bulk_batch")
+        cursor.execute("RELEASE SAVEPOINT bulk_batch")
+        if len(rows) == 1:
+            rejects.append((labels[0], str(e).strip()))
+            return 0, 0
+
+        middle = len(rows) // 2
+        first = _write_bisecting(
+            cursor, _slice_rows(rows, 0, middle), labels[:middle], write, rejects
+        )
+        second = _write_bisecting(
+            cursor,
+            _slice_rows(rows, middle, len(rows)),
+            labels[middle:],
+            write,
+            rejects,
+        )
+        return first[0] + second[0], first[1] + second[1]
+
+    cursor.execute("RELEASE SAVEPOINT bulk_batch")
+    return result
+
+
+def _copy_frame(cursor: Any, target: str, frame: pd.DataFrame | pl.DataFrame) -> None:
+    """COPY a prepared frame into an already quoted table name."""
+    if isinstance(frame, pl.DataFrame):
+        buffer = BytesIO()
+        frame.write_csv(buffer, include_header=False)
+    else:
+        buffer = StringIO()
+        frame.to_csv(buffer, index=False, header=False, na_rep="")
+    buffer.seek(0)
+
+    column_list = ", ".join(quote_identifier(name) for name in frame.columns)
+    cursor.copy_expert(
+        f"COPY {target} ({column_list}) FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
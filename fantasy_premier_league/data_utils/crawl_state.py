@@ -0,0 +1,279 @@
+"""
+Per-player checkpoints for the resumable element-summary crawl.
+
+Each player's crawl state records the outcome of the last attempt, when
+the player was last fetched successfully and the digest of the summary
+stored. A crawl skips players fetched within the freshness window, so a
+rerun after a failure only fetches the players that were not finished.
+Players outside the window are fetched again, but their summary is only
+written when its digest changed.
+
+The state also keeps a digest of the player's counters in the
+bootstrap-static ``elements`` payload (points, minutes, price) as they
+were at the last success. When the current payload is given, a player
+whose summary was stored with a snapshot is fetched again only if those
+counters moved, whatever the freshness window, so a mid-week refresh
+touches only the players whose history changed. Players the API had no
+summary for, and failed players, go by the freshness window instead, so
+they are retried even while their counters stand still.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Any, NamedTuple
+from uuid import uuid4
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from fantasy_premier_league.models.player_crawl_state import PlayerCrawlState
+
+STATUS_DONE = "done"
+STATUS_NOT_FOUND = "not_found"
+STATUS_FAILED = "failed"
+
+# Statuses of players that need no retry until their state goes stale
+SETTLED_STATUSES = (STATUS_DONE, STATUS_NOT_FOUND)
+
+DEFAULT_FRESHNESS = timedelta(hours=24)
+
+# Counters of a bootstrap-static element that move when the player's element
+# summary does. The transfer counters are left out: they move for most players
+# between every two requests, while the stored history only changes when a
+# gameweek is played or the price changes.
+ELEMENT_CHANGE_FIELDS = ("event_points", "minutes", "total_points", "now_cost", "bonus", "bps")
+
+
+class CrawlOutcome(NamedTuple):
+    """
+    Result of one attempt to crawl a player.
+
+    Attributes:
+        status: STATUS_DONE, STATUS_NOT_FOUND or STATUS_FAILED
+        content_digest: Digest of the summary stored, for a success
+        element_digest: element_digest() of the player's bootstrap-static element, for a success
+        error: Error text, for a failure
+    """
+
+    status: str
+    content_digest: str | None = None
+    element_digest: str | None = None
+    error: str | None = None
+
+
+def summary_digest(summary: dict[str, Any]) -> str:
+    """Get the SHA-256 digest of an element summary, independent of key order."""
+    canonical = json.dumps(summary, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def element_digest(element: dict[str, Any]) -> str:
+    """Get the SHA-256 digest of a bootstrap-static element's change counters."""
+    return summary_digest({name: element.get(name) for name in ELEMENT_CHANGE_FIELDS})
+
+
+def load_crawl_states(session: Session) -> dict[int, PlayerCrawlState]:
+    """
+    Load the crawl state of every player.
+
+    Args:
+        session: Database session
+
+    Returns:
+        Crawl states keyed by FPL ID
+    """
+    return {state.fpl_id: state for state in session.scalars(select(PlayerCrawlState))}
+
+
+def is_fresh(state: PlayerCrawlState | None, freshness: timedelta, now: datetime | None = None) -> bool:
+    """
+    Check whether a player was crawled successfully within the freshness window.
+
+    Args:
+        state: The player's crawl state, if any
+        freshness: How long a successful fetch stays current
+        now: Current UTC time (naive, as stored)
+
+    Returns:
+        True if the player can be skipped
+    """
+    if state is None or state.status not in SETTLED_STATUSES or state.last_success_at is None:
+        return False
+    now = now if now is not None else _utcnow()
+    return now - state.last_success_at < freshness
+
+
+def is_unchanged(state: PlayerCrawlState | None, digest: str | None) -> bool:
+    """
+    Check whether a player's bootstrap-static counters match the snapshot of their stored summary.
+
+    Only a player whose last attempt stored a summary can be skipped this
+    way; a player the API had no summary for is retried by age instead.
+
+    Args:
+        state: The player's crawl state, if any
+        digest: element_digest() of the player's current element, if known
+
+    Returns:
+        True if the player can be skipped
+    """
+    return (
+        state is not None
+        and state.status == STATUS_DONE
+        and state.element_digest is not None
+        and state.element_digest == digest
+    )
+
+
+def players_to_crawl(
+    fpl_ids: Iterable[int],
+    states: dict[int, PlayerCrawlState],
+    freshness: timedelta = DEFAULT_FRESHNESS,
+    full: bool = False,
+    element_digests: dict[int, str] | None = None,
+) -> list[int]:
+    """
+    Pick the players a crawl has to fetch.
+
+    With element_digests, a player whose summary was stored with a
+    snapshot of the counters is fetched only if they changed; other
+    players (no snapshot, missing from the payload, or last seen as not
+    found or failed) fall back to the freshness window.
+    Unfinished players (never crawled, or failed last time) come first,
+    so an interrupted crawl resumes with the work it did not finish.
+
+    Args:
+        fpl_ids: Every player's FPL ID
+        states: Crawl states keyed by FPL ID
+        freshness: How long a successful fetch stays current
+        full: If True, ignore the stored states and fetch every player
+        element_digests: element_digest() of each player's current bootstrap-static element, by FPL ID
+
+    Returns:
+        FPL IDs to fetch
+    """
+    if full:
+        return list(fpl_ids)
+    now = _utcnow()
+    element_digests = element_digests or {}
+
+    def needs_crawl(fpl_id: int) -> bool:
+        state = states.get(fpl_id)
+        digest = element_digests.get(fpl_id)
+        if digest is not None and state is not None and state.status == STATUS_DONE and state.element_digest:
+            return not is_unchanged(state, digest)
+        return not is_fresh(state, freshness, now)
+
+    stale = [fpl_id for fpl_id in fpl_ids if needs_crawl(fpl_id)]
+    return sorted(stale, key=lambda fpl_id: fpl_id in states and states[fpl_id].status in SETTLED_STATUSES)
+
+
+def record_crawl_state(session: Session, fpl_id: int, outcome: CrawlOutcome) -> None:
+    """
+    Upsert a player's crawl state inside the session's transaction.
+
+    Recording the state in the same transaction as the player's rows
+    keeps the checkpoint consistent with the tables if the write fails.
+    A failure keeps the digests and success time of the last success; a
+    success without an element digest keeps the stored snapshot.
+
+    Args:
+        session: Database session
+        fpl_id: FPL ID of the player
+        outcome: Outcome of the attempt
+    """
+    now = _utcnow()
+    succeeded = outcome.status in SETTLED_STATUSES
+    statement = insert(PlayerCrawlState).values(
+        id=uuid4(),
+        fpl_id=fpl_id,
+        status=outcome.status,
+        content_digest=outcome.content_digest,
+        element_digest=outcome.element_digest if succeeded else None,
+        attempts=0 if succeeded else 1,
+        last_error=outcome.error,
+        last_success_at=now if succeeded else None,
+        updated_at=now,
+    )
+    excluded = statement.excluded
+    if succeeded:
+        changes = {
+            "status": excluded.status,
+            "content_digest": excluded.content_digest,
+            "element_digest": func.coalesce(excluded.element_digest, PlayerCrawlState.element_digest),
+            "attempts": 0,
+            "last_error": None,
+            "last_success_at": excluded.last_success_at,
+            "updated_at": excluded.updated_at,
+        }
+    else:
+        changes = {
+            "status": excluded.status,
+            "attempts": PlayerCrawlState.attempts + 1,
+            "last_error": excluded.last_error,
+            "updated_at": excluded.updated_at,
+        }
+    session.execute(statement.on_conflict_do_update(index_elements=["fpl_id"], set_=changes))
+
+
+@dataclass
+class CrawlProgress:
+    """
+    Thread-safe progress counters of a player-history crawl.
+
+    Attributes:
+        total: Players to fetch in this crawl
+        skipped_fresh: Players skipped as fetched within the freshness window
+        skipped_unchanged: Players skipped as their bootstrap-static counters did not move
+        stored: Players whose summary was written
+        unchanged: Players whose summary matched the stored digest
+        not_found: Players the API has no summary for
+        failed: Players whose fetch or write failed
+        report_every: Print a progress line after this many players
+    """
+
+    total: int
+    skipped_fresh: int = 0
+    skipped_unchanged: int = 0
+    stored: int = 0
+    unchanged: int = 0
+    not_found: int = 0
+    failed: int = 0
+    report_every: int = 50
+    _lock: Lock = field(default_factory=Lock, repr=False)
+
+    @property
+    def finished(self) -> int:
+        """Players handled so far."""
+        return self.stored + self.unchanged + self.not_found + self.failed
+
+    def add(self, outcome: str) -> None:
+        """
+        Count one handled player and print progress periodically.
+
+        Args:
+            outcome: Name of the counter to increment ("stored", "unchanged", "not_found" or "failed")
+        """
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            if self.finished % self.report_every == 0 or self.finished == self.total:
+                print(f"  Progress: {self.summary()}")
+
+    def summary(self) -> str:
+        """Describe the counters in one line."""
+        percent = 100 * self.finished / self.total if self.total else 100.0
+        return (
+            f"{self.finished}/{self.total} ({percent:.0f}%): {self.stored} stored, {self.unchanged} unchanged, "
+            f"{self.not_found} not found, {self.failed} failed; {self.skipped_unchanged} skipped as unchanged, "
+            f"{self.skipped_fresh} skipped as fresh"
+        )
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, as stored in the table."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
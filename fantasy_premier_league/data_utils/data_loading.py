@@ -1,26 +1,31 @@
 import argparse
+import json
 
 # --- Database Setup ---
 import os
 import re
-import tempfile
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
-from io import StringIO
+import warnings
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
 from threading import Lock
+from typing import Any, NamedTuple
 from uuid import UUID, uuid4
 
-import pandas as pd
+import polars as pl
 import requests
-from sqlalchemy import create_engine, text
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import sessionmaker
 from unidecode import unidecode
 
 # Import the actual models - handle both script and module execution
 try:
     # When imported as a module
+    from ..models.column_plan import column_plan
+    from ..models.ingestion_state import IngestionState
     from ..models.player import Player
     from ..models.player_gameweek_history import (
         PlayerGameweekHistory16_17,
@@ -35,11 +40,118 @@ try:
     )
     from ..models.player_history import PlayerGameweekHistory, PlayerSeasonHistory
     from ..models.team import Team
+    from .bulk_writer import (
+        quote_identifier,
+        upsert_dataframe,
+        upsert_rows,
+        write_isolating,
+    )
+    from .crawl_state import (
+        DEFAULT_FRESHNESS,
+        STATUS_DONE,
+        STATUS_FAILED,
+        STATUS_NOT_FOUND,
+        CrawlOutcome,
+        CrawlProgress,
+        element_digest,
+        is_unchanged,
+        load_crawl_states,
+        players_to_crawl,
+        record_crawl_state,
+        summary_digest,
+    )
+    from .element_crawler import CrawlerConfig, ElementSummaryCrawler
+    from .encoding import open_decoded
+    from .gameweek_live import load_gameweek_live
+    from .http_cache import (
+        CachedResponse,
+        configure_http_cache,
+        fetch_cached,
+        get_http_cache,
+    )
+    from .http_client import fpl_api_url, get_http_client, http_get
+    from .ingestion import (
+        REJECT_REASON,
+        SEASON_MERGE_RULE,
+        SOURCE_LINE,
+        clean_frame,
+        iter_csv_batches,
+        read_csv_frame,
+        season_schema,
+    )
+    from .ingestion_state import (
+        SeasonProgress,
+        load_ingestion_states,
+        record_ingestion_state,
+        resume_round,
+    )
+    from .pipeline import HISTORICAL_PIPELINE, PipelineConfig, run_pipeline
+    from .rejects import record_rejected_rows
 except ImportError:
     # When run as a script
     import sys
 
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from fantasy_premier_league.data_utils.bulk_writer import (
+        quote_identifier,
+        upsert_dataframe,
+        upsert_rows,
+        write_isolating,
+    )
+    from fantasy_premier_league.data_utils.crawl_state import (
+        DEFAULT_FRESHNESS,
+        STATUS_DONE,
+        STATUS_FAILED,
+        STATUS_NOT_FOUND,
+        CrawlOutcome,
+        CrawlProgress,
+        element_digest,
+        is_unchanged,
+        load_crawl_states,
+        players_to_crawl,
+        record_crawl_state,
+        summary_digest,
+    )
+    from fantasy_premier_league.data_utils.element_crawler import (
+        CrawlerConfig,
+        ElementSummaryCrawler,
+    )
+    from fantasy_premier_league.data_utils.encoding import open_decoded
+    from fantasy_premier_league.data_utils.gameweek_live import load_gameweek_live
+    from fantasy_premier_league.data_utils.http_cache import (
+        CachedResponse,
+        configure_http_cache,
+        fetch_cached,
+        get_http_cache,
+    )
+    from fantasy_premier_league.data_utils.http_client import (
+        fpl_api_url,
+        get_http_client,
+        http_get,
+    )
+    from fantasy_premier_league.data_utils.ingestion import (
+        REJECT_REASON,
+        SEASON_MERGE_RULE,
+        SOURCE_LINE,
+        clean_frame,
+        iter_csv_batches,
+        read_csv_frame,
+        season_schema,
+    )
+    from fantasy_premier_league.data_utils.ingestion_state import (
+        SeasonProgress,
+        load_ingestion_states,
+        record_ingestion_state,
+        resume_round,
+    )
+    from fantasy_premier_league.data_utils.pipeline import (
+        HISTORICAL_PIPELINE,
+        PipelineConfig,
+        run_pipeline,
+    )
+    from fantasy_premier_league.data_utils.rejects import record_rejected_rows
+    from fantasy_premier_league.models.column_plan import column_plan
+    from fantasy_premier_league.models.ingestion_state import IngestionState
     from fantasy_premier_league.models.player import Player
     from fantasy_premier_league.models.player_gameweek_history import (
         PlayerGameweekHistory16_17,
@@ -241,253 +353,411 @@ print_lock = Lock()
 # --- Data Loading Function ---
 
 
+def _release_moved_team_keys(cursor: Any, team_rows: list[dict[str, Any]]) -> None:
+    """
+    Give stored teams whose name or code is changing placeholder values.
+
+    FPL numbers teams alphabetically each season, so promotions move names
+    and codes from one fpl_id to another. Upserting row by row would then
+    trip uq_teams_name (or the code constraint) on the first moved name,
+    while it is still held by the team it moves from. The placeholders
+    only live until the upsert in the same transaction overwrites them.
+    """
+    cursor.execute(
+        """
+        UPDATE teams
+        SET name = '~' || teams.fpl_id::text, code = -teams.fpl_id
+        FROM unnest(%s::integer[], %s::text[], %s::integer[])
+            AS incoming (fpl_id, name, code)
+        WHERE teams.fpl_id = incoming.fpl_id
+            AND (teams.name <> incoming.name OR teams.code <> incoming.code)
+        """,
+        (
+            [row["fpl_id"] for row in team_rows],
+            [row["name"] for row in team_rows],
+            [row["code"] for row in team_rows],
+        ),
+    )
+
+
 def load_teams_and_players(refresh: bool = False) -> None:
     """
     Fetches basic FPL data (teams and players) and loads it into the database.
-    It checks for existing entries to avoid duplicates unless refresh is True.
+    Each table is synced with one multi-row upsert keyed by fpl_id: new rows
+    are inserted and existing rows are updated only where their values differ.
+    Names and codes may move between teams; a name still held by a stored
+    team missing from the API fails the load, which is rolled back.
 
     Args:
-        refresh: If True, deletes all existing data before loading new data.
+        refresh: Deprecated and ignored; the upsert already replaces stale values
     """
+    if refresh:
+        warnings.warn(
+            "refresh is deprecated and has no effect: teams and players are "
+            "upserted by fpl_id",
+            DeprecationWarning,
+            stacklevel=2,
+        )
     print("Starting data load for teams and players...")
-    db = SessionLocal()
 
     try:
         # FPL API endpoint for general information
-        url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-        response = requests.get(url, timeout=10)
+        url = fpl_api_url("bootstrap-static/")
+        response = http_get(url)
         response.raise_for_status()  # Raise an exception for bad status codes
 
         data = response.json()
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching data from FPL API: {e}")
+        return
+
+    teams_data = data.get("teams", [])
+    print(f"Found {len(teams_data)} teams in the API.")
+    team_rows = [
+        {
+            "fpl_id": team_data["id"],
+            "name": team_data["name"],
+            "short_name": team_data["short_name"],
+            "code": team_data["code"],
+            "strength_attack_home": team_data["strength_attack_home"],
+            "strength_attack_away": team_data["strength_attack_away"],
+            "strength_defence_home": team_data["strength_defence_home"],
+            "strength_defence_away": team_data["strength_defence_away"],
+            "strength_overall_home": team_data["strength_overall_home"],
+            "strength_overall_away": team_data["strength_overall_away"],
+        }
+        for team_data in teams_data
+    ]
 
-        # --- Load Teams ---
-        teams_data = data.get("teams", [])
-        print(f"Found {len(teams_data)} teams in the API.")
+    players_data = data.get("elements", [])
+    print(f"Found {len(players_data)} players in the API.")
+    player_rows = [
+        {
+            "fpl_id": player_data["id"],
+            "first_name": player_data["first_name"],
+            "second_name": player_data["second_name"],
+            "web_name": player_data["web_name"],
+            "team_id": player_data["team"],
+            "element_type": player_data["element_type"],
+            "now_cost": player_data["now_cost"],
+        }
+        for player_data in players_data
+    ]
 
-        for team_data in teams_data:
-            print(team_data)
-            try:
-                existing_team = (
-                    db.query(Team).filter(Team.fpl_id == team_data["id"]).first()
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            _release_moved_team_keys(cursor, team_rows)
+            for label, table, rows in (
+                ("Teams", Team.__table__, team_rows),
+                ("Players", Player.__table__, player_rows),
+            ):
+                inserted, updated, unchanged = upsert_rows(
+                    cursor, table, rows, ["fpl_id"]
                 )
-                if existing_team:
-                    continue
-
-                new_team = Team(
-                    fpl_id=team_data["id"],
-                    name=team_data["name"],
-                    short_name=team_data["short_name"],
-                    code=team_data["code"],
-                    strength_attack_home=team_data["strength_attack_home"],
-                    strength_attack_away=team_data["strength_attack_away"],
-                    strength_defence_home=team_data["strength_defence_home"],
-                    strength_defence_away=team_data["strength_defence_away"],
-                    strength_overall_home=team_data["strength_overall_home"],
-                    strength_overall_away=team_data["strength_overall_away"],
+                print(
+                    f"{label} data loaded successfully: {inserted} inserted, "
+                    f"{updated} updated, {unchanged} unchanged."
                 )
-                db.add(new_team)
-            except Exception as e:
-                print(f"Error loading team: {e}")
+        connection.commit()
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        connection.rollback()  # Roll back the transaction on error
+    finally:
+        connection.close()
 
-        # Commit teams to the database so players can reference them
-        db.commit()
-        print("Teams data loaded successfully.")
 
-        # --- Load Players ---
-        players_data = data.get("elements", [])
-        print(f"Found {len(players_data)} players in the API.")
+class ExistingHistory(NamedTuple):
+    """
+    Player history already in the database, prefetched for membership checks.
 
-        for player_data in players_data:
-            # Check if the player already exists in the database (only if not refreshing)
-            if not refresh:
-                existing_player = (
-                    db.query(Player).filter(Player.fpl_id == player_data["id"]).first()
-                )
-                if existing_player:
-                    continue
-
-            # Ensure UUID for id if not set by SQLAlchemy model default
-            new_player = Player(
-                id=uuid4(),  # Explicitly set a UUID if your model does not auto-generate
-                fpl_id=player_data["id"],
-                first_name=player_data["first_name"],
-                second_name=player_data["second_name"],
-                web_name=player_data["web_name"],
-                team_id=player_data["team"],
-                element_type=player_data["element_type"],
-                now_cost=player_data["now_cost"],
-            )
-            db.add(new_player)
+    Attributes:
+        player_ids: FPL ID -> player UUID
+        gameweeks: (player UUID, season, gameweek) of the stored gameweek rows
+        seasons: (player UUID, season name) of the stored past season rows
+    """
 
-        # Commit players to the database
-        db.commit()
-        print("Players data loaded successfully.")
+    player_ids: dict[int, UUID]
+    gameweeks: set[tuple[UUID, str, int]]
+    seasons: set[tuple[UUID, str]]
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching data from FPL API: {e}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        db.rollback()  # Roll back the transaction on error
-    finally:
-        db.close()
-        print("Database session closed.")
 
+def prefetch_existing_history(
+    db: Any, fpl_ids: Iterable[int] | None = None
+) -> ExistingHistory:
+    """
+    Load the keys of the player history rows already stored, in three queries.
 
-def process_player_history(
-    player_id: UUID, total_players: int, current_index: int
-) -> tuple[UUID, bool, str]:
+    Args:
+        db: Database session
+        fpl_ids: Players to load the keys of (all players if omitted)
+
+    Returns:
+        The players' UUIDs and existing history keys
     """
-    Process a single player's history data.
-    This now loads both current season gameweek data and past season summary data.
+    players = db.query(Player.fpl_id, Player.id)
+    if fpl_ids is not None:
+        players = players.filter(Player.fpl_id.in_(list(fpl_ids)))
+    player_ids = dict(players.all())
+
+    gameweeks = db.query(
+        PlayerGameweekHistory.player_id,
+        PlayerGameweekHistory.season,
+        PlayerGameweekHistory.gameweek,
+    ).filter(PlayerGameweekHistory.season == CURRENT_SEASON)
+    seasons = db.query(PlayerSeasonHistory.player_id, PlayerSeasonHistory.season_name)
+    if fpl_ids is not None:
+        uuids = list(player_ids.values())
+        gameweeks = gameweeks.filter(PlayerGameweekHistory.player_id.in_(uuids))
+        seasons = seasons.filter(PlayerSeasonHistory.player_id.in_(uuids))
+
+    return ExistingHistory(
+        player_ids=player_ids,
+        gameweeks={tuple(row) for row in gameweeks.all()},
+        seasons={tuple(row) for row in seasons.all()},
+    )
+
+
+def _upsert_gameweek_rows(db: Any, gw_rows: list[dict[str, Any]]) -> None:
+    """Insert gameweek rows, overwriting the stored row of the same gameweek."""
+    statement = pg_insert(PlayerGameweekHistory)
+    key = {"id", "player_id", "gameweek", "season"}
+    changes = {name: statement.excluded[name] for name in gw_rows[0] if name not in key}
+    db.execute(
+        statement.on_conflict_do_update(
+            constraint="uq_player_gameweek_season", set_=changes
+        ),
+        gw_rows,
+    )
+
+
+def store_player_history(
+    player_id: int,
+    player_history_data: dict[str, Any],
+    existing: ExistingHistory | None = None,
+    content_digest: str | None = None,
+    element_digest: str | None = None,
+) -> tuple[int, bool, str]:
+    """
+    Store a player's element summary in the database.
+    Loads both current season gameweek data and past season summary data.
+    Gameweek rows are upserted, so a re-fetch after bonus points or other
+    corrections updates the stored rows; past season rows whose keys are
+    already stored are skipped. Each table's rows go out in one statement.
 
     Args:
-        player_id: The FPL ID of the player to process
-        total_players: Total number of players being processed
-        current_index: Current index of this player in the batch
+        player_id: The FPL ID of the player
+        player_history_data: Decoded /element-summary/{id}/ response
+        existing: Prefetched history keys (queried for this player if omitted)
+        content_digest: Digest of the summary; if given, the player's crawl
+            state is checkpointed in the same transaction as the rows
+        element_digest: Digest of the player's bootstrap-static counters,
+            kept in the checkpoint as the snapshot later crawls diff against
 
     Returns:
         Tuple of (player_id, success, message)
     """
-    CURRENT_SEASON = "2024-25"  # NOTE: Make this dynamic in a real application
     db = SessionLocal()
 
     try:
-        with print_lock:
-            print(
-                f"Processing player {current_index + 1}/{total_players} "
-                f"(ID: {player_id})"
-            )
+        if existing is None:
+            existing = prefetch_existing_history(db, [player_id])
 
-        # Get the player's UUID from the database using fpl_id
-        player = db.query(Player).filter(Player.fpl_id == player_id).first()
-        if not player:
+        player_uuid = existing.player_ids.get(player_id)
+        if player_uuid is None:
             return (
                 player_id,
                 False,
                 f"Player with FPL ID {player_id} not found in database",
             )
 
-        # Fetch detailed player data
-        url = f"https://fantasy.premierleague.com/api/element-summary/{player_id}/"
-        response = requests.get(url, timeout=5)
-
-        # Skip if player data not found (e.g., transferred out of PL)
-        if response.status_code != HTTP_OK:
-            return (
-                player_id,
-                False,
-                f"Could not fetch data for player {player_id}. "
-                f"Status: {response.status_code}",
-            )
-
-        player_history_data = response.json()
-        gw_records_added = 0
-        season_records_added = 0
+        gw_plan = column_plan(PlayerGameweekHistory)
+        season_plan = column_plan(PlayerSeasonHistory)
 
         # --- Load Current Season Gameweek Data ---
-        gameweeks = player_history_data.get("history", [])
-        for gw_data in gameweeks:
-            existing_gw = (
-                db.query(PlayerGameweekHistory)
-                .filter_by(
-                    player_id=player.id,
-                    gameweek=gw_data["round"],
-                    season=CURRENT_SEASON,
-                )
-                .first()
+        # Only the first fixture of a double gameweek in the payload is kept,
+        # as before; stored rows of the same gameweeks are overwritten
+        stored_gameweeks = set()
+        gw_rows = []
+        for gw_data in player_history_data.get("history", []):
+            key = (player_uuid, CURRENT_SEASON, gw_data["round"])
+            if key in stored_gameweeks:
+                continue
+            stored_gameweeks.add(key)
+            # Matching columns, converted to their types (kickoff_time,
+            # influence, creativity, threat, ict_index arrive as strings)
+            gw_model_data = gw_plan.values_from(gw_data)
+            gw_model_data.update(
+                id=uuid4(),  # Ensure UUID for id
+                player_id=player_uuid,
+                gameweek=gw_data["round"],
+                season=CURRENT_SEASON,
+                fixture_id=gw_data["fixture"],
+                opponent_team_id=gw_data["opponent_team"],
             )
-
-            if not existing_gw:
-                gw_model_data = {
-                    key: gw_data[key]
-                    for key in PlayerGameweekHistory.__table__.columns
-                    if key in gw_data
-                }
-                gw_model_data.update(
-                    id=uuid4(),  # Ensure UUID for id
-                    player_id=player.id,
-                    gameweek=gw_data["round"],
-                    season=CURRENT_SEASON,
-                    fixture_id=gw_data["fixture"],
-                    opponent_team_id=gw_data["opponent_team"],
-                    total_points=gw_data["total_points"],
-                    kickoff_time=(
-                        datetime.fromisoformat(
-                            gw_data["kickoff_time"].replace("Z", "+00:00")
-                        )
-                        if gw_data.get("kickoff_time")
-                        else None
-                    ),
-                    influence=float(gw_data["influence"]),
-                    creativity=float(gw_data["creativity"]),
-                    threat=float(gw_data["threat"]),
-                    ict_index=float(gw_data["ict_index"]),
-                )
-                db.add(PlayerGameweekHistory(**gw_model_data))
-                gw_records_added += 1
+            gw_rows.append(gw_model_data)
 
         # --- Load Past Season Summary Data ---
-        past_seasons = player_history_data.get("history_past", [])
-        for season_data in past_seasons:
-            existing_season = (
-                db.query(PlayerSeasonHistory)
-                .filter_by(player_id=player.id, season_name=season_data["season_name"])
-                .first()
+        stored_seasons = set()
+        season_rows = []
+        for season_data in player_history_data.get("history_past", []):
+            key = (player_uuid, season_data["season_name"])
+            if key in existing.seasons or key in stored_seasons:
+                continue
+            stored_seasons.add(key)
+            season_model_data = season_plan.values_from(season_data)
+            season_model_data.update(
+                id=uuid4(),  # Ensure UUID for id
+                player_id=player_uuid,
+            )
+            season_rows.append(season_model_data)
+
+        if gw_rows:
+            _upsert_gameweek_rows(db, gw_rows)
+        if season_rows:
+            db.execute(insert(PlayerSeasonHistory), season_rows)
+        if content_digest is not None:
+            record_crawl_state(
+                db, player_id, CrawlOutcome(STATUS_DONE, content_digest, element_digest)
             )
-
-            if not existing_season:
-                season_model_data = {
-                    key: season_data[key]
-                    for key in PlayerSeasonHistory.__table__.columns
-                    if key in season_data
-                }
-                season_model_data.update(
-                    id=uuid4(),  # Ensure UUID for id
-                    player_id=player.id,
-                    influence=float(season_data["influence"]),
-                    creativity=float(season_data["creativity"]),
-                    threat=float(season_data["threat"]),
-                    ict_index=float(season_data["ict_index"]),
-                )
-                db.add(PlayerSeasonHistory(**season_model_data))
-                season_records_added += 1
         # Commit after processing all data for this player
         db.commit()
 
-        # Be kind to the API - add a small delay
-        time.sleep(0.5)
-
         return (
             player_id,
             True,
-            f"Successfully processed {gw_records_added} gameweek records "
-            f"and {season_records_added} season records",
+            f"Successfully processed {len(gw_rows)} gameweek records "
+            f"and {len(season_rows)} season records",
         )
 
-    except requests.exceptions.RequestException as e:
+    except Exception as e:
         db.rollback()
+        return player_id, False, f"Error processing player: {e}"
+    finally:
+        db.close()
+
+
+def process_player_history(
+    player_id: int, total_players: int, current_index: int
+) -> tuple[int, bool, str]:
+    """
+    Fetch and store a single player's history data.
+    load_player_history() crawls all players under rate control instead;
+    this is for loading one player on its own.
+
+    Args:
+        player_id: The FPL ID of the player to process
+        total_players: Total number of players being processed
+        current_index: Current index of this player in the batch
+
+    Returns:
+        Tuple of (player_id, success, message)
+    """
+    with print_lock:
+        print(
+            f"Processing player {current_index + 1}/{total_players} "
+            f"(ID: {player_id})"
+        )
+
+    try:
+        url = fpl_api_url(f"element-summary/{player_id}/")
+        response = http_get(url)
+    except requests.exceptions.RequestException as e:
         return player_id, False, f"Request error: {e}"
+
+    # Skip if player data not found (e.g., transferred out of PL)
+    if response.status_code != HTTP_OK:
+        return (
+            player_id,
+            False,
+            f"Could not fetch data for player {player_id}. "
+            f"Status: {response.status_code}",
+        )
+
+    return store_player_history(player_id, response.json())
+
+
+def _record_crawl_outcome(player_id: int, outcome: CrawlOutcome) -> None:
+    """Checkpoint a player's crawl state in its own transaction."""
+    db = SessionLocal()
+    try:
+        record_crawl_state(db, player_id, outcome)
+        db.commit()
     except Exception as e:
         db.rollback()
-        return player_id, False, f"Error processing player: {e}"
+        with print_lock:
+            print(f"  - Could not record crawl state of player {player_id}: {e}")
     finally:
         db.close()
 
 
-def load_player_history() -> None:
+def fetch_element_digests() -> dict[int, str]:
+    """
+    Snapshot every player's change counters from bootstrap-static.
+
+    Returns:
+        element_digest() of each player's element keyed by FPL ID, or an
+        empty dict if the request fails (every player then falls back to
+        the freshness window)
+    """
+    try:
+        response = http_get(fpl_api_url("bootstrap-static/"))
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"Could not fetch bootstrap-static, skipping change detection: {e}")
+        return {}
+    return {
+        element["id"]: element_digest(element)
+        for element in response.json().get("elements", [])
+    }
+
+
+def load_player_history(
+    rate: float = 10.0,
+    max_concurrency: int = 32,
+    freshness: timedelta = DEFAULT_FRESHNESS,
+    full: bool = False,
+) -> None:
     """
     Fetches detailed history for each player and loads it into the database.
     This now loads both current season gameweek data and past season summary data.
-    Uses concurrent processing with 32 threads.
+    Element summaries are crawled asynchronously under a request-rate limit
+    and an adaptive concurrency limit; each is stored as it arrives.
+
+    The crawl is checkpointed per player in the player_crawl_state table.
+    Players whose bootstrap-static counters (points, minutes, price) have
+    not moved since their summary was stored are skipped, so a mid-week
+    refresh only fetches the players whose history changed. Other players
+    are skipped if fetched within the freshness window, so a rerun after a
+    failure only fetches the unfinished players, and a player the API had
+    no summary for is retried once the window has passed. A summary whose
+    digest matches the stored one is not written again.
+
+    Args:
+        rate: Maximum element-summary requests per second
+        max_concurrency: Upper bound on requests in flight
+        freshness: How long a successful fetch stays current for players
+            without a snapshot of their counters
+        full: If True, ignore the checkpoints and fetch and store every player
     """
     print("\nStarting data load for player history...")
+    element_digests = fetch_element_digests()
     db = SessionLocal()
 
     try:
-        # Get all player FPL IDs from our database
-        player_fpl_ids = [p.fpl_id for p in db.query(Player.fpl_id).all()]
-        total_players = len(player_fpl_ids)
+        # Every player's UUID and stored history keys, so each player's rows
+        # are checked in memory instead of with a query per gameweek
+        existing = prefetch_existing_history(db)
+        states = load_crawl_states(db)
+        player_fpl_ids = players_to_crawl(
+            existing.player_ids, states, freshness, full, element_digests
+        )
+        total_players = len(existing.player_ids)
         print(f"Found {total_players} players in the database to process.")
+        print(
+            f"Found {len(existing.gameweeks)} gameweek and "
+            f"{len(existing.seasons)} season history records already stored."
+        )
 
     except Exception as e:
         print(f"Error getting player IDs: {e}")
@@ -496,358 +766,392 @@ def load_player_history() -> None:
     finally:
         db.close()
 
-    # Process players in parallel using ThreadPoolExecutor
-    successful_count = 0
-    failed_count = 0
-
-    with ThreadPoolExecutor(max_workers=32) as executor:
-        # Submit all tasks
-        future_to_player = {
-            executor.submit(
-                process_player_history, player_fpl_id, total_players, i
-            ): player_fpl_id
-            for i, player_fpl_id in enumerate(player_fpl_ids)
-        }
+    queued = set(player_fpl_ids)
+    skipped_unchanged = sum(
+        1
+        for fpl_id in existing.player_ids
+        if fpl_id not in queued
+        and is_unchanged(states.get(fpl_id), element_digests.get(fpl_id))
+    )
+    progress = CrawlProgress(
+        total=len(player_fpl_ids),
+        skipped_unchanged=skipped_unchanged,
+        skipped_fresh=total_players - len(player_fpl_ids) - skipped_unchanged,
+    )
+    hours = freshness.total_seconds() / 3600
+    print(
+        f"Crawling {progress.total} players ({progress.skipped_unchanged} "
+        f"unchanged since their last crawl and {progress.skipped_fresh} fetched "
+        f"within the last {hours:g} hours skipped)."
+    )
+
+    def store(player_id: int, player_history_data: dict[str, Any] | None) -> str:
+        # Skip if player data not found (e.g., transferred out of PL)
+        snapshot = element_digests.get(player_id)
+        if player_history_data is None:
+            _record_crawl_outcome(
+                player_id, CrawlOutcome(STATUS_NOT_FOUND, element_digest=snapshot)
+            )
+            return "not_found"
+
+        digest = summary_digest(player_history_data)
+        state = states.get(player_id)
+        if (
+            not full
+            and state is not None
+            and state.status == STATUS_DONE
+            and state.content_digest == digest
+        ):
+            # Unchanged since it was stored: only renew the checkpoint
+            _record_crawl_outcome(
+                player_id, CrawlOutcome(STATUS_DONE, digest, snapshot)
+            )
+            return "unchanged"
+
+        _, success, message = store_player_history(
+            player_id, player_history_data, existing, digest, snapshot
+        )
+        if success:
+            return "stored"
+        _record_crawl_outcome(player_id, CrawlOutcome(STATUS_FAILED, error=message))
+        with print_lock:
+            print(f"  - {message}")
+        return "failed"
 
-        # Process completed tasks
-        for future in as_completed(future_to_player):
-            player_id, success, message = future.result()
+    def handle(player_id: int, player_history_data: dict[str, Any] | None) -> None:
+        # Counted only once stored, so a player whose write raises is counted
+        # once, as failed, by on_error
+        progress.add(store(player_id, player_history_data))
 
-            if success:
-                successful_count += 1
-            else:
-                failed_count += 1
-                with print_lock:
-                    print(f"  - {message}")
+    def on_error(player_id: int, error: Exception) -> None:
+        _record_crawl_outcome(player_id, CrawlOutcome(STATUS_FAILED, error=str(error)))
+        progress.add("failed")
+
+    crawler = ElementSummaryCrawler(
+        config=CrawlerConfig(rate=rate, max_concurrency=max_concurrency)
+    )
+    stats = crawler.crawl(player_fpl_ids, handle, on_error)
+    stats.report()
+    crawler.client.report()
 
     print("\nPlayer history loading completed.")
-    print(f"Successfully processed: {successful_count} players")
-    print(f"Failed to process: {failed_count} players")
+    print(progress.summary())
+
+
+# NOTE: Make this dynamic in a real application
+CURRENT_SEASON = "2024-25"
+
+# Past seasons and their corresponding model classes
+PAST_SEASONS = {
+    "2016-17": PlayerGameweekHistory16_17,
+    "2017-18": PlayerGameweekHistory17_18,
+    "2018-19": PlayerGameweekHistory18_19,
+    "2019-20": PlayerGameweekHistory19_20,
+    "2020-21": PlayerGameweekHistory20_21,
+    "2021-22": PlayerGameweekHistory21_22,
+    "2022-23": PlayerGameweekHistory22_23,
+    "2023-24": PlayerGameweekHistory23_24,
+    "2024-25": PlayerGameweekHistory24_25,
+}
+
+
+class SeasonLoad(NamedTuple):
+    """
+    A season's parsed rows, ready for the write stage.
+
+    Attributes:
+        batches: (insert-ready frame, rejected rows) batches
+        digest: Digest of the source file the rows came from
+        from_round: First round being loaded, or None for the whole season
+        unchanged: True if the source matches the last load and nothing is written
+    """
 
+    batches: Iterable[tuple[pl.DataFrame, pl.DataFrame]]
+    digest: str
+    from_round: int | None
+    unchanged: bool = False
 
-def load_historical_gameweek_data_from_github() -> None:
+
+def load_historical_gameweek_data_from_github(
+    pipeline: PipelineConfig = HISTORICAL_PIPELINE,
+    *,
+    chunk_size: int | None = None,
+    full_reload: bool = False,
+    batch_size: int = 5000,
+) -> None:
     """
     NEW: Loads detailed gameweek-by-gameweek data for past seasons
     from the vaastav/Fantasy-Premier-League GitHub repository into
     individual season-specific tables.
+
+    Seasons go through a fetch -> parse -> write pipeline, so downloads,
+    CSV parsing and database writes of different seasons overlap.
+
+    Loads are incremental: closed seasons that were fully loaded are skipped,
+    a season whose source file is unchanged is not parsed, and otherwise only
+    rounds from the season's high-water mark onwards are upserted.
+
+    Args:
+        pipeline: Number of seasons downloaded, decoded and written concurrently
+        chunk_size: If set, stream each season in batches of this many rows so
+            memory use stays flat regardless of file size. Parsing then happens
+            lazily inside the write stage.
+        full_reload: If True, ignore the ingestion state and reload every season
+        batch_size: Rows per INSERT batch; failing batches are bisected to
+            isolate bad rows, which are kept in the rejected_rows table
     """
     print("\nStarting data load for historical gameweek data from GitHub...")
 
-    # List of past seasons and their corresponding model classes
-    PAST_SEASONS = {
-        "2016-17": PlayerGameweekHistory16_17,
-        "2017-18": PlayerGameweekHistory17_18,
-        "2018-19": PlayerGameweekHistory18_19,
-        "2019-20": PlayerGameweekHistory19_20,
-        "2020-21": PlayerGameweekHistory20_21,
-        "2021-22": PlayerGameweekHistory21_22,
-        "2022-23": PlayerGameweekHistory22_23,
-        "2023-24": PlayerGameweekHistory23_24,
-        "2024-25": PlayerGameweekHistory24_25,
-    }
+    db = SessionLocal()
+    try:
+        states = load_ingestion_states(db)
+    finally:
+        db.close()
+
+    seasons = []
+    for season in PAST_SEASONS:
+        state = states.get(season)
+        if not full_reload and season != CURRENT_SEASON and state and state.closed:
+            print(f"  - {season}: closed and fully loaded, skipping")
+            continue
+        seasons.append(season)
+
+    results, stats = run_pipeline(
+        seasons,
+        fetch=_fetch_season_stage,
+        parse=partial(
+            _parse_season_stage,
+            states=states,
+            chunk_size=chunk_size,
+            full_reload=full_reload,
+        ),
+        write=partial(_write_season_stage, batch_size=batch_size),
+        config=pipeline,
+    )
 
     total_records_added = 0
     total_records_skipped = 0
     total_errors = 0
 
-    for season, model_class in PAST_SEASONS.items():
-        print(f"Processing season: {season}")
-        db = SessionLocal()
-        season_records_added = 0
-        season_records_skipped = 0
-        season_errors = 0
-
-        try:
-            base_url = "https://raw.githubusercontent.com/vaastav/"
-            url = f"{base_url}Fantasy-Premier-League/master/data/{season}/gws/merged_gw.csv"
-
-            # Fetch the CSV content with proper encoding handling
-            df = _fetch_csv_data(url, season)
-            if df is None:
-                # Try to diagnose the issue
-                _diagnose_csv_issues(url, season)
-                continue
-
-            # Clean the fetched data
-            df = _clean_csv_data(df, season)
-
-            print(f"  - Found {len(df)} records in CSV")
-
-            for index, row in df.iterrows():
-                try:
-                    # Skip records with null opponent_team_id
-                    if _should_skip_record(row):
-                        season_records_skipped += 1
-                        continue
-
-                    # Process the row data
-                    model_data = _process_row_data(row, model_class, season)
-                    if model_data is None:
-                        season_records_skipped += 1
-                        continue
-
-                    # Try to insert the record
-                    success = _insert_record(
-                        db,
-                        model_class,
-                        model_data,
-                        index if isinstance(index, int) else int(index),
-                    )
-                    if success == "added":
-                        season_records_added += 1
-                    elif success == "skipped":
-                        season_records_skipped += 1
-                    else:
-                        season_errors += 1
-
-                except Exception as e:
-                    print(f"    - Error processing row {index}: {e}")
-                    season_errors += 1
-                    continue
-
-            print(
-                f"  - Season {season} completed: "
-                f"{season_records_added} added, "
-                f"{season_records_skipped} skipped, "
-                f"{season_errors} errors"
-            )
-
+    for season in seasons:
+        result = results.get(season)
+        if isinstance(result, Exception):
+            print(f"  - Fatal error processing season {season}: {result}")
+            total_errors += 1
+        elif result is not None:
+            season_records_added, season_records_skipped, season_errors = result
             total_records_added += season_records_added
             total_records_skipped += season_records_skipped
             total_errors += season_errors
 
-        except Exception as e:
-            print(f"  - Fatal error processing season {season}: {e}")
-            total_errors += 1
-        finally:
-            db.close()
+    stats.report()
 
     print("\nHistorical data loading completed:")
     print(f"  - Total records added: {total_records_added}")
     print(f"  - Total records skipped: {total_records_skipped}")
     print(f"  - Total errors: {total_errors}")
-    print("Database sessions closed.")
 
 
-def _fetch_csv_data(url: str, season: str) -> pd.DataFrame | None:
-    """Fetch and decode CSV data from URL."""
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+def _season_csv_url(season: str) -> str:
+    """Build the merged_gw.csv URL for a season."""
+    base_url = "https://raw.githubusercontent.com/vaastav/"
+    return f"{base_url}Fantasy-Premier-League/master/data/{season}/gws/merged_gw.csv"
 
-        # Try different encodings to decode the content
-        encodings = ["utf-8", "latin1", "iso-8859-1", "cp1252", "windows-1252"]
 
-        for encoding in encodings:
-            try:
-                content = response.content.decode(encoding)
+def _fetch_season_stage(season: str) -> CachedResponse | None:
+    """Pipeline fetch stage: download a season's raw CSV into the local cache."""
+    print(f"Processing season: {season}")
+    return _download_csv(_season_csv_url(season), season)
 
-                # Try to read CSV with more flexible parsing options
-                try:
-                    # First attempt: standard parsing
-                    df = pd.read_csv(StringIO(content))
-                    print(f"  - Successfully decoded with {encoding} encoding")
-                    return df
-                except pd.errors.ParserError as e:
-                    print(
-                        f"  - Standard parsing failed with {encoding}, trying flexible parsing: {e}"
-                    )
 
-                    # Second attempt: flexible parsing with error handling
-                    try:
-                        df = pd.read_csv(
-                            StringIO(content),
-                            on_bad_lines="skip",  # Skip problematic lines
-                            engine="python",  # Use Python engine for better error handling
-                            quoting=3,  # QUOTE_NONE - disable quote parsing
-                            escapechar="\\",  # Handle escape characters
-                            sep=None,  # Auto-detect separator
-                            encoding_errors="ignore",  # Ignore encoding errors
-                        )
-                        print(
-                            f"  - Successfully decoded with {encoding} encoding using flexible parsing"
-                        )
-                        return df
-                    except Exception as flex_e:
-                        print(
-                            f"  - Flexible parsing also failed with {encoding}: {flex_e}"
-                        )
-                        continue
-
-            except (UnicodeDecodeError, pd.errors.ParserError) as e:
-                print(f"  - Failed to decode with {encoding}: {e}")
-                continue
-
-        # If all encodings fail, try a more aggressive approach
-        print("  - All standard encodings failed, trying aggressive parsing...")
-        try:
-            # Use chardet to detect encoding
-            import chardet
-
-            detected = chardet.detect(response.content)
-            detected_encoding = (
-                detected["encoding"] if detected["encoding"] else "utf-8"
-            )
-            print(
-                f"  - Detected encoding: {detected_encoding} (confidence: {detected['confidence']:.2f})"
-            )
+def _parse_season_stage(
+    season: str,
+    cached: CachedResponse | None,
+    states: dict[str, IngestionState],
+    chunk_size: int | None = None,
+    full_reload: bool = False,
+) -> SeasonLoad | None:
+    """
+    Pipeline parse stage: decode, clean and type a season's CSV.
 
-            content = response.content.decode(detected_encoding, errors="ignore")
-
-            # Try with very permissive settings
-            df = pd.read_csv(
-                StringIO(content),
-                on_bad_lines="skip",
-                engine="python",
-                quoting=3,
-                escapechar="\\",
-                sep=None,
-                encoding_errors="ignore",
-                low_memory=False,
-            )
-            print(
-                f"  - Successfully decoded with detected encoding {detected_encoding}"
-            )
-            return df
+    The season's rows come back from the ingestion engine as batches of
+    (insert-ready frame, rejected rows): a single batch normally, or a lazy
+    batch iterator when chunk_size is set. Only rounds from the season's
+    high-water mark onwards are kept, and nothing is parsed if the source is
+    unchanged.
+    """
+    state = states.get(season)
+    from_round = resume_round(state, full_reload)
 
-        except Exception as e:
-            print(f"  - Aggressive parsing also failed: {e}")
+    if cached and state and not full_reload and state.content_digest == cached.digest:
+        return SeasonLoad((), cached.digest, from_round, unchanged=True)
 
-        # If all parsing methods fail, try to save the file locally for manual inspection
-        print(
-            "  - All parsing methods failed, saving file locally for manual inspection..."
-        )
-        try:
-
-            # Create a temporary file
-            with tempfile.NamedTemporaryFile(
-                mode="wb", suffix=".csv", delete=False
-            ) as f:
-                f.write(response.content)
-                temp_path = f.name
-
-            print(f"  - Saved problematic CSV to: {temp_path}")
-            print(f"  - File size: {len(response.content)} bytes")
-
-            # Try one more time with the most permissive settings possible
-            try:
-                df = pd.read_csv(
-                    temp_path,
-                    on_bad_lines="skip",
-                    engine="python",
-                    quoting=3,
-                    escapechar="\\",
-                    sep=None,
-                    encoding_errors="ignore",
-                    low_memory=False,
-                )
-                print(
-                    "  - Successfully parsed with local file and most permissive settings"
-                )
-                return df
-            except Exception as final_e:
-                print(f"  - Final parsing attempt also failed: {final_e}")
-                print(f"  - Please manually inspect the file at: {temp_path}")
+    if from_round is not None:
+        print(f"  - {season}: loading from round {from_round} onwards")
 
-        except Exception as save_e:
-            print(f"  - Could not save file locally: {save_e}")
+    if cached is None:
+        # Try to diagnose the issue
+        _diagnose_csv_issues(_season_csv_url(season), season)
+        return None
 
-        raise Exception(
-            "Could not decode CSV with any supported encoding or parsing method"
-        )
+    if chunk_size:
+        batches = _iter_season_chunks(cached.path, season, chunk_size, from_round)
+        return SeasonLoad(batches, cached.digest, from_round)
 
-    except requests.exceptions.RequestException as e:
-        print(f"  - Could not fetch data for season {season}. " f"Network error: {e}")
-        return None
+    try:
+        raw = read_csv_frame(cached.path)
     except Exception as e:
         print(f"  - Could not process data for season {season}. Error: {e}")
+        print(f"  - Please manually inspect the file at: {cached.path}")
+        _diagnose_csv_issues(_season_csv_url(season), season)
         return None
 
+    # Clean and type the whole file against the season's schema
+    rows, rejected = clean_frame(raw, season_schema(season), from_round=from_round)
+    print(f"  - Found {rows.height + rejected.height} records in CSV for {season}")
+    return SeasonLoad([(rows, rejected)], cached.digest, from_round)
 
-def _clean_csv_data(df: pd.DataFrame, season: str) -> pd.DataFrame:
-    """Clean and validate CSV data to handle inconsistencies."""
-    if df is None or df.empty:
-        return df
 
-    print(f"  - Original data shape: {df.shape}")
-    print(f"  - Original columns: {list(df.columns)}")
+def _iter_season_chunks(
+    source: Path, season: str, chunk_size: int, from_round: int | None = None
+) -> Iterator[tuple[pl.DataFrame, pl.DataFrame]]:
+    """
+    Stream a season's CSV from disk as cleaned batches of rows.
 
-    # Remove completely empty rows
-    df = df.dropna(how="all")
+    Only one batch (plus the decoder's read buffer) is held in memory at a time.
+    """
+    print(f"  - {season}: streaming in batches of {chunk_size} rows")
+    schema = season_schema(season)
+    for first_line, batch in iter_csv_batches(source, chunk_size):
+        yield clean_frame(batch, schema, from_round=from_round, first_line=first_line)
 
-    # Remove rows where all required fields are missing (team is now optional)
-    required_fields = ["name", "round", "opponent_team"]
-    df = df.dropna(subset=required_fields, how="all")
 
-    # Handle inconsistent column counts by standardizing columns
-    # Get the most common column count
-    column_counts = df.count(axis=1)
-    most_common_count = column_counts.mode().iloc[0] if not column_counts.empty else 0
+def _write_season_stage(
+    season: str, load: SeasonLoad | None, batch_size: int = 5000
+) -> tuple[int, int, int] | None:
+    """
+    Pipeline write stage: upsert a season's rows and update its state.
 
-    print(f"  - Most common column count: {most_common_count}")
+    Batches are merged by the season's natural key, so reruns are idempotent.
+    Rows the database refuses are isolated by bisecting their batch and are
+    recorded in the rejected_rows table together with the rows rejected
+    during coercion. The ingestion state is updated in the same transaction.
 
-    # If we have inconsistent column counts, try to fix by dropping problematic rows
-    if column_counts.std() > 0:
-        print(f"  - Column count standard deviation: {column_counts.std():.2f}")
-        print(
-            f"  - Rows with different column counts: {len(column_counts[column_counts != most_common_count])}"
-        )
+    Returns the season's (added, skipped, errors) counters.
+    """
+    if load is None:
+        return None
+    if load.unchanged:
+        print(f"  - {season}: unchanged since last load, skipping")
+        return 0, 0, 0
 
-        # Keep only rows with the most common column count
-        df = df[column_counts == most_common_count]
-        print(f"  - After filtering by column count: {df.shape}")
+    model_class = PAST_SEASONS[season]
+    table = model_class.__table__
 
-    # Clean column names
-    df.columns = df.columns.str.strip()
+    def write(cursor: Any, rows: pl.DataFrame) -> tuple[int, int]:
+        return upsert_dataframe(cursor, table, rows, SEASON_MERGE_RULE)
 
-    # Remove any completely empty columns
-    df = df.dropna(axis=1, how="all")
+    season_records_added = 0
+    season_records_updated = 0
+    season_records_skipped = 0
+    season_errors = 0
+    skip_reasons: Counter[str] = Counter()
 
-    # Fill NaN values with appropriate defaults
-    df = df.fillna(
-        {
-            "minutes": 0,
-            "goals_scored": 0,
-            "assists": 0,
-            "clean_sheets": 0,
-            "goals_conceded": 0,
-            "own_goals": 0,
-            "penalties_saved": 0,
-            "penalties_missed": 0,
-            "yellow_cards": 0,
-            "red_cards": 0,
-            "saves": 0,
-            "bonus": 0,
-            "bps": 0,
-            "influence": 0.0,
-            "creativity": 0.0,
-            "threat": 0.0,
-            "ict_index": 0.0,
-            "total_points": 0,
-            "value": 0,
-            "transfers_balance": 0,
-            "selected": 0,
-            "transfers_in": 0,
-            "transfers_out": 0,
-            "was_home": False,
-        }
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            for frame, rejected in load.batches:
+                season_records_skipped += rejected.height
+                skip_reasons.update(rejected[REJECT_REASON].to_list())
+                inserted, updated, refused = write_isolating(
+                    cursor, frame, write, batch_size
+                )
+                season_records_added += inserted
+                season_records_updated += updated
+                season_errors += len(refused)
+
+                rejects = [
+                    (line, reason, None) for line, reason in rejected.iter_rows()
+                ]
+                rejects += [
+                    (
+                        frame[SOURCE_LINE][position],
+                        error,
+                        json.dumps(frame.row(position, named=True), default=str),
+                    )
+                    for position, error in refused
+                ]
+                record_rejected_rows(cursor, table.name, rejects)
+
+            cursor.execute(
+                f'SELECT count(*), max("round") FROM {quote_identifier(table.name)}'
+            )
+            rows_loaded, last_round = cursor.fetchone()
+            # Only a past season that loaded without a refused or rejected
+            # row is closed; otherwise the stored digest decides on reruns
+            complete = season_errors == 0 and season_records_skipped == 0
+            record_ingestion_state(
+                cursor,
+                season,
+                SeasonProgress(
+                    last_round=last_round,
+                    content_digest=load.digest,
+                    rows_loaded=rows_loaded,
+                    closed=season != CURRENT_SEASON and complete,
+                ),
+            )
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        print(f"    - Bulk write failed for {model_class.__tablename__}: {e}")
+        # Rows refused so far stay counted; the written ones were rolled back
+        season_errors += season_records_added + season_records_updated
+        season_records_added = 0
+        season_records_updated = 0
+    finally:
+        connection.close()
+
+    for reason, count in skip_reasons.items():
+        print(f"    - {season}: skipped {count} rows: {reason}")
+    if season_errors:
+        print(f"    - {season}: {season_errors} rows refused, see rejected_rows")
+
+    print(
+        f"  - Season {season} completed: "
+        f"{season_records_added} added, "
+        f"{season_records_updated} updated, "
+        f"{season_records_skipped} skipped, "
+        f"{season_errors} errors"
     )
+    return season_records_added, season_records_skipped, season_errors
+
 
-    print(f"  - Cleaned data shape: {df.shape}")
-    print(f"  - Cleaned columns: {list(df.columns)}")
+def _download_csv(url: str, season: str) -> CachedResponse | None:
+    """
+    Download a season's CSV into the local cache, revalidating any cached copy.
 
-    return df
+    Returns the cached response, or None if it could not be fetched.
+    """
+    try:
+        cached = fetch_cached(url)
+        if cached.not_modified:
+            print(f"  - {season}: using cached copy (unchanged upstream)")
+        return cached
+    except requests.exceptions.RequestException as e:
+        print(f"  - Could not fetch data for season {season}. " f"Network error: {e}")
+        return None
 
 
 def _diagnose_csv_issues(url: str, season: str) -> None:
     """Diagnose CSV issues by examining the raw content."""
     try:
         print(f"  - Diagnosing CSV issues for season {season}...")
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+        # Reuse the copy the loader just fetched instead of downloading again
+        cached = get_http_cache().lookup(url) or fetch_cached(url)
 
         # Check the first few lines to understand the structure
-        content = response.content.decode("utf-8", errors="ignore")
+        with open_decoded(cached.path) as stream:
+            content = stream.read()
         lines = content.split("\n")
 
         print(f"  - Total lines in file: {len(lines)}")
@@ -893,167 +1197,6 @@ def _diagnose_csv_issues(url: str, season: str) -> None:
         print(f"  - Error during diagnosis: {e}")
 
 
-def _should_skip_record(row: pd.Series) -> bool:
-    """Check if record should be skipped."""
-    return pd.isna(row.get("opponent_team")) or row.get("opponent_team") is None
-
-
-def _process_row_data(row: pd.Series, model_class: type, season: str) -> dict | None:
-    """Process row data into model format."""
-    try:
-        gw_data = row.to_dict()
-
-        # Ensure all required columns exist, providing defaults if not
-        for col in model_class.__table__.columns:
-            if col.name not in gw_data:
-                gw_data[col.name] = None
-
-        # Convert kickoff_time to datetime object
-        if pd.notna(gw_data.get("kickoff_time")):
-            try:
-                kickoff_str = str(gw_data["kickoff_time"]).replace("Z", "+00:00")
-                # Handle various datetime formats
-                if "T" in kickoff_str:
-                    gw_data["kickoff_time"] = datetime.fromisoformat(kickoff_str)
-                else:
-                    # Try parsing common date formats
-                    for fmt in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d/%m/%Y"]:
-                        try:
-                            gw_data["kickoff_time"] = datetime.strptime(
-                                kickoff_str, fmt
-                            )
-                            break
-                        except ValueError:
-                            continue
-                    else:
-                        gw_data["kickoff_time"] = None
-            except (ValueError, TypeError):
-                gw_data["kickoff_time"] = None
-        else:
-            gw_data["kickoff_time"] = None
-
-        gw_data["season"] = season
-
-        # Handle was_home column
-        if "was_home" not in gw_data or pd.isna(gw_data.get("was_home")):
-            gw_data["was_home"] = False
-        else:
-            # Convert was_home to boolean
-            was_home_value = gw_data["was_home"]
-            if isinstance(was_home_value, str):
-                gw_data["was_home"] = was_home_value.lower() in [
-                    "true",
-                    "1",
-                    "yes",
-                    "home",
-                ]
-            elif isinstance(was_home_value, (int, float)):
-                gw_data["was_home"] = bool(was_home_value)
-            else:
-                gw_data["was_home"] = bool(was_home_value)
-
-        # Drop the id that is in the table model, if present
-        if "id" in gw_data:
-            gw_data.pop("id")
-
-        # Filter only for columns that exist in the table model
-        model_data = {
-            key.name: gw_data[key.name]
-            for key in model_class.__table__.columns
-            if key.name in gw_data
-        }
-
-        # Ensure UUID for id
-        model_data["id"] = uuid4()
-
-        # Validate required fields (team is now optional)
-        required_fields = ["name", "round", "opponent_team"]
-        for field in required_fields:
-            if field in model_data and pd.isna(model_data[field]):
-                print(f"    - Warning: Required field '{field}' is missing for row")
-                return None
-
-        # Convert numeric fields to appropriate types
-        numeric_fields = [
-            "minutes",
-            "goals_scored",
-            "assists",
-            "clean_sheets",
-            "goals_conceded",
-            "own_goals",
-            "penalties_saved",
-            "penalties_missed",
-            "yellow_cards",
-            "red_cards",
-            "saves",
-            "bonus",
-            "bps",
-            "influence",
-            "creativity",
-            "threat",
-            "ict_index",
-            "total_points",
-            "value",
-            "transfers_balance",
-            "selected",
-            "transfers_in",
-            "transfers_out",
-            "GW",
-            "round",
-        ]
-
-        for field in numeric_fields:
-            if field in model_data:
-                try:
-                    if pd.isna(model_data[field]):
-                        model_data[field] = 0
-                    # Convert to numeric, handling string values
-                    elif isinstance(model_data[field], str):
-                        # Remove any non-numeric characters except decimal points and minus signs
-                        cleaned_value = "".join(
-                            c
-                            for c in str(model_data[field])
-                            if c.isdigit() or c in ".-"
-                        )
-                        if cleaned_value:
-                            model_data[field] = float(cleaned_value)
-                        else:
-                            model_data[field] = 0
-                    else:
-                        model_data[field] = float(model_data[field])
-                except (ValueError, TypeError):
-                    model_data[field] = 0
-
-        return model_data
-
-    except Exception as e:
-        print(f"    - Error processing row data: {e}")
-        return None
-
-
-def _insert_record(db, model_class: type, model_data: dict, index: int) -> str:
-    """Insert record into database. Returns 'added', 'skipped', or 'error'."""
-    try:
-        db.add(model_class(**model_data))
-        db.commit()
-        return "added"
-
-    except IntegrityError as e:
-        db.rollback()
-        if "duplicate key value violates unique constraint" in str(e).lower() or (
-            "null value in column" in str(e).lower()
-            and "violates not-null constraint" in str(e).lower()
-        ):
-            return "skipped"
-        else:
-            print(f"    - Integrity error for row {index}: {e}")
-            return "error"
-    except Exception as e:
-        db.rollback()
-        print(f"    - Unexpected error for row {index}: {e}")
-        return "error"
-
-
 # --- Main Execution ---
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -1062,22 +1205,120 @@ if __name__ == "__main__":
     parser.add_argument(
         "--refresh",
         action="store_true",
-        help="Delete all existing data before loading new data",
+        help="Deprecated, has no effect: teams and players are always upserted",
+    )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=4,
+        help="Number of historical seasons downloaded concurrently",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=2,
+        help="Number of historical seasons parsed concurrently",
+    )
+    parser.add_argument(
+        "--write-workers",
+        type=int,
+        default=2,
+        help="Number of historical seasons written to the database concurrently",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve historical CSVs only from the local HTTP cache",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Stream historical CSVs in batches of this many rows to bound memory",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5000,
+        help="Rows per historical INSERT batch; failing batches are bisected",
+    )
+    parser.add_argument(
+        "--player-history",
+        action="store_true",
+        help="Also crawl every player's element summary into the history tables",
+    )
+    parser.add_argument(
+        "--freshness-hours",
+        type=float,
+        default=DEFAULT_FRESHNESS.total_seconds() / 3600,
+        help="Skip players without a counters snapshot fetched within this many hours",
+    )
+    parser.add_argument(
+        "--full-crawl",
+        action="store_true",
+        help="Ignore the crawl checkpoints and fetch every player's element summary",
+    )
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Fill the current season's gameweek history from the event-live "
+        "endpoint (one request per gameweek) instead of element summaries",
+    )
+    parser.add_argument(
+        "--gameweek",
+        type=int,
+        action="append",
+        help="Gameweek to load with --live (repeatable; defaults to every played one)",
+    )
+    parser.add_argument(
+        "--request-rate",
+        type=float,
+        default=10.0,
+        help="Maximum element-summary requests per second",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=32,
+        help="Upper bound on element-summary requests in flight",
+    )
+    parser.add_argument(
+        "--full-reload",
+        action="store_true",
+        help="Ignore the ingestion state and reload every historical season",
     )
 
     args = parser.parse_args()
+    if args.offline:
+        configure_http_cache(offline=True)
 
     # Load teams and players data
     print("Loading teams and players data...")
     load_teams_and_players(args.refresh)
 
     # Load player history data
-    # print("Loading player history data...")
-    # load_player_history()
+    if args.live:
+        print("Loading gameweek history from the event-live endpoint...")
+        load_gameweek_live(CURRENT_SEASON, args.gameweek)
+    elif args.player_history:
+        print("Loading player history data...")
+        load_player_history(
+            args.request_rate,
+            args.max_concurrency,
+            freshness=timedelta(hours=args.freshness_hours),
+            full=args.full_crawl,
+        )
 
     # # Load historical gameweek data
     print("Loading historical gameweek data from GitHub...")
-    load_historical_gameweek_data_from_github()
+    load_historical_gameweek_data_from_github(
+        PipelineConfig(args.fetch_workers, args.parse_workers, args.write_workers),
+        chunk_size=args.chunk_size,
+        full_reload=args.full_reload,
+        batch_size=args.batch_size,
+    )
 
     # Match players across seasons
     match_players_across_seasons()
+
+    get_http_client().report()
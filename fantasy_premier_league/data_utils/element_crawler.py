@@ -0,0 +1,378 @@
+"""
+Rate-controlled asyncio crawler for the FPL element-summary endpoint.
+
+Requests go through a pooled keep-alive HttpClient. A token bucket
+caps the request rate, and the number of requests in flight adapts to
+the API's behaviour: it grows while responses are fast and successful,
+and halves on 429/5xx responses or when latency climbs past a target.
+Failed requests are retried with jittered exponential backoff, honouring
+Retry-After. The crawl's throughput is therefore bounded by the rate
+limit instead of by fixed sleeps in worker threads.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+
+from fantasy_premier_league.data_utils.http_client import HttpClient, fpl_api_base_url
+
+HTTP_NOT_FOUND = 404
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_SERVER_ERROR = 500
+
+# Requests in flight when a crawl starts, before the limit adapts
+INITIAL_CONCURRENCY = 4
+
+# Response time (seconds) above which concurrency is reduced
+TARGET_LATENCY = 1.0
+
+# Base and cap (seconds) of the jittered exponential backoff between retries
+BACKOFF_BASE = 0.5
+MAX_BACKOFF = 30.0
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for coroutines.
+
+    Tokens accrue at ``rate`` per second up to ``burst``; each request
+    takes one. The bucket can also be paused, e.g. for a Retry-After.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum tokens held
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the given number of seconds."""
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        """Wait for and take one token."""
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._resume_at:
+                    await asyncio.sleep(self._resume_at - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AdaptiveConcurrency:
+    """
+    Concurrency limit adjusted by additive increase, multiplicative decrease.
+
+    Each fast, successful response raises the limit by about one request
+    per round trip's worth of responses; a throttled or failed response,
+    or one slower than the target latency, halves it.
+    """
+
+    def __init__(
+        self, initial: int, minimum: int = 1, maximum: int = 64, target_latency: float = TARGET_LATENCY
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            initial: Starting number of requests in flight
+            minimum: Lowest limit
+            maximum: Highest limit
+            target_latency: Response time (seconds) above which the limit is reduced
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self.peak_limit = self.limit
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait until a request may start."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: float, congested: bool) -> None:
+        """
+        Record a finished request and adjust the limit.
+
+        Args:
+            latency: The request's response time in seconds
+            congested: True if the response was a 429/5xx or a connection failure
+        """
+        async with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if congested or latency > self.target_latency:
+                # One reduction per round trip, so a burst of errors from one window counts once
+                if now - self._last_decrease >= max(latency, self.target_latency):
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self.peak_limit = max(self.peak_limit, self.limit)
+            self._condition.notify_all()
+
+
+@dataclass
+class CrawlStats:
+    """
+    Counters collected during a crawl.
+
+    Attributes:
+        requested: Elements crawled
+        fetched: Elements whose summary was fetched
+        not_found: Elements the API has no summary for (404)
+        failed: Elements given up on after all retries
+        retries: Requests retried
+        throttled: 429 responses received
+        seconds: Wall-clock duration of the crawl
+        final_concurrency: Concurrency limit when the crawl ended
+        peak_concurrency: Highest concurrency limit reached
+    """
+
+    requested: int = 0
+    fetched: int = 0
+    not_found: int = 0
+    failed: int = 0
+    retries: int = 0
+    throttled: int = 0
+    seconds: float = 0.0
+    final_concurrency: float = 0.0
+    peak_concurrency: float = 0.0
+
+    def report(self) -> None:
+        """Print the crawl's counters."""
+        rate = self.requested / self.seconds if self.seconds else 0.0
+        print("\nElement summary crawl:")
+        print(f"  - Requested: {self.requested} ({rate:.1f}/s over {self.seconds:.2f}s)")
+        print(f"  - Fetched: {self.fetched}, not found: {self.not_found}, failed: {self.failed}")
+        print(f"  - Retries: {self.retries}, throttled (429): {self.throttled}")
+        print(f"  - Concurrency: {self.final_concurrency:.1f} at the end, {self.peak_concurrency:.1f} at peak")
+
+
+@dataclass(frozen=True)
+class CrawlerConfig:
+    """
+    Rate and retry limits of a crawl.
+
+    Attributes:
+        rate: Maximum requests per second
+        burst: Requests that may be sent back to back after an idle period
+        max_concurrency: Upper bound on requests in flight
+        max_retries: Retries per element after the first attempt
+        timeout: Per-request timeout in seconds
+    """
+
+    rate: float = 10.0
+    burst: int = 10
+    max_concurrency: int = 32
+    max_retries: int = 4
+    timeout: float = 10.0
+
+
+class RetryableResponseError(Exception):
+    """A response worth retrying (429 or 5xx)."""
+
+    def __init__(self, status_code: int, retry_after: float | None) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    """Get a response's Retry-After delay in seconds, if it has a numeric one."""
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+@dataclass
+class _Crawl:
+    """State shared by the requests of one crawl."""
+
+    executor: Executor
+    bucket: TokenBucket
+    limiter: AdaptiveConcurrency
+    stats: CrawlStats
+
+
+class ElementSummaryCrawler:
+    """
+    Fetches /element-summary/{id}/ for many players under adaptive rate control.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        *,
+        config: CrawlerConfig | None = None,
+        client: HttpClient | None = None,
+    ) -> None:
+        """
+        Initialize the crawler.
+
+        Args:
+            base_url: API root (defaults to fpl_api_base_url())
+            config: Rate and retry limits (CrawlerConfig() if None)
+            client: HTTP client to use (by default one without its own retries, as the
+                crawler retries itself to adapt its concurrency to 429/5xx responses)
+        """
+        self.base_url = (base_url if base_url is not None else fpl_api_base_url()).rstrip("/")
+        self.config = config if config is not None else CrawlerConfig()
+        self.client = (
+            client if client is not None else HttpClient(max_retries=0, per_host_limit=self.config.max_concurrency)
+        )
+
+    def url(self, element_id: int) -> str:
+        """Get the element-summary URL of a player."""
+        return f"{self.base_url}/element-summary/{element_id}/"
+
+    def _get(self, element_id: int) -> dict[str, Any] | None:
+        """Blocking GET of one element summary; None if the API has none."""
+        response = self.client.get(self.url(element_id), timeout=self.config.timeout)
+        if response.status_code == HTTP_NOT_FOUND:
+            return None
+        if response.status_code == HTTP_TOO_MANY_REQUESTS or response.status_code >= HTTP_SERVER_ERROR:
+            raise RetryableResponseError(response.status_code, _retry_after(response))
+        response.raise_for_status()
+        return response.json()
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay before a retry."""
+        return random.uniform(0, min(MAX_BACKOFF, BACKOFF_BASE * 2**attempt))
+
+    async def _fetch(self, element_id: int, crawl: _Crawl) -> dict[str, Any] | None:
+        """Fetch one element summary in the crawl's executor, retrying throttled and failed requests."""
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.config.max_retries + 1):
+            await crawl.limiter.acquire()
+            await crawl.bucket.acquire()
+            started = time.monotonic()
+            congested = False
+            try:
+                return await loop.run_in_executor(crawl.executor, self._get, element_id)
+            except RetryableResponseError as e:
+                congested = True
+                if e.status_code == HTTP_TOO_MANY_REQUESTS:
+                    crawl.stats.throttled += 1
+                delay = e.retry_after if e.retry_after is not None else self._backoff_delay(attempt)
+                if e.retry_after is not None:
+                    # The server asked everyone to wait, not just this request
+                    crawl.bucket.pause(delay)
+                error: Exception = e
+            except (requests.ConnectionError, requests.Timeout) as e:
+                congested = True
+                delay = self._backoff_delay(attempt)
+                error = e
+            finally:
+                await crawl.limiter.release(time.monotonic() - started, congested)
+
+            if attempt == self.config.max_retries:
+                raise error
+            crawl.stats.retries += 1
+            await asyncio.sleep(delay)
+        return None
+
+    async def crawl_async(
+        self,
+        element_ids: Iterable[int],
+        handle: Callable[[int, dict[str, Any] | None], Any],
+        on_error: Callable[[int, Exception], Any] | None = None,
+    ) -> CrawlStats:
+        """
+        Crawl element summaries, handing each to a callback as it arrives.
+
+        The callbacks run in a worker thread, so blocking work such as
+        database writes never stalls the requests in flight. An element
+        whose fetch or callback fails is counted as failed.
+
+        Args:
+            element_ids: FPL element ids to fetch
+            handle: Called as handle(element_id, summary) with the decoded JSON,
+                or None if the API has no summary for the element
+            on_error: Called as on_error(element_id, error) for an element given up on
+
+        Returns:
+            The crawl's counters
+        """
+        ids = list(element_ids)
+        stats = CrawlStats(requested=len(ids))
+        bucket = TokenBucket(self.config.rate, self.config.burst)
+        limiter = AdaptiveConcurrency(
+            INITIAL_CONCURRENCY, maximum=self.config.max_concurrency, target_latency=TARGET_LATENCY
+        )
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+
+        async def crawl_one(crawl: _Crawl, element_id: int) -> None:
+            # Counted only once the callback has also succeeded, so each element lands in one counter
+            try:
+                summary = await self._fetch(element_id, crawl)
+                await loop.run_in_executor(crawl.executor, handle, element_id, summary)
+            except Exception as e:
+                stats.failed += 1
+                print(f"  - Giving up on element {element_id}: {e}")
+                if on_error is not None:
+                    await loop.run_in_executor(crawl.executor, on_error, element_id, e)
+                return
+            if summary is None:
+                stats.not_found += 1
+            else:
+                stats.fetched += 1
+
+        # Threads for the blocking requests and callbacks, sized to the concurrency cap;
+        # passed explicitly so the caller's event loop keeps its own default executor
+        with ThreadPoolExecutor(max_workers=self.config.max_concurrency * 2) as executor:
+            crawl = _Crawl(executor, bucket, limiter, stats)
+            await asyncio.gather(*(crawl_one(crawl, element_id) for element_id in ids))
+
+        stats.seconds = time.monotonic() - started
+        stats.final_concurrency = limiter.limit
+        stats.peak_concurrency = limiter.peak_limit
+        return stats
+
+    def crawl(
+        self,
+        element_ids: Iterable[int],
+        handle: Callable[[int, dict[str, Any] | None], Any],
+        on_error: Callable[[int, Exception], Any] | None = None,
+    ) -> CrawlStats:
+        """
+        Crawl element summaries from synchronous code; see crawl_async.
+
+        Args:
+            element_ids: FPL element ids to fetch
+            handle: Called as handle(element_id, summary) for every element fetched
+            on_error: Called as on_error(element_id, error) for an element given up on
+
+        Returns:
+            The crawl's counters
+        """
+        return asyncio.run(self.crawl_async(element_ids, handle, on_error))
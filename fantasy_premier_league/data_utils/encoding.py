@@ -0,0 +1,106 @@
+"""
+Encoding detection and streaming decode for upstream CSV files.
+
+The encoding is picked from a bounded prefix of the file, and the body
+is then decoded once, incrementally, as the parser reads it. Byte runs
+that are invalid in the chosen encoding are decoded on their own with a
+fallback encoding, instead of re-decoding the whole file with another
+codec.
+"""
+
+import codecs
+import io
+import re
+from pathlib import Path
+
+from chardet import detect
+
+# Number of leading bytes used to choose an encoding
+SNIFF_BYTES = 64 * 1024
+
+# Encoding used for byte runs that fail to decode with the sniffed encoding
+FALLBACK_ENCODING = "cp1252"
+
+# Name of the codec error handler that applies FALLBACK_ENCODING
+FALLBACK_ERRORS = "fpl-fallback"
+
+# Any decoded non-ASCII character other than the replacement character
+_NON_ASCII_TEXT = re.compile("[^\x00-\x7f\ufffd]")
+
+
+def _decode_with_fallback(error: UnicodeError) -> tuple[str, int]:
+    """Codec error handler: decode only the offending bytes with the fallback encoding."""
+    if not isinstance(error, UnicodeDecodeError):
+        raise error
+    bad_bytes = error.object[error.start : error.end]
+    return bad_bytes.decode(FALLBACK_ENCODING, errors="replace"), error.end
+
+
+codecs.register_error(FALLBACK_ERRORS, _decode_with_fallback)
+
+
+def sniff_encoding(prefix: bytes) -> str:
+    """
+    Choose an encoding from the first bytes of a file.
+
+    Args:
+        prefix: Leading bytes of the file (at most SNIFF_BYTES are used)
+
+    Returns:
+        Python codec name
+    """
+    prefix = prefix[:SNIFF_BYTES]
+    if prefix.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if prefix.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+
+    # An incremental decoder tolerates a multi-byte character cut by the prefix boundary
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    # Valid multi-byte UTF-8 alongside invalid bytes means a mostly UTF-8 file
+    # with a few stray bytes, which the fallback decoder handles
+    if _NON_ASCII_TEXT.search(prefix.decode("utf-8", errors="replace")):
+        return "utf-8"
+
+    detected = detect(prefix)
+    encoding = detected["encoding"] or FALLBACK_ENCODING
+    return "utf-8" if encoding.lower() == "ascii" else encoding
+
+
+def read_prefix(source: bytes | str | Path, size: int = SNIFF_BYTES) -> bytes:
+    """
+    Read the first bytes of in-memory content or a file.
+
+    Args:
+        source: Raw content, or the path of a file holding it
+        size: Maximum number of bytes to read
+
+    Returns:
+        The leading bytes
+    """
+    if isinstance(source, bytes):
+        return source[:size]
+    with open(source, "rb") as f:
+        return f.read(size)
+
+
+def open_decoded(source: bytes | str | Path, encoding: str | None = None) -> io.TextIOWrapper:
+    """
+    Open raw content as a text stream that decodes lazily in a single pass.
+
+    Args:
+        source: Raw content, or the path of a file holding it
+        encoding: Encoding to decode with (sniffed from the prefix if omitted)
+
+    Returns:
+        Text stream; invalid byte runs are decoded with FALLBACK_ENCODING
+    """
+    if encoding is None:
+        encoding = sniff_encoding(read_prefix(source))
+    raw = io.BytesIO(source) if isinstance(source, bytes) else open(source, "rb")  # noqa: SIM115
+    return io.TextIOWrapper(raw, encoding=encoding, errors=FALLBACK_ERRORS, newline="")
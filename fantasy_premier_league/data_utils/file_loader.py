@@ -1,19 +1,73 @@
-import io
+import argparse
+import multiprocessing
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import cache
+from io import BytesIO
+from threading import Lock
+from typing import NamedTuple
 
 import polars as pl
 import requests
-from chardet import detect
+from sqlalchemy import Engine
 
-from fantasy_premier_league.database import get_database_url
+from fantasy_premier_league.data_utils.encoding import open_decoded, sniff_encoding
+from fantasy_premier_league.data_utils.http_cache import (
+    CachedResponse,
+    configure_http_cache,
+    fetch_cached,
+    fetch_prefix,
+    get_http_cache,
+)
+from fantasy_premier_league.data_utils.http_client import get_http_client
+from fantasy_premier_league.data_utils.ingestion import PostgresSink, ingest, read_csv_frame
+from fantasy_premier_league.data_utils.parquet_mirror import ParquetMirror
+from fantasy_premier_league.data_utils.pipeline import HISTORICAL_PIPELINE, PipelineConfig, run_pipeline
+from fantasy_premier_league.database import get_engine
+
+# Season directory in the upstream repository's file URLs
+SEASON_IN_URL = re.compile(r"/data/(\d{4}-\d{2})/")
+
+# Bytes read from the start of a file to infer its schema
+SCHEMA_PREFIX_BYTES = 256 * 1024
+
+# Inferred schemas keyed by (url, rows inferred from, prefix bytes read)
+_schema_cache: dict[tuple[str, int, int], dict[str, str]] = {}
+_schema_cache_lock = Lock()
 
 
 class FileLoader:
-    def __init__(self, url: str | None = None):
+    def __init__(self, url: str | None = None, season: str | None = None, mirror: ParquetMirror | None = None):
+        """Create a loader for one upstream file.
+
+        Parameters
+        ----------
+        url : str | None
+            URL of the file.
+        season : str | None
+            Season the file belongs to; inferred from the URL if omitted. Files with a
+            season are kept in the local Parquet mirror.
+        mirror : ParquetMirror | None
+            Parquet mirror to use (defaults to the one in the local cache directory).
+        """
         self.url = url
+        self.season = season or self._season_from_url(url)
+        self.mirror = mirror if mirror is not None else ParquetMirror()
+
+    @staticmethod
+    def _season_from_url(url: str | None) -> str | None:
+        match = SEASON_IN_URL.search(url or "")
+        return match.group(1) if match else None
 
-    def load_file(self) -> pl.DataFrame:
+    def load_file(self, columns: list[str] | None = None) -> pl.DataFrame:
         """Load a file from GitHub and return a Polars DataFrame.
 
+        Parameters
+        ----------
+        columns : list[str] | None
+            Columns to load (all if omitted). Only these are read from the Parquet mirror.
+
         Returns
         -------
         pl.DataFrame
@@ -25,36 +79,150 @@ class FileLoader:
         requests.RequestException
             If the file cannot be downloaded.
         """
+        return self.load_response(self.fetch_response(), columns)
+
+    def load_response(self, cached: CachedResponse, columns: list[str] | None = None) -> pl.DataFrame:
+        """Load a downloaded file from the Parquet mirror, parsing and mirroring it if needed.
+
+        Parameters
+        ----------
+        cached : CachedResponse
+            The downloaded file.
+        columns : list[str] | None
+            Columns to load (all if omitted).
+
+        Returns
+        -------
+        pl.DataFrame
+            The loaded Polars DataFrame.
+        """
+        if self.season:
+            df = self.mirror.read(self.season, columns, source_digest=cached.digest)
+            if df is not None:
+                return df
+
+        df = self.parse_content(cached.content)
+        if self.season:
+            self.mirror.write(self.season, df, cached.url, cached.digest)
+        return df.select(columns) if columns else df
+
+    def fetch_response(self) -> CachedResponse:
+        """Download the raw file from GitHub, revalidating any locally cached copy.
+
+        Returns
+        -------
+        CachedResponse
+            The cached file, with its digest.
+        Raises
+        ------
+        ValueError
+            If no URL is provided.
+        requests.RequestException
+            If the file cannot be downloaded.
+        """
         if not self.url:
             raise ValueError("No URL provided. Set url in constructor or use load_file_from_url method.")
         try:
-            response = requests.get(self.url, timeout=10)
-            response.raise_for_status()
-
-            # Detect the actual encoding of the file
-            detected_encoding = detect(response.content)
-            print(f"Detected encoding: {detected_encoding}")
-            # Decode with the detected encoding, then encode as UTF-8
-            encoding = detected_encoding["encoding"] if detected_encoding["encoding"] is not None else "utf-8"
-            text_content = response.content.decode(encoding)
-
-            # Load into Polars using StringIO
-            df = pl.read_csv(io.StringIO(text_content))
-            return df
+            return fetch_cached(self.url)
         except requests.RequestException as e:
             raise requests.RequestException(f"Failed to download file from {self.url}: {e}") from e
+
+    def fetch_content(self) -> bytes:
+        """Download the raw file from GitHub, revalidating any locally cached copy.
+
+        Returns
+        -------
+        bytes
+            The raw file content.
+        Raises
+        ------
+        ValueError
+            If no URL is provided.
+        requests.RequestException
+            If the file cannot be downloaded.
+        """
+        return self.fetch_response().content
+
+    def parse_content(self, content: bytes) -> pl.DataFrame:
+        """Decode raw file content and parse it into a Polars DataFrame.
+
+        Parameters
+        ----------
+        content : bytes
+            The raw file content.
+
+        Returns
+        -------
+        pl.DataFrame
+            The parsed Polars DataFrame.
+        Raises
+        ------
+        RuntimeError
+            If the content cannot be decoded or parsed.
+        """
+        try:
+            return read_csv_frame(content)
         except Exception as e:
             raise RuntimeError(f"Failed to process file from {self.url}: {e}") from e
 
-    def get_column_names_and_types(self) -> dict[str, str]:
-        """Get the column names and types of a Polars DataFrame.
+    def get_column_names_and_types(
+        self, infer_rows: int = 1000, prefix_bytes: int = SCHEMA_PREFIX_BYTES
+    ) -> dict[str, str]:
+        """Get the column names and types of the file without loading all of it.
+
+        The schema comes from the Parquet mirror when the locally cached file is mirrored.
+        Otherwise it is inferred from the first rows of a bounded prefix, read from the
+        local cache or fetched with an HTTP Range request. Results are cached per URL and
+        inference window.
+
+        Parameters
+        ----------
+        infer_rows : int
+            Number of rows the column types are inferred from.
+        prefix_bytes : int
+            Maximum number of bytes read from the start of the file.
 
         Returns
         -------
         dict[str, str]
             Dictionary mapping column names to their Polars data types.
         """
-        schema = self.load_file().schema
+        if not self.url:
+            raise ValueError("No URL provided. Set url in constructor or use load_file_from_url method.")
+        key = (self.url, infer_rows, prefix_bytes)
+        with _schema_cache_lock:
+            if key in _schema_cache:
+                return dict(_schema_cache[key])
+
+        schema = self._mirrored_schema() or self._infer_schema_from_prefix(infer_rows, prefix_bytes)
+        with _schema_cache_lock:
+            _schema_cache[key] = schema
+        return dict(schema)
+
+    def _mirrored_schema(self) -> dict[str, str] | None:
+        """Get the schema stored with the Parquet mirror of the locally cached file, if any."""
+        if not self.season:
+            return None
+        cached = get_http_cache().lookup(self.url)
+        return self.mirror.schema(self.season, source_digest=cached.digest) if cached is not None else None
+
+    def _infer_schema_from_prefix(self, infer_rows: int, prefix_bytes: int) -> dict[str, str]:
+        """Infer the schema from the first rows of the file with a lazy scan."""
+        try:
+            prefix = fetch_prefix(self.url, prefix_bytes)
+        except requests.RequestException as e:
+            raise requests.RequestException(f"Failed to download file from {self.url}: {e}") from e
+
+        # Drop a trailing row cut off by the prefix boundary
+        if len(prefix) == prefix_bytes and b"\n" in prefix:
+            prefix = prefix[: prefix.rindex(b"\n") + 1]
+
+        encoding = sniff_encoding(prefix)
+        if encoding != "utf-8":
+            with open_decoded(prefix, encoding) as stream:
+                prefix = stream.read().encode("utf-8")
+
+        schema = pl.scan_csv(BytesIO(prefix), infer_schema_length=infer_rows, encoding="utf8-lossy").collect_schema()
         return {name: str(dtype) for name, dtype in schema.items()}
 
     def generate_alembic_migration_table(self, table_name: str) -> str:
@@ -131,43 +299,239 @@ class DbFileLoader(FileLoader):
         pl.DataFrame
             The loaded Polars DataFrame.
         """
-        # Temporarily set the URL and load the file
-        original_url = self.url
-        self.url = url
-        try:
-            df = super().load_file()
-        finally:
-            self.url = original_url
-        return df
+        # Use a separate loader so concurrent calls never share self.url
+        return type(self)(url, mirror=self.mirror).load_file()
 
-    def write_file_to_db(self, season_name: str) -> None:
+    def write_file_to_db(self, season_name: str) -> int:
         """Write a Polars DataFrame to the database.
 
         Parameters
         ----------
         season_name : str
             The name of the season to write the DataFrame to.
+
+        Returns
+        -------
+        int
+            The number of rows written.
         Raises
         ------
         RuntimeError
             If the database operation fails.
         """
         try:
-            url = f"https://raw.githubusercontent.com/vaastav/Fantasy-Premier-League/master/data/{season_name}/gws/merged_gw.csv"
-            df = self.load_file_from_url(url)
-            df.write_database(
-                table_name=f"player_gameweek_history_{season_name.replace('-', '_')}",
-                connection=get_database_url(),
-                if_table_exists="replace",
-            )
-            print(f"Successfully loaded {season_name} data to database")
+            df = self.load_file_from_url(season_url(season_name))
         except Exception as e:
             raise RuntimeError(f"Failed to write {season_name} data to database: {e}") from e
+        return self.write_dataframe_to_db(df, season_name)
+
+    def write_dataframe_to_db(self, df: pl.DataFrame, season_name: str) -> int:
+        """Write an already loaded season DataFrame to the database.
+
+        The rows are cleaned and typed by the ingestion engine against the season's schema,
+        COPY'd into a staging table and swapped into the season table in one transaction,
+        so readers never see a partially loaded season. Rows already stored keep their id
+        and all_player_id, as with the upserting loader. Rows the cleaning step rejects
+        (missing a required field, or misaligned) and rows repeating a natural key are
+        recorded in rejected_rows with their reason, in the same transaction.
+
+        Parameters
+        ----------
+        df : pl.DataFrame
+            The season's data.
+        season_name : str
+            The name of the season to write the DataFrame to.
+
+        Returns
+        -------
+        int
+            The number of rows written.
+        Raises
+        ------
+        RuntimeError
+            If the database operation fails.
+        """
+        try:
+            result = ingest(season_name, df, [PostgresSink(_engine().raw_connection)])
+        except Exception as e:
+            raise RuntimeError(f"Failed to write {season_name} data to database: {e}") from e
+        (written,) = result.written
+        print(f"Successfully loaded {written} rows of {season_name} data to database")
+        return written
+
+
+@cache
+def _engine() -> Engine:
+    """Get the engine shared by all database writes in this process."""
+    return get_engine()
+
+
+def season_url(season_name: str) -> str:
+    """Build the merged_gw.csv URL for a season.
+
+    Parameters
+    ----------
+    season_name : str
+        The season, e.g. "2023-24".
+
+    Returns
+    -------
+    str
+        The raw GitHub URL of the season's merged gameweek file.
+    """
+    return f"https://raw.githubusercontent.com/vaastav/Fantasy-Premier-League/master/data/{season_name}/gws/merged_gw.csv"
+
+
+def load_seasons(season_names: list[str], config: PipelineConfig = HISTORICAL_PIPELINE) -> None:
+    """Load several seasons through a concurrent fetch -> parse -> write pipeline.
+
+    Parameters
+    ----------
+    season_names : list[str]
+        The seasons to load.
+    config : PipelineConfig
+        Number of seasons downloaded, decoded and written to the database concurrently.
+    Raises
+    ------
+    RuntimeError
+        If any season fails to load.
+    """
+    fl = DbFileLoader()
+    results, stats = run_pipeline(
+        season_names,
+        fetch=lambda season: DbFileLoader(season_url(season), season).fetch_response(),
+        parse=lambda season, cached: DbFileLoader(season_url(season), season).load_response(cached),
+        write=lambda season, df: fl.write_dataframe_to_db(df, season),
+        config=config,
+    )
+    stats.report()
+
+    failures = {season: error for season, error in results.items() if isinstance(error, Exception)}
+    for season, error in failures.items():
+        print(f"Failed to load {season}: {error}")
+    if failures:
+        raise RuntimeError(f"Failed to load {len(failures)} of {len(season_names)} seasons")
+
+
+class SeasonLoadResult(NamedTuple):
+    """Outcome of loading one season in a worker process."""
+
+    season: str
+    rows: int
+    load_seconds: float
+    write_seconds: float
+    error: str | None = None
+
+
+def _init_season_worker(offline: bool) -> None:
+    """Prepare a freshly started worker process."""
+    if offline:
+        configure_http_cache(offline=True)
+    # Each worker opens its own engine and connection pool on first write
+    _engine.cache_clear()
+
+
+def _load_season_in_worker(season_name: str) -> SeasonLoadResult:
+    """Download, parse and write one season inside a worker process."""
+    timings = {"load": 0.0, "write": 0.0}
+    stage = "load"
+    started = time.perf_counter()
+    try:
+        loader = DbFileLoader(season_url(season_name), season_name)
+        df = loader.load_file()
+        timings["load"] = time.perf_counter() - started
+        stage, started = "write", time.perf_counter()
+        rows = loader.write_dataframe_to_db(df, season_name)
+        timings["write"] = time.perf_counter() - started
+    except Exception as e:
+        timings[stage] = time.perf_counter() - started
+        # Exceptions are reported as text; not every driver error survives pickling
+        return SeasonLoadResult(season_name, 0, timings["load"], timings["write"], f"{type(e).__name__}: {e}")
+    return SeasonLoadResult(season_name, rows, timings["load"], timings["write"])
+
+
+def load_seasons_in_processes(season_names: list[str], workers: int, offline: bool = False) -> list[SeasonLoadResult]:
+    """Load several seasons in parallel, one season per worker process.
+
+    Each worker decodes, parses and writes its season on its own core, through its own
+    database connection. The coordinator collects every season's outcome and prints a
+    summary once all of them have finished.
+
+    Parameters
+    ----------
+    season_names : list[str]
+        The seasons to load.
+    workers : int
+        Number of worker processes.
+    offline : bool
+        Serve season files only from the local HTTP cache.
+
+    Returns
+    -------
+    list[SeasonLoadResult]
+        Per-season row counts, timings and errors, in season order.
+    Raises
+    ------
+    RuntimeError
+        If any season fails to load.
+    """
+    started = time.perf_counter()
+    results: dict[str, SeasonLoadResult] = {}
+    # Spawned rather than forked workers, so none inherits the parent's threads or connections
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(workers, len(season_names))),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_season_worker,
+        initargs=(offline,),
+    ) as executor:
+        futures = {executor.submit(_load_season_in_worker, season): season for season in season_names}
+        for future in as_completed(futures):
+            season = futures[future]
+            try:
+                results[season] = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. killed for running out of memory)
+                results[season] = SeasonLoadResult(season, 0, 0.0, 0.0, f"{type(e).__name__}: {e}")
+    ordered = [results[season] for season in season_names]
+    _report_season_loads(ordered, time.perf_counter() - started)
+
+    failures = [result for result in ordered if result.error is not None]
+    if failures:
+        raise RuntimeError(f"Failed to load {len(failures)} of {len(season_names)} seasons")
+    return ordered
+
+
+def _report_season_loads(results: list[SeasonLoadResult], wall_seconds: float) -> None:
+    """Print the per-season summary of a parallel load."""
+    print("\nSeason load summary:")
+    for result in results:
+        timings = f"load {result.load_seconds:.2f}s, write {result.write_seconds:.2f}s"
+        if result.error is None:
+            print(f"  - {result.season}: {result.rows} rows ({timings})")
+        else:
+            print(f"  - {result.season}: FAILED after {timings}: {result.error}")
+    loaded = sum(result.rows for result in results)
+    busy = sum(result.load_seconds + result.write_seconds for result in results)
+    print(f"  - Total: {loaded} rows, {busy:.2f}s busy, {wall_seconds:.2f}s wall clock")
 
 
 seasons = ["2016-17", "2017-18", "2018-19", "2019-20", "2020-21", "2021-22", "2022-23", "2023-24", "2024-25"]
 
 if __name__ == "__main__":
-    fl = DbFileLoader()
-    for season in seasons:
-        fl.write_file_to_db(season)
+    parser = argparse.ArgumentParser(description="Load historical gameweek data from GitHub")
+    parser.add_argument("--fetch-workers", type=int, default=4, help="Number of seasons downloaded concurrently")
+    parser.add_argument("--parse-workers", type=int, default=2, help="Number of seasons parsed concurrently")
+    parser.add_argument("--write-workers", type=int, default=2, help="Number of seasons written concurrently")
+    parser.add_argument("--offline", action="store_true", help="Serve season files only from the local HTTP cache")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Load seasons in this many worker processes instead of the pipeline"
+    )
+    args = parser.parse_args()
+    if args.offline:
+        configure_http_cache(offline=True)
+
+    if args.workers:
+        load_seasons_in_processes(seasons, args.workers, offline=args.offline)
+    else:
+        load_seasons(seasons, PipelineConfig(args.fetch_workers, args.parse_workers, args.write_workers))
+        get_http_client().report()
@@ -0,0 +1,282 @@
+"""
+Gameweek history from the FPL event-live and fixtures endpoints.
+
+/event/{gw}/live/ returns every player's stats for a gameweek in one
+response, so filling player_gameweek_history this way costs one request
+per gameweek plus one for /fixtures/, instead of one element-summary
+request per player. The responses are flattened into Polars frames and
+mapped to the table's columns with joins against the fixtures and the
+players table: the fixture gives the kickoff time and scores, and the
+side the player was on decides was_home and the opponent. That side
+comes from the fixture's bps stats, which list every player who got
+minutes under their team, so gameweeks played before a transfer are
+mapped correctly; only players without minutes fall back to their
+current team. Rows that cannot be mapped are kept in rejected_rows.
+
+A gameweek's rows are upserted by (player, season, gameweek) in one
+transaction, so reloading a gameweek (e.g. after bonus points are
+confirmed) is idempotent. Columns the live endpoint does not carry, such
+as the player's value and selection count stored by the element-summary
+loader, are left as they are. In a
+double gameweek the live endpoint only has the gameweek's combined
+stats; the row carries them against the first fixture, the same fixture
+the element-summary loader keeps.
+"""
+
+import argparse
+import json
+from collections.abc import Iterable, Sequence
+from typing import Any
+from uuid import uuid4
+
+import polars as pl
+
+from fantasy_premier_league.data_utils.bulk_writer import MergeRule, quote_identifier, upsert_dataframe
+from fantasy_premier_league.data_utils.http_client import fpl_api_url, get_http_client, http_get
+from fantasy_premier_league.data_utils.rejects import record_rejected_rows
+from fantasy_premier_league.data_utils.staging_swap import prepare_polars_frame
+from fantasy_premier_league.database import get_engine
+from fantasy_premier_league.models.player import Player
+from fantasy_premier_league.models.player_history import PlayerGameweekHistory
+
+# Fixture columns copied onto each player's row
+_FIXTURE_COLUMNS = ("id", "event", "team_h", "team_a", "team_h_score", "team_a_score", "kickoff_time")
+
+# How live rows merge into player_gameweek_history: the live endpoint has
+# no value or selected counts, and all_player_id is filled by player matching
+LIVE_MERGE_RULE = MergeRule(
+    ("player_id", "gameweek", "season"), exclude_from_update=("value", "selected", "all_player_id")
+)
+
+# Format of kickoff times in the API (UTC)
+KICKOFF_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def fetch_fixtures() -> list[dict[str, Any]]:
+    """Fetch every fixture of the season from /fixtures/."""
+    response = http_get(fpl_api_url("fixtures/"))
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_gameweek_live(gameweek: int) -> dict[str, Any]:
+    """Fetch every player's stats for a gameweek from /event/{gw}/live/."""
+    response = http_get(fpl_api_url(f"event/{gameweek}/live/"))
+    response.raise_for_status()
+    return response.json()
+
+
+def fixtures_frame(fixtures: Sequence[dict[str, Any]]) -> pl.DataFrame:
+    """
+    Flatten the fixtures response.
+
+    Args:
+        fixtures: Decoded /fixtures/ response
+
+    Returns:
+        One row per fixture with its id, gameweek (event), teams, scores and
+        kickoff time, and the players with bps stats on each side
+        (home_elements, away_elements)
+    """
+    schema = {
+        "id": pl.Int64,
+        "event": pl.Int64,
+        "team_h": pl.Int64,
+        "team_a": pl.Int64,
+        "team_h_score": pl.Int64,
+        "team_a_score": pl.Int64,
+        "kickoff_time": pl.String,
+        "home_elements": pl.List(pl.Int64),
+        "away_elements": pl.List(pl.Int64),
+    }
+    rows = [
+        {
+            **{name: fixture.get(name) for name in _FIXTURE_COLUMNS},
+            "home_elements": _side_elements(fixture, "h"),
+            "away_elements": _side_elements(fixture, "a"),
+        }
+        for fixture in fixtures
+    ]
+    return pl.DataFrame(rows, schema=schema).with_columns(
+        pl.col("kickoff_time").str.to_datetime(KICKOFF_TIME_FORMAT, strict=False)
+    )
+
+
+def _side_elements(fixture: dict[str, Any], side: str) -> list[int]:
+    """Get the players with a bps entry on one side ("h" or "a") of a fixture."""
+    for stat in fixture.get("stats", []):
+        if stat.get("identifier") == "bps":
+            return [entry["element"] for entry in stat.get(side, [])]
+    return []
+
+
+def live_frame(live: dict[str, Any]) -> pl.DataFrame:
+    """
+    Flatten an event-live response.
+
+    Players without a fixture in the gameweek (a blank gameweek for their
+    team) are left out, as the element-summary history has no row for them.
+
+    Args:
+        live: Decoded /event/{gw}/live/ response
+
+    Returns:
+        One row per player with an ``element`` column, the player's first
+        ``fixture`` of the gameweek, and one column per stat
+    """
+    rows = [
+        {"element": element["id"], "fixture": element["explain"][0]["fixture"], **element["stats"]}
+        for element in live.get("elements", [])
+        if element.get("explain")
+    ]
+    return pl.DataFrame(rows, infer_schema_length=None)
+
+
+def gameweek_rows(
+    live: pl.DataFrame, fixtures: pl.DataFrame, players: pl.DataFrame, season: str, gameweek: int
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    Map a gameweek's live stats to player_gameweek_history rows.
+
+    A player's side in the fixture is the one whose bps stats list them;
+    players without minutes (and so without bps) are placed by their
+    current team. Players missing from the players table, and players
+    without minutes whose current team played in neither side of the
+    fixture (transferred since), are rejected, as was_home and the
+    opponent cannot be derived for them.
+
+    Args:
+        live: Output of live_frame()
+        fixtures: Output of fixtures_frame()
+        players: Players table rows with fpl_id, id (UUID) and team_id columns
+        season: Season the gameweek belongs to (e.g., "2024-25")
+        gameweek: Gameweek number
+
+    Returns:
+        Tuple of (rows with the table's columns, cast to its types,
+        rejected players as element, fixture and reason)
+    """
+    rejected_schema = {"element": pl.Int64, "fixture": pl.Int64, "reason": pl.String}
+    if live.is_empty():
+        return live, pl.DataFrame(schema=rejected_schema)
+    element = pl.col("element")
+    joined = (
+        live.join(players, left_on="element", right_on="fpl_id", how="left")
+        .join(fixtures, left_on="fixture", right_on="id", how="left")
+        .with_columns(
+            pl.when(pl.col("home_elements").list.contains(element))
+            .then(True)
+            .when(pl.col("away_elements").list.contains(element))
+            .then(False)
+            .when(pl.col("team_id") == pl.col("team_h"))
+            .then(True)
+            .when(pl.col("team_id") == pl.col("team_a"))
+            .then(False)
+            .alias("was_home")
+        )
+        .with_columns(
+            pl.when(pl.col("id").is_null())
+            .then(pl.lit("player not stored"))
+            .when(pl.col("team_h").is_null())
+            .then(pl.lit("fixture not found"))
+            .when(pl.col("was_home").is_null())
+            .then(pl.lit("side unknown: no bps stats in the fixture and now at neither team"))
+            .alias("reason")
+        )
+    )
+    rejected = joined.filter(pl.col("reason").is_not_null()).select(
+        [pl.col(name).cast(dtype) for name, dtype in rejected_schema.items()]
+    )
+    rows = joined.filter(pl.col("reason").is_null()).with_columns(
+        pl.when(pl.col("was_home")).then(pl.col("team_a")).otherwise(pl.col("team_h")).alias("opponent_team_id"),
+        pl.col("id").alias("player_id"),
+        pl.col("fixture").alias("fixture_id"),
+        pl.lit(gameweek).alias("gameweek"),
+        pl.lit(season).alias("season"),
+    )
+    # Fresh ids, as the ORM's client-side default would assign
+    rows = rows.with_columns(pl.Series("id", [str(uuid4()) for _ in range(rows.height)]))
+    return prepare_polars_frame(rows, PlayerGameweekHistory.__table__), rejected
+
+
+def _players_frame(cursor: Any) -> pl.DataFrame:
+    """Read every player's fpl_id, UUID and current team."""
+    cursor.execute(f"SELECT fpl_id, id, team_id FROM {quote_identifier(Player.__tablename__)}")
+    return pl.DataFrame(
+        cursor.fetchall(),
+        schema={"fpl_id": pl.Int64, "id": pl.String, "team_id": pl.Int64},
+        orient="row",
+    )
+
+
+def _rejects(rejected: pl.DataFrame, season: str, gameweek: int) -> list[tuple[None, str, str]]:
+    """Describe gameweek_rows()' rejected players as record_rejected_rows() takes them."""
+    return [
+        (None, reason, json.dumps({"element": element, "fixture": fixture, "gameweek": gameweek, "season": season}))
+        for element, fixture, reason in rejected.iter_rows()
+    ]
+
+
+def finished_gameweeks(fixtures: pl.DataFrame) -> list[int]:
+    """Get the gameweeks with at least one fixture that has a score, in order."""
+    played = fixtures.filter(pl.col("event").is_not_null() & pl.col("team_h_score").is_not_null())
+    return sorted(played["event"].unique().to_list())
+
+
+def load_gameweek_live(season: str, gameweeks: Iterable[int] | None = None) -> dict[int, int]:
+    """
+    Fill player_gameweek_history from the event-live endpoint.
+
+    Costs one /fixtures/ request plus one /event/{gw}/live/ request per
+    gameweek. Each gameweek's rows are upserted by player, season and
+    gameweek; stored rows keep the columns the live endpoint lacks.
+
+    Args:
+        season: Season the current API data belongs to (e.g., "2024-25")
+        gameweeks: Gameweeks to load (defaults to every gameweek with a fixture that has a score)
+
+    Returns:
+        Rows inserted or updated per gameweek
+    """
+    fixtures = fixtures_frame(fetch_fixtures())
+    if gameweeks is None:
+        gameweeks = finished_gameweeks(fixtures)
+    gameweeks = sorted(set(gameweeks))
+    table = PlayerGameweekHistory.__table__
+    written = {}
+
+    connection = get_engine().raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            players = _players_frame(cursor)
+        for gameweek in gameweeks:
+            live = live_frame(fetch_gameweek_live(gameweek))
+            rows, rejected = gameweek_rows(live, fixtures, players, season, gameweek)
+            rejects = _rejects(rejected, season, gameweek)
+            with connection.cursor() as cursor:
+                inserted, updated = upsert_dataframe(cursor, table, rows, LIVE_MERGE_RULE)
+                record_rejected_rows(cursor, table.name, rejects)
+            connection.commit()
+            written[gameweek] = inserted + updated
+            print(
+                f"  - GW{gameweek}: {inserted} rows inserted, {updated} updated"
+                + (f", {len(rejects)} rejected (see rejected_rows)" if rejects else "")
+            )
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load gameweek history from the FPL event-live endpoint")
+    parser.add_argument("season", help="Season the current API data belongs to (e.g., 2024-25)")
+    parser.add_argument(
+        "--gameweek", type=int, action="append", help="Gameweek to load (repeatable; defaults to every played one)"
+    )
+    args = parser.parse_args()
+
+    load_gameweek_live(args.season, args.gameweek)
+    get_http_client().report()
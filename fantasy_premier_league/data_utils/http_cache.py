@@ -0,0 +1,290 @@
+"""
+Content-addressed on-disk HTTP cache for upstream data files.
+
+Bodies are stored once under objects/<sha256 of body>. Each URL has an
+index entry (index/<sha256 of url>.json) holding the body digest and the
+ETag and Last-Modified headers the server sent. Later fetches revalidate
+with If-None-Match / If-Modified-Since, so an unchanged file costs a 304
+instead of a full download. Callers that only need the start of a
+file (e.g. a CSV header) can fetch a bounded prefix with a Range request.
+In offline mode only the cache is used. Requests go through the shared
+pooled client in http_client.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import KW_ONLY, dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+import requests
+
+from fantasy_premier_league.data_utils.http_client import HttpClient, get_http_client
+
+HTTP_NOT_MODIFIED = 304
+
+# Size of the blocks streamed from the network to disk
+CHUNK_SIZE = 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Get the cache directory from FPL_CACHE_DIR or the user cache directory."""
+    env_dir = os.getenv("FPL_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    return Path.home() / ".cache" / "fantasy_premier_league"
+
+
+class OfflineCacheMissError(requests.exceptions.RequestException):
+    """Raised in offline mode when a URL has no cached copy."""
+
+
+@dataclass
+class CachedResponse:
+    """
+    A response body held in the cache.
+
+    Attributes:
+        url: URL the body was fetched from
+        path: Path of the cached body on disk
+        digest: SHA-256 hex digest of the body
+        etag: ETag sent by the server, if any
+        last_modified: Last-Modified sent by the server, if any
+        not_modified: True if the body was not re-downloaded (304 or offline)
+    """
+
+    url: str
+    path: Path
+    digest: str
+    _: KW_ONLY
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
+
+    @property
+    def content(self) -> bytes:
+        """The full response body."""
+        return self.path.read_bytes()
+
+    @property
+    def size(self) -> int:
+        """Size of the response body in bytes."""
+        return self.path.stat().st_size
+
+
+class HttpCache:
+    """
+    On-disk cache of HTTP GET responses keyed by URL and stored by content digest.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | str | None = None,
+        offline: bool = False,
+        timeout: float | None = None,
+        client: HttpClient | None = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Root cache directory (defaults to default_cache_dir() / "http")
+            offline: If True, never touch the network and serve only cached copies
+            timeout: Request timeout in seconds (defaults to the client's)
+            client: HTTP client to fetch with (defaults to the shared one)
+        """
+        root = Path(cache_dir) if cache_dir is not None else default_cache_dir() / "http"
+        self.objects_dir = root / "objects"
+        self.index_dir = root / "index"
+        self.offline = offline
+        self.timeout = timeout
+        self.client = client if client is not None else get_http_client()
+
+    def lookup(self, url: str) -> CachedResponse | None:
+        """
+        Get the cached copy of a URL without touching the network.
+
+        Args:
+            url: URL to look up
+
+        Returns:
+            The cached response, or None if the URL is not cached
+        """
+        index_path = self._index_path(url)
+        try:
+            entry = json.loads(index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        path = self.objects_dir / entry["digest"]
+        if not path.exists():
+            return None
+
+        return CachedResponse(
+            url=url,
+            path=path,
+            digest=entry["digest"],
+            etag=entry.get("etag"),
+            last_modified=entry.get("last_modified"),
+            not_modified=True,
+        )
+
+    def fetch(self, url: str) -> CachedResponse:
+        """
+        Fetch a URL, revalidating any cached copy with a conditional request.
+
+        Args:
+            url: URL to fetch
+
+        Returns:
+            The cached response; not_modified is True if nothing was downloaded
+
+        Raises:
+            OfflineCacheMissError: In offline mode, if the URL is not cached
+            requests.RequestException: If the request fails
+        """
+        cached = self.lookup(url)
+        if self.offline:
+            if cached is None:
+                raise OfflineCacheMissError(f"{url} is not in the cache (offline mode)")
+            return cached
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        with self.client.stream(url, headers=headers, timeout=self.timeout) as response:
+            if response.status_code == HTTP_NOT_MODIFIED and cached is not None:
+                return cached
+            response.raise_for_status()
+
+            digest, path = self._store_body(response)
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        self._write_index(url, {"digest": digest, "etag": etag, "last_modified": last_modified})
+        return CachedResponse(url, path, digest, etag=etag, last_modified=last_modified)
+
+    def fetch_prefix(self, url: str, size: int) -> bytes:
+        """
+        Get the first bytes of a URL's body without downloading all of it.
+
+        A cached copy is read locally; otherwise a Range request is sent and the
+        response is read only up to size bytes, which also bounds the download
+        when the server ignores the Range header. Prefixes are not cached.
+
+        Args:
+            url: URL to read
+            size: Maximum number of bytes to return
+
+        Returns:
+            The leading bytes of the body
+
+        Raises:
+            OfflineCacheMissError: In offline mode, if the URL is not cached
+            requests.RequestException: If the request fails
+        """
+        cached = self.lookup(url)
+        if cached is not None:
+            with open(cached.path, "rb") as f:
+                return f.read(size)
+        if self.offline:
+            raise OfflineCacheMissError(f"{url} is not in the cache (offline mode)")
+
+        # Ranges apply to the encoded body, so ask for it unencoded
+        headers = {"Range": f"bytes=0-{size - 1}", "Accept-Encoding": "identity"}
+        chunks = []
+        received = 0
+        with self.client.stream(url, headers=headers, timeout=self.timeout) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=min(CHUNK_SIZE, size)):
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= size:
+                    break
+        return b"".join(chunks)[:size]
+
+    def _index_path(self, url: str) -> Path:
+        return self.index_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _store_body(self, response: requests.Response) -> tuple[str, Path]:
+        """Stream a response body into the object store and return its digest and path."""
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.sha256()
+
+        with tempfile.NamedTemporaryFile(dir=self.objects_dir, suffix=".part", delete=False) as f:
+            try:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    hasher.update(chunk)
+                    f.write(chunk)
+            except Exception:
+                f.close()
+                os.unlink(f.name)
+                raise
+
+        digest = hasher.hexdigest()
+        path = self.objects_dir / digest
+        os.replace(f.name, path)
+        return digest, path
+
+    def _write_index(self, url: str, entry: dict[str, Any]) -> None:
+        """Atomically write a URL's index entry."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        entry = {"url": url, **entry}
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.index_dir, suffix=".part", delete=False, encoding="utf-8"
+        ) as f:
+            json.dump(entry, f)
+        os.replace(f.name, self._index_path(url))
+
+
+_default_cache: HttpCache | None = None
+_default_cache_lock = Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """
+    Get the shared cache, configured from FPL_CACHE_DIR and FPL_OFFLINE on first use.
+
+    Returns:
+        The process-wide HttpCache
+    """
+    global _default_cache  # noqa: PLW0603
+    with _default_cache_lock:
+        if _default_cache is None:
+            offline = os.getenv("FPL_OFFLINE", "false").lower() in ("1", "true", "yes")
+            _default_cache = HttpCache(offline=offline)
+        return _default_cache
+
+
+def configure_http_cache(cache_dir: Path | str | None = None, offline: bool = False) -> HttpCache:
+    """
+    Replace the shared cache, e.g. to switch to offline mode from a CLI flag.
+
+    Args:
+        cache_dir: Root cache directory (defaults to default_cache_dir() / "http")
+        offline: If True, serve only cached copies
+
+    Returns:
+        The new process-wide HttpCache
+    """
+    global _default_cache  # noqa: PLW0603
+    with _default_cache_lock:
+        _default_cache = HttpCache(cache_dir=cache_dir, offline=offline)
+        return _default_cache
+
+
+def fetch_cached(url: str) -> CachedResponse:
+    """Fetch a URL through the shared cache."""
+    return get_http_cache().fetch(url)
+
+
+def fetch_prefix(url: str, size: int) -> bytes:
+    """Get the first bytes of a URL's body through the shared cache."""
+    return get_http_cache().fetch_prefix(url, size)
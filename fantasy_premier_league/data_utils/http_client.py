@@ -0,0 +1,282 @@
+"""
+Shared pooled HTTP client for the FPL API and GitHub fetchers.
+
+All requests go through one requests.Session whose adapter keeps a
+keep-alive connection pool per host, so repeated requests to the same
+host skip DNS, TCP and TLS setup. Requests ask for gzip-compressed
+bodies, share one timeout and one retry policy (exponential backoff on
+connection errors, 429 and 5xx, honouring Retry-After), and each host
+has a cap on concurrent requests. Latency, retry and byte counters are
+kept per host.
+"""
+
+import os
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from threading import BoundedSemaphore, Lock
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds used when a request sets none
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# Requests in flight per host, which is also the size of each host's connection pool
+DEFAULT_PER_HOST_LIMIT = 8
+
+# Hosts whose connection pools are kept alive at the same time
+MAX_POOLED_HOSTS = 16
+
+# Most recent request durations kept per host for percentiles
+LATENCY_SAMPLES = 10_000
+
+# Responses retried by the shared policy
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+USER_AGENT = "fantasy-premier-league-loader"
+
+DEFAULT_FPL_API_BASE_URL = "https://fantasy.premierleague.com/api"
+
+
+@dataclass
+class HostStats:
+    """
+    Counters for the requests sent to one host.
+
+    Attributes:
+        requests: Requests sent (retries of a request are not counted separately)
+        failures: Requests that raised or ended with a 4xx/5xx status
+        retries: Retries made by the retry policy
+        bytes_received: Body bytes received over the wire (compressed size)
+        seconds: Summed request durations, including reading the body
+        max_seconds: Longest request duration
+    """
+
+    requests: int = 0
+    failures: int = 0
+    retries: int = 0
+    bytes_received: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        """Mean request duration."""
+        return self.seconds / self.requests if self.requests else 0.0
+
+
+class HttpClient:
+    """
+    Pooled, retrying HTTP client with per-host concurrency caps and counters.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            timeout: Default timeout in seconds, or a (connect, read) pair
+            max_retries: Retries per request for connection errors, 429 and 5xx (0 disables retrying)
+            backoff: Base delay (seconds) of the exponential backoff between retries
+            per_host_limit: Maximum concurrent requests per host
+        """
+        self.timeout = timeout
+        self.per_host_limit = max(1, per_host_limit)
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=("GET", "HEAD"),
+            respect_retry_after_header=True,
+            # Hand the last response to the caller instead of raising
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=MAX_POOLED_HOSTS, pool_maxsize=self.per_host_limit, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate", "User-Agent": USER_AGENT})
+
+        self._lock = Lock()
+        self._host_slots: dict[str, BoundedSemaphore] = {}
+        self._stats: dict[str, HostStats] = {}
+        self._latencies: dict[str, deque[float]] = {}
+
+    def get(
+        self, url: str, *, headers: dict[str, str] | None = None, timeout: float | tuple[float, float] | None = None
+    ) -> requests.Response:
+        """
+        Send a GET request and read the whole body.
+
+        Args:
+            url: URL to fetch
+            headers: Extra request headers
+            timeout: Timeout overriding the client's default
+
+        Returns:
+            The response, whatever its status
+
+        Raises:
+            requests.RequestException: If the request fails after all retries
+        """
+        with self.stream(url, headers=headers, timeout=timeout) as response:
+            # Read inside stream() so the body counts towards the host's bytes and time
+            _ = response.content
+        return response
+
+    @contextmanager
+    def stream(
+        self, url: str, *, headers: dict[str, str] | None = None, timeout: float | tuple[float, float] | None = None
+    ) -> Iterator[requests.Response]:
+        """
+        Send a GET request whose body is read by the caller.
+
+        The host's concurrency slot and the connection are held until the
+        block exits.
+
+        Args:
+            url: URL to fetch
+            headers: Extra request headers
+            timeout: Timeout overriding the client's default
+
+        Yields:
+            The response, whatever its status
+
+        Raises:
+            requests.RequestException: If the request fails after all retries
+        """
+        host = urlsplit(url).netloc
+        slot, stats = self._host(host)
+        with slot:
+            started = time.monotonic()
+            response = None
+            failed = True
+            try:
+                response = self.session.get(
+                    url, headers=headers, timeout=timeout if timeout is not None else self.timeout, stream=True
+                )
+                with response:
+                    yield response
+                failed = response.status_code >= requests.codes.bad_request
+            finally:
+                self._record(host, stats, time.monotonic() - started, response, failed)
+
+    def stats(self) -> dict[str, HostStats]:
+        """Get a snapshot of the per-host counters."""
+        with self._lock:
+            return {host: replace(stats) for host, stats in self._stats.items()}
+
+    def latency_percentiles(self, quantiles: tuple[float, ...] = (0.5, 0.99), host: str | None = None) -> list[float]:
+        """
+        Get percentiles of the recent request durations.
+
+        Args:
+            quantiles: Quantiles to compute, between 0 and 1
+            host: Host to compute them for (all hosts if omitted)
+
+        Returns:
+            Duration in seconds at each quantile (nearest rank), or zeros if nothing was sent
+        """
+        with self._lock:
+            samples = sorted(
+                seconds
+                for name, latencies in self._latencies.items()
+                if host is None or name == host
+                for seconds in latencies
+            )
+        if not samples:
+            return [0.0 for _ in quantiles]
+        return [samples[min(len(samples) - 1, int(q * len(samples)))] for q in quantiles]
+
+    def report(self) -> None:
+        """Print the per-host counters."""
+        stats = self.stats()
+        if not stats:
+            return
+        print("\nHTTP requests:")
+        for host, host_stats in sorted(stats.items()):
+            p50, p99 = self.latency_percentiles(host=host)
+            print(
+                f"  - {host}: {host_stats.requests} requests ({host_stats.failures} failed, "
+                f"{host_stats.retries} retries), {host_stats.bytes_received / 1024:.1f} KiB, "
+                f"latency p50 {p50 * 1000:.0f} ms / p99 {p99 * 1000:.0f} ms / max {host_stats.max_seconds * 1000:.0f} ms"
+            )
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+    def _host(self, host: str) -> tuple[BoundedSemaphore, HostStats]:
+        """Get a host's concurrency slots and counters, creating them on first use."""
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = BoundedSemaphore(self.per_host_limit)
+                self._stats[host] = HostStats()
+                self._latencies[host] = deque(maxlen=LATENCY_SAMPLES)
+            return self._host_slots[host], self._stats[host]
+
+    def _record(
+        self, host: str, stats: HostStats, seconds: float, response: requests.Response | None, failed: bool
+    ) -> None:
+        """Add a finished request to its host's counters."""
+        retries = 0
+        received = 0
+        if response is not None and response.raw is not None:
+            # Bytes pulled off the socket, i.e. before decompression
+            received = response.raw.tell()
+            if response.raw.retries is not None:
+                retries = len(response.raw.retries.history)
+        with self._lock:
+            stats.requests += 1
+            stats.failures += failed
+            stats.retries += retries
+            stats.bytes_received += received
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            self._latencies[host].append(seconds)
+
+
+_default_client: HttpClient | None = None
+_default_client_lock = Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Get the shared client, with the per-host limit from FPL_HTTP_PER_HOST_LIMIT.
+
+    Returns:
+        The process-wide HttpClient
+    """
+    global _default_client  # noqa: PLW0603
+    with _default_client_lock:
+        if _default_client is None:
+            per_host_limit = int(os.getenv("FPL_HTTP_PER_HOST_LIMIT", str(DEFAULT_PER_HOST_LIMIT)))
+            _default_client = HttpClient(per_host_limit=per_host_limit)
+        return _default_client
+
+
+def fpl_api_base_url() -> str:
+    """Get the FPL API root from FPL_API_BASE_URL (e.g. a local stand-in server), without a trailing slash."""
+    return os.getenv("FPL_API_BASE_URL", DEFAULT_FPL_API_BASE_URL).rstrip("/")
+
+
+def fpl_api_url(path: str) -> str:
+    """Get the URL of an FPL API path such as "bootstrap-static/"."""
+    return f"{fpl_api_base_url()}/{path.lstrip('/')}"
+
+
+def http_get(url: str, *, headers: dict[str, str] | None = None) -> requests.Response:
+    """Send a GET request through the shared client."""
+    return get_http_client().get(url, headers=headers)
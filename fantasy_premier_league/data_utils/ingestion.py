@@ -0,0 +1,557 @@
+"""
+Arrow-native ingestion engine for upstream season files.
+
+Both historical loaders ingest the same merged_gw.csv files through this
+module: the file is decoded once and parsed by Polars, cleaned and typed
+with whole-column expressions against a declarative per-season schema,
+and handed to one or more sinks (Postgres COPY, Parquet or Arrow IPC).
+Rows that fail validation come back separately with their source line,
+so every loader applies the same decoding, cleaning and typing rules.
+"""
+
+import os
+import shutil
+import tempfile
+from collections import Counter
+from collections.abc import Callable, Iterator, Sequence
+from functools import cache
+from pathlib import Path
+from typing import Any, NamedTuple, Protocol
+
+import polars as pl
+from sqlalchemy import Boolean, Float, Integer, Table
+
+from fantasy_premier_league.data_utils.bulk_writer import MergeRule
+from fantasy_premier_league.data_utils.encoding import (
+    open_decoded,
+    read_prefix,
+    sniff_encoding,
+)
+from fantasy_premier_league.data_utils.staging_swap import (
+    duplicate_key_rejects,
+    split_duplicate_keys,
+    swap_in_frame,
+)
+
+# Imported to register the season tables
+from fantasy_premier_league.models import player_gameweek_history  # noqa: F401
+from fantasy_premier_league.models.base import Base
+from fantasy_premier_league.models.column_plan import column_plan
+
+# Column carrying each row's line in the source file (the header is line 1)
+SOURCE_LINE = "source_line"
+
+# Column holding the reason a row was rejected
+REJECT_REASON = "reason"
+
+# Natural key of the season tables
+NATURAL_KEY = ("element", "fixture", "round")
+
+# How upstream rows merge into a season table: all_player_id is filled by
+# match_players_across_seasons() and survives reloads
+SEASON_MERGE_RULE = MergeRule(NATURAL_KEY, exclude_from_update=("all_player_id",))
+
+# Rows missing any of these are rejected (team is optional); element,
+# fixture and round form the natural key of the season tables
+REQUIRED_FIELDS = ["opponent_team", "name", "round", "element", "fixture"]
+
+# Columns cleaned of stray characters and defaulted to 0 when missing
+NUMERIC_FIELDS = [
+    "minutes",
+    "goals_scored",
+    "assists",
+    "clean_sheets",
+    "goals_conceded",
+    "own_goals",
+    "penalties_saved",
+    "penalties_missed",
+    "yellow_cards",
+    "red_cards",
+    "saves",
+    "bonus",
+    "bps",
+    "influence",
+    "creativity",
+    "threat",
+    "ict_index",
+    "total_points",
+    "value",
+    "transfers_balance",
+    "selected",
+    "transfers_in",
+    "transfers_out",
+    "GW",
+    "round",
+]
+
+# Characters decoded at a time when transcoding a file for the batched reader
+TRANSCODE_BLOCK_CHARS = 1024 * 1024
+
+WAS_HOME_TRUE_VALUES = ["true", "1", "yes", "home"]
+
+# Formats tried, in order, for kickoff times that are not ISO 8601
+KICKOFF_TIME_FORMATS = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d/%m/%Y"]
+
+
+class SeasonSchema(NamedTuple):
+    """
+    Declarative description of how a season's file maps onto its table.
+
+    Attributes:
+        season: Season name (e.g., "2023-24")
+        table: Season table the rows are written to
+        dtypes: Target Polars type of every data column, in table order
+        required: Columns a row is rejected without
+        zero_filled: Numeric columns cleaned of stray characters, missing values as 0
+        natural_key: Columns identifying a row
+    """
+
+    season: str
+    table: Table
+    dtypes: dict[str, pl.DataType]
+    required: tuple[str, ...]
+    zero_filled: tuple[str, ...]
+    natural_key: tuple[str, ...]
+
+
+def _target_dtype(column_type: Any) -> pl.DataType:
+    if isinstance(column_type, Integer):
+        return pl.Int64
+    if isinstance(column_type, Float):
+        return pl.Float64
+    if isinstance(column_type, Boolean):
+        return pl.Boolean
+    return pl.String
+
+
+@cache
+def season_schema(season: str) -> SeasonSchema:
+    """
+    Get the ingestion schema of a season, derived from its table's model.
+
+    Args:
+        season: Season name (e.g., "2023-24")
+
+    Returns:
+        The season's schema
+
+    Raises:
+        LookupError: If there is no table for the season
+    """
+    table_name = f"player_gameweek_history_{season.replace('-', '_')}"
+    table = Base.metadata.tables.get(table_name)
+    if table is None:
+        raise LookupError(f"No gameweek history table for season {season}")
+
+    dtypes = {
+        spec.name: _target_dtype(spec.type)
+        for spec in column_plan(table).columns
+        if not spec.primary_key
+    }
+    return SeasonSchema(
+        season=season,
+        table=table,
+        dtypes=dtypes,
+        required=tuple(name for name in REQUIRED_FIELDS if name in dtypes),
+        zero_filled=tuple(
+            name
+            for name in NUMERIC_FIELDS
+            if name in dtypes and name not in REQUIRED_FIELDS
+        ),
+        natural_key=NATURAL_KEY,
+    )
+
+
+def read_csv_frame(source: bytes | Path) -> pl.DataFrame:
+    """
+    Decode and parse a CSV file with Polars.
+
+    Valid UTF-8 is parsed directly; anything else is decoded once with the
+    encoding sniffed from a bounded prefix. If a strict parse fails, the
+    file is parsed leniently, with every column as text and ragged lines
+    truncated, and the cleaning step does the typing.
+
+    Args:
+        source: Raw content, or the path of a file holding it
+
+    Returns:
+        The parsed rows, with the column types Polars inferred
+    """
+    encoding = sniff_encoding(read_prefix(source))
+    if encoding == "utf-8":
+        try:
+            return pl.read_csv(source)
+        except pl.exceptions.ComputeError:
+            pass
+
+    with open_decoded(source, encoding) as stream:
+        content = stream.read().encode("utf-8")
+    try:
+        return pl.read_csv(content)
+    except pl.exceptions.ComputeError:
+        return pl.read_csv(content, infer_schema=False, truncate_ragged_lines=True)
+
+
+def iter_csv_batches(
+    source: bytes | Path, batch_size: int
+) -> Iterator[tuple[int, pl.DataFrame]]:
+    """
+    Stream a CSV file as batches of text columns with Polars' batched reader.
+
+    Polars' batched reader only reads UTF-8 files, so other encodings (and
+    in-memory content) are first transcoded to a temporary UTF-8 file in
+    bounded blocks. Only one batch (plus the reader's buffer) is held in
+    memory at a time.
+
+    Args:
+        source: Raw content, or the path of a file holding it
+        batch_size: Rows the reader buffers at a time (batches may be smaller)
+
+    Yields:
+        Tuples of (source line of the batch's first row, batch)
+    """
+    encoding = sniff_encoding(read_prefix(source))
+    with tempfile.TemporaryDirectory() as scratch:
+        path = source
+        if isinstance(source, bytes) or encoding != "utf-8":
+            path = Path(scratch) / "source.csv"
+            with (
+                open_decoded(source, encoding) as stream,
+                open(path, "w", encoding="utf-8") as out,
+            ):
+                shutil.copyfileobj(stream, out, TRANSCODE_BLOCK_CHARS)
+
+        # Every column is read as text, so batches never disagree about types
+        reader = pl.read_csv_batched(
+            path,
+            batch_size=batch_size,
+            infer_schema_length=0,
+            truncate_ragged_lines=True,
+        )
+        first_line = 2
+        while batches := reader.next_batches(1):
+            for batch in batches:
+                yield first_line, batch
+                first_line += batch.height
+
+
+def _kickoff_time(column: pl.Expr) -> pl.Expr:
+    """Normalize kickoff times to UTC "YYYY-MM-DDTHH:MM:SSZ" strings (else null)."""
+    text = column.cast(pl.String).str.strip_chars().str.replace(r"Z$", "+00:00")
+    with_offset = text.str.to_datetime("%Y-%m-%dT%H:%M:%S%z", strict=False)
+    parsed = pl.coalesce(
+        with_offset.dt.convert_time_zone("UTC").dt.replace_time_zone(None),
+        text.str.to_datetime("%Y-%m-%dT%H:%M:%S", strict=False),
+        *(text.str.to_datetime(fmt, strict=False) for fmt in KICKOFF_TIME_FORMATS),
+    )
+    return parsed.dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _was_home(column: pl.Expr, dtype: pl.DataType) -> pl.Expr:
+    """Map string, numeric or boolean was_home values to booleans (null is False)."""
+    if dtype == pl.Boolean:
+        return column.fill_null(False)
+    if dtype.is_numeric():
+        return (column.fill_null(0) != 0).fill_null(False)
+    text = column.cast(pl.String).str.strip_chars().str.to_lowercase()
+    numeric = text.cast(pl.Float64, strict=False).fill_null(0) != 0
+    return (text.is_in(WAS_HOME_TRUE_VALUES).fill_null(False) | numeric).fill_null(
+        False
+    )
+
+
+def _numeric(column: pl.Expr, dtype: pl.DataType) -> pl.Expr:
+    """Convert a column to floats, keeping only the digits, "." and "-" of strings."""
+    if dtype.is_numeric() or dtype == pl.Boolean:
+        return column.cast(pl.Float64, strict=False)
+    return (
+        column.cast(pl.String)
+        .str.replace_all(r"[^0-9.\-]", "")
+        .cast(pl.Float64, strict=False)
+    )
+
+
+def _cast(column: pl.Expr, dtype: pl.DataType) -> pl.Expr:
+    """Cast a cleaned column to its target type."""
+    if dtype == pl.Int64:
+        return (
+            column.cast(pl.Float64, strict=False).round(0).cast(pl.Int64, strict=False)
+        )
+    return column.cast(dtype, strict=False)
+
+
+def clean_frame(
+    raw: pl.DataFrame,
+    schema: SeasonSchema,
+    *,
+    from_round: int | None = None,
+    first_line: int = 2,
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    Clean and type a parsed season file against its schema.
+
+    Column names are stripped and blank rows dropped. Rows filling a
+    different number of fields than most rows of the frame (of the batch,
+    when a file is cleaned batch by batch) are rejected as
+    misaligned, and columns left without a single value count as missing.
+    Kickoff times are normalized to UTC, was_home is mapped to booleans,
+    and numeric columns are stripped of stray characters with missing
+    values as 0. Rows missing a required column are rejected, and the rest
+    are cast to the table's column types. Columns the file lacks are null.
+
+    Args:
+        raw: Parsed rows (as returned by read_csv_frame or iter_csv_batches)
+        schema: The season's schema
+        from_round: If set, only keep rows of this round onwards (rows without a
+            round are dropped)
+        first_line: Source line of the first row
+
+    Returns:
+        Tuple of (rows with the table's data columns and SOURCE_LINE,
+        rejected rows as SOURCE_LINE and REJECT_REASON)
+    """
+    frame = raw.rename(
+        {name: name.strip() for name in raw.columns if name != name.strip()}
+    )
+    frame = frame.with_row_index(SOURCE_LINE, offset=first_line)
+    frame = frame.filter(pl.any_horizontal(pl.exclude(SOURCE_LINE).is_not_null()))
+
+    # Rows filling a different number of fields than most rows are misaligned
+    # (ties go to the smaller count)
+    filled = pl.sum_horizontal(pl.exclude(SOURCE_LINE).is_not_null())
+    usual_filled = frame.select(filled.mode().min()).item() if frame.height else 0
+    misaligned = frame.filter(filled != usual_filled).select(
+        SOURCE_LINE,
+        pl.format(
+            "{} filled fields where most rows have {}", filled, pl.lit(usual_filled)
+        ).alias(REJECT_REASON),
+    )
+    frame = frame.filter(filled == usual_filled)
+
+    # A column without a single value is treated as missing from the file
+    empty = {
+        name
+        for name, count in frame.null_count().row(0, named=True).items()
+        if count == frame.height
+    }
+
+    source_types = frame.schema
+    converted = []
+    for name, dtype in schema.dtypes.items():
+        if name not in source_types or name in empty:
+            converted.append(pl.lit(None, dtype=dtype).alias(name))
+            continue
+        column, source_type = pl.col(name), source_types[name]
+        if name == "kickoff_time" and dtype == pl.String:
+            column = _kickoff_time(column)
+        elif name == "was_home":
+            column = _was_home(column, source_type)
+        elif name in schema.zero_filled:
+            column = _numeric(column, source_type).fill_null(0)
+        elif name in schema.required and name in NUMERIC_FIELDS:
+            column = _numeric(column, source_type)
+        converted.append(_cast(column, dtype).alias(name))
+    frame = frame.select(SOURCE_LINE, *converted)
+    if from_round is not None:
+        frame = frame.filter(pl.col("round") >= from_round)
+
+    # The first missing required column is the rejection reason
+    reason = pl.lit(None, dtype=pl.String)
+    for name in reversed(schema.required):
+        reason = (
+            pl.when(pl.col(name).is_null())
+            .then(pl.lit(f"missing required field '{name}'"))
+            .otherwise(reason)
+        )
+    frame = frame.with_columns(reason.alias(REJECT_REASON))
+
+    missing = frame.filter(pl.col(REJECT_REASON).is_not_null()).select(
+        SOURCE_LINE, REJECT_REASON
+    )
+    rejected = pl.concat([misaligned, missing]).sort(SOURCE_LINE)
+    rows = frame.filter(pl.col(REJECT_REASON).is_null()).drop(REJECT_REASON)
+    return rows.select(*schema.dtypes, SOURCE_LINE), rejected
+
+
+class Sink(Protocol):
+    """Destination of a season's cleaned rows."""
+
+    def write(
+        self, schema: SeasonSchema, rows: pl.DataFrame, rejected: pl.DataFrame
+    ) -> int:
+        """
+        Write a season's rows, replacing what the sink held for the season.
+
+        Args:
+            schema: The season's schema
+            rows: Cleaned rows, as returned by clean_frame()
+            rejected: Rows clean_frame() rejected, as SOURCE_LINE and REJECT_REASON
+
+        Returns:
+            Rows written
+        """
+        ...
+
+
+class PostgresSink:
+    """
+    Replaces a season table's contents through a COPY-loaded staging table.
+
+    Stored rows keep their id and all_player_id (SEASON_MERGE_RULE), so
+    the table ends up as the upserting loader in data_loading leaves it.
+    Rows the cleaning step rejected, and rows repeating a later row's
+    natural key, are recorded in rejected_rows in the same transaction.
+    """
+
+    def __init__(self, connect: Callable[[], Any]) -> None:
+        """
+        Initialize the sink.
+
+        Args:
+            connect: Returns a new psycopg2 connection (e.g., engine.raw_connection)
+        """
+        self.connect = connect
+
+    def write(
+        self, schema: SeasonSchema, rows: pl.DataFrame, rejected: pl.DataFrame
+    ) -> int:
+        """Swap the rows into the season table and record the rejected ones."""
+        rows, duplicates = split_duplicate_keys(rows, schema.table)
+        rejects = [
+            (line, reason, None)
+            for line, reason in rejected.select(SOURCE_LINE, REJECT_REASON).iter_rows()
+        ]
+        rejects += duplicate_key_rejects(duplicates, schema.table, SOURCE_LINE)
+        connection = self.connect()
+        try:
+            written = swap_in_frame(
+                connection, schema.table, rows, SEASON_MERGE_RULE, rejects
+            )
+        finally:
+            connection.close()
+        for reason, count in Counter(reason for _, reason, _ in rejects).items():
+            print(f"  - {schema.season}: {count} rows rejected: {reason}")
+        if rejects:
+            print(
+                f"  - {schema.season}: {len(rejects)} rejected rows recorded in "
+                "rejected_rows"
+            )
+        return written
+
+
+def _write_atomically(path: Path, write: Callable[[str], None]) -> None:
+    """Write a file next to its destination and move it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, suffix=".part", delete=False
+    ) as f:
+        temp_path = f.name
+    try:
+        write(temp_path)
+    except Exception:
+        os.unlink(temp_path)
+        raise
+    os.replace(temp_path, path)
+
+
+class ParquetSink:
+    """
+    Writes each season's cleaned rows to <root>/season=<season>/gameweeks.parquet.
+    """
+
+    def __init__(self, root: Path | str) -> None:
+        """
+        Initialize the sink.
+
+        Args:
+            root: Directory holding the season partitions
+        """
+        self.root = Path(root)
+
+    def path(self, season: str) -> Path:
+        """Get the file a season is written to."""
+        return self.root / f"season={season}" / "gameweeks.parquet"
+
+    def write(
+        self, schema: SeasonSchema, rows: pl.DataFrame, rejected: pl.DataFrame
+    ) -> int:
+        """Write the rows as the season's Parquet file (rejected rows are not kept)."""
+        _write_atomically(
+            self.path(schema.season), rows.drop(SOURCE_LINE).write_parquet
+        )
+        return rows.height
+
+
+class IpcSink:
+    """
+    Writes each season's cleaned rows to <root>/<season>.arrow as uncompressed
+    Arrow IPC.
+    """
+
+    def __init__(self, root: Path | str) -> None:
+        """
+        Initialize the sink.
+
+        Args:
+            root: Directory holding the season files
+        """
+        self.root = Path(root)
+
+    def path(self, season: str) -> Path:
+        """Get the file a season is written to."""
+        return self.root / f"{season}.arrow"
+
+    def write(
+        self, schema: SeasonSchema, rows: pl.DataFrame, rejected: pl.DataFrame
+    ) -> int:
+        """
+        Write the rows as the season's memory-mappable Arrow IPC file.
+
+        Rejected rows are not kept.
+        """
+        frame = rows.drop(SOURCE_LINE).with_columns(
+            pl.col(pl.String).cast(pl.Categorical)
+        )
+        _write_atomically(
+            self.path(schema.season),
+            lambda path: frame.write_ipc(path, compression="uncompressed"),
+        )
+        return rows.height
+
+
+class IngestResult(NamedTuple):
+    """
+    Outcome of ingesting one season.
+
+    Attributes:
+        season: Season name
+        rows: Number of rows that passed cleaning
+        rejected: Rejected rows as SOURCE_LINE and REJECT_REASON
+        written: Rows written by each sink, in sink order
+    """
+
+    season: str
+    rows: int
+    rejected: pl.DataFrame
+    written: tuple[int, ...]
+
+
+def ingest(
+    season: str, source: bytes | Path | pl.DataFrame, sinks: Sequence[Sink]
+) -> IngestResult:
+    """
+    Parse, clean and write one season's file to every sink.
+
+    Args:
+        season: Season name (e.g., "2023-24")
+        source: Raw content, the path of a file holding it, or an already parsed frame
+        sinks: Destinations of the cleaned rows
+
+    Returns:
+        The season's row counts and rejected rows
+    """
+    schema = season_schema(season)
+    raw = source if isinstance(source, pl.DataFrame) else read_csv_frame(source)
+    rows, rejected = clean_frame(raw, schema)
+    written = tuple(sink.write(schema, rows, rejected) for sink in sinks)
+    return IngestResult(season, rows.height, rejected, written)
@@ -0,0 +1,99 @@
+"""
+Per-season ingestion state for incremental historical loads.
+
+Each season records the highest round loaded and the digest of the
+source file it came from. A rerun skips closed seasons, skips seasons
+whose source is unchanged, and otherwise reloads only the rounds from
+the high-water mark onwards.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, NamedTuple
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from fantasy_premier_league.models.ingestion_state import IngestionState
+
+
+class SeasonProgress(NamedTuple):
+    """
+    What a season load leaves behind in its ingestion state.
+
+    Attributes:
+        last_round: Highest round now in the season table
+        content_digest: Digest of the source file just loaded
+        rows_loaded: Number of rows now in the season table
+        closed: True if the season is finished and fully loaded
+    """
+
+    last_round: int | None
+    content_digest: str
+    rows_loaded: int
+    closed: bool
+
+
+def load_ingestion_states(session: Session) -> dict[str, IngestionState]:
+    """
+    Load the ingestion state of every season.
+
+    Args:
+        session: Database session
+
+    Returns:
+        Ingestion states keyed by season name
+    """
+    return {state.season: state for state in session.scalars(select(IngestionState))}
+
+
+def resume_round(state: IngestionState | None, full_reload: bool = False) -> int | None:
+    """
+    Get the first round to (re)load for a season.
+
+    The high-water round itself is reloaded, since upstream may have
+    published it before all of its fixtures were played.
+
+    Args:
+        state: The season's ingestion state, if any
+        full_reload: If True, ignore the stored state
+
+    Returns:
+        First round to load, or None to load the whole season
+    """
+    if full_reload or state is None or state.last_round is None:
+        return None
+    return state.last_round
+
+
+def record_ingestion_state(cursor: Any, season: str, progress: SeasonProgress) -> None:
+    """
+    Upsert a season's ingestion state inside the caller's transaction.
+
+    Writing the state in the same transaction as the rows keeps the
+    high-water mark consistent with the table if the load fails.
+
+    Args:
+        cursor: DB-API cursor inside the caller's transaction
+        season: Season name
+        progress: The season's high-water mark, source digest, row count and closed flag
+    """
+    cursor.execute(
+        f"""
+        INSERT INTO {IngestionState.__tablename__}
+            (id, season, last_round, content_digest, rows_loaded, closed, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (season) DO UPDATE SET
+            last_round = EXCLUDED.last_round,
+            content_digest = EXCLUDED.content_digest,
+            rows_loaded = EXCLUDED.rows_loaded,
+            closed = EXCLUDED.closed,
+            updated_at = EXCLUDED.updated_at
+        """,
+        (
+            str(uuid4()),
+            season,
+            *progress,
+            datetime.now(timezone.utc).replace(tzinfo=None),
+        ),
+    )
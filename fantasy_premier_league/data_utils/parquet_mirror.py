@@ -0,0 +1,139 @@
+"""
+Local Parquet mirror of upstream season files.
+
+Each season's parsed merged_gw.csv is kept as Parquet under
+season=<season>/merged_gw.parquet, with the inferred schema and the
+digest of the CSV it came from in schema.json next to it. Later loads
+read the Parquet file (with column projection) instead of re-parsing
+the CSV, for as long as the upstream digest matches.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+from fantasy_premier_league.data_utils.http_cache import default_cache_dir
+
+DATA_FILE = "merged_gw.parquet"
+SCHEMA_FILE = "schema.json"
+
+
+class ParquetMirror:
+    """
+    Season-partitioned Parquet copies of upstream CSV files.
+    """
+
+    def __init__(self, root: Path | str | None = None) -> None:
+        """
+        Initialize the mirror.
+
+        Args:
+            root: Mirror directory (defaults to default_cache_dir() / "parquet")
+        """
+        self.root = Path(root) if root is not None else default_cache_dir() / "parquet"
+
+    def partition_dir(self, season: str) -> Path:
+        """Get the directory holding a season's partition."""
+        return self.root / f"season={season}"
+
+    def data_path(self, season: str) -> Path:
+        """Get the path of a season's Parquet file."""
+        return self.partition_dir(season) / DATA_FILE
+
+    def metadata(self, season: str, source_digest: str | None = None) -> dict[str, Any] | None:
+        """
+        Read a season's stored schema and source information.
+
+        Args:
+            season: Season name (e.g., "2023-24")
+            source_digest: If given, only return metadata for a mirror of this source
+
+        Returns:
+            The schema.json contents, or None if the season is not mirrored (or is stale)
+        """
+        try:
+            metadata = json.loads((self.partition_dir(season) / SCHEMA_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if source_digest is not None and metadata.get("source_digest") != source_digest:
+            return None
+        if not self.data_path(season).exists():
+            return None
+        return metadata
+
+    def schema(self, season: str, source_digest: str | None = None) -> dict[str, str] | None:
+        """
+        Get a season's column names and Polars types without reading its data.
+
+        Args:
+            season: Season name
+            source_digest: If given, only return the schema of a mirror of this source
+
+        Returns:
+            Column names mapped to Polars type names, or None if not mirrored
+        """
+        metadata = self.metadata(season, source_digest)
+        return metadata["schema"] if metadata is not None else None
+
+    def read(
+        self, season: str, columns: list[str] | None = None, source_digest: str | None = None
+    ) -> pl.DataFrame | None:
+        """
+        Read a season from the mirror.
+
+        Args:
+            season: Season name
+            columns: Columns to read (all if omitted)
+            source_digest: If given, only read a mirror of this source
+
+        Returns:
+            The season's data, or None if it is not mirrored (or is stale)
+        """
+        if self.metadata(season, source_digest) is None:
+            return None
+        return pl.read_parquet(self.data_path(season), columns=columns)
+
+    def write(self, season: str, df: pl.DataFrame, source_url: str, source_digest: str) -> Path:
+        """
+        Store a season in the mirror, replacing any previous copy.
+
+        The Parquet file is written before schema.json, so a reader never
+        pairs new metadata with an old data file.
+
+        Args:
+            season: Season name
+            df: Parsed season data
+            source_url: URL of the CSV the data was parsed from
+            source_digest: SHA-256 digest of that CSV
+
+        Returns:
+            Path of the Parquet file
+        """
+        partition = self.partition_dir(season)
+        partition.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(dir=partition, suffix=".part", delete=False) as f:
+            temp_path = f.name
+        try:
+            df.write_parquet(temp_path)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+        os.replace(temp_path, self.data_path(season))
+
+        metadata = {
+            "season": season,
+            "source_url": source_url,
+            "source_digest": source_digest,
+            "rows": df.height,
+            "schema": {name: str(dtype) for name, dtype in df.schema.items()},
+        }
+        with tempfile.NamedTemporaryFile("w", dir=partition, suffix=".part", delete=False, encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(f.name, partition / SCHEMA_FILE)
+
+        return self.data_path(season)
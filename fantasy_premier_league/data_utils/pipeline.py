@@ -0,0 +1,182 @@
+"""
+Staged fetch/parse/write pipeline for multi-season loads.
+
+Seasons are fetched concurrently, handed to a parse stage through a
+bounded queue, and then to a separate writer stage, so network, CPU
+and database time overlap instead of adding up season by season.
+"""
+
+import time
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from queue import Queue
+from threading import Lock, Thread
+from typing import Any
+
+STAGES = ("fetch", "parse", "write")
+
+# Marks the end of a stage's input queue
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """
+    Worker counts and queue bounds of a pipeline run.
+
+    Attributes:
+        fetch_workers: Number of concurrent fetches
+        parse_workers: Number of parse threads
+        write_workers: Number of writer threads
+        queue_size: Maximum payloads waiting between two stages
+    """
+
+    fetch_workers: int = 4
+    parse_workers: int = 2
+    write_workers: int = 1
+    queue_size: int = 2
+
+
+# Seasons downloaded, parsed and written concurrently by both historical loaders
+HISTORICAL_PIPELINE = PipelineConfig(fetch_workers=4, parse_workers=2, write_workers=2)
+
+
+class PipelineStats:
+    """
+    Per-stage timings collected while a pipeline runs.
+
+    Stage times are busy time summed over all workers of that stage,
+    so they can exceed the wall-clock time when a stage runs in parallel.
+    """
+
+    def __init__(self) -> None:
+        self.stage_seconds: dict[str, float] = defaultdict(float)
+        self.item_seconds: dict[Hashable, dict[str, float]] = defaultdict(dict)
+        self.wall_seconds = 0.0
+        self._lock = Lock()
+
+    def record(self, stage: str, item: Hashable, seconds: float) -> None:
+        """Record the time one item spent in one stage."""
+        with self._lock:
+            self.stage_seconds[stage] += seconds
+            self.item_seconds[item][stage] = seconds
+
+    def report(self) -> None:
+        """Print the per-stage and per-item timings."""
+        print("\nPipeline timings:")
+        for stage in STAGES:
+            slowest = max(
+                (timings.get(stage, 0.0) for timings in self.item_seconds.values()), default=0.0
+            )
+            print(
+                f"  - {stage}: {self.stage_seconds[stage]:.2f}s total, "
+                f"{slowest:.2f}s slowest item"
+            )
+        for item, timings in self.item_seconds.items():
+            stages = ", ".join(f"{stage} {timings[stage]:.2f}s" for stage in STAGES if stage in timings)
+            print(f"  - {item}: {stages}")
+        print(f"  - Wall clock: {self.wall_seconds:.2f}s")
+
+
+def run_pipeline(
+    items: Iterable[Hashable],
+    fetch: Callable[[Any], Any],
+    parse: Callable[[Any, Any], Any],
+    write: Callable[[Any, Any], Any],
+    config: PipelineConfig | None = None,
+) -> tuple[dict[Hashable, Any], PipelineStats]:
+    """
+    Run every item through fetch, parse and write stages concurrently.
+
+    Each stage has its own worker threads. Stages are connected by
+    bounded queues, so fast fetchers block instead of piling up
+    downloaded payloads in memory while the writer catches up.
+
+    Args:
+        items: Items to process (e.g. season names)
+        fetch: Called as fetch(item); returns the raw payload
+        parse: Called as parse(item, payload); returns the parsed payload
+        write: Called as write(item, parsed); returns the item's result
+        config: Worker counts and queue bounds (defaults to PipelineConfig())
+
+    Returns:
+        Tuple of (results keyed by item, with the exception for items that
+        failed in any stage, and the collected stage timings)
+    """
+    config = config if config is not None else PipelineConfig()
+    stats = PipelineStats()
+    results: dict[Hashable, Any] = {}
+    results_lock = Lock()
+    parse_queue: Queue = Queue(maxsize=config.queue_size)
+    write_queue: Queue = Queue(maxsize=config.queue_size)
+
+    def timed(stage: str, item: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            stats.record(stage, item, time.perf_counter() - started)
+
+    def fail(item: Hashable, error: Exception) -> None:
+        with results_lock:
+            results[item] = error
+
+    def fetch_one(item: Hashable) -> None:
+        try:
+            payload = timed("fetch", item, fetch, item)
+        except Exception as e:
+            fail(item, e)
+            return
+        parse_queue.put((item, payload))
+
+    def parse_loop() -> None:
+        while (entry := parse_queue.get()) is not _DONE:
+            item, payload = entry
+            try:
+                parsed = timed("parse", item, parse, item, payload)
+            except Exception as e:
+                fail(item, e)
+                continue
+            write_queue.put((item, parsed))
+
+    def write_loop() -> None:
+        while (entry := write_queue.get()) is not _DONE:
+            item, parsed = entry
+            try:
+                result = timed("write", item, write, item, parsed)
+            except Exception as e:
+                fail(item, e)
+                continue
+            with results_lock:
+                results[item] = result
+
+    started = time.perf_counter()
+    parsers = _start_threads(parse_loop, config.parse_workers)
+    writers = _start_threads(write_loop, config.write_workers)
+
+    with ThreadPoolExecutor(max_workers=max(1, config.fetch_workers)) as executor:
+        list(executor.map(fetch_one, items))
+
+    _finish_threads(parsers, parse_queue)
+    _finish_threads(writers, write_queue)
+
+    stats.wall_seconds = time.perf_counter() - started
+    return results, stats
+
+
+def _start_threads(target: Callable[[], None], count: int) -> list[Thread]:
+    """Start at least one daemon thread running a stage loop."""
+    threads = [Thread(target=target, daemon=True) for _ in range(max(1, count))]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def _finish_threads(threads: list[Thread], queue: Queue) -> None:
+    """Send every thread of a stage the end marker and wait for them to drain the queue."""
+    for _ in threads:
+        queue.put(_DONE)
+    for thread in threads:
+        thread.join()
@@ -0,0 +1,45 @@
+"""
+Reject table writes for bulk loads.
+
+Rows that fail validation or are refused by the database are kept in
+the rejected_rows table with the error text and their line in the
+source file, instead of being dropped with a log line.
+"""
+
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any
+from uuid import uuid4
+
+from psycopg2.extras import execute_values
+
+from fantasy_premier_league.models.rejected_row import RejectedRow
+
+
+def record_rejected_rows(
+    cursor: Any, table_name: str, rejects: Iterable[tuple[int | None, str, str | None]]
+) -> int:
+    """
+    Insert rejected rows inside the caller's transaction.
+
+    Args:
+        cursor: psycopg2 cursor
+        table_name: Table the rows were meant for
+        rejects: (source line, error text, row JSON or None) per rejected row
+
+    Returns:
+        Number of rows recorded
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    rows = [
+        (str(uuid4()), table_name, source_line, error, row_data, now)
+        for source_line, error, row_data in rejects
+    ]
+    if rows:
+        execute_values(
+            cursor,
+            f"INSERT INTO {RejectedRow.__tablename__} "
+            "(id, table_name, source_line, error, row_data, created_at) VALUES %s",
+            rows,
+        )
+    return len(rows)
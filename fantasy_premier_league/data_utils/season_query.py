@@ -0,0 +1,163 @@
+"""
+Lazy queries across every season in the local Parquet mirror.
+
+All mirrored seasons are exposed as one Polars LazyFrame with a
+``season`` column, so analyses that span seasons run as a single
+multi-threaded query over local files instead of one query per
+``player_gameweek_history_*`` table in Postgres. Projections and row
+filters are pushed down into each season's Parquet scan, and seasons
+that are not selected are never opened.
+"""
+
+from collections.abc import Iterable, Sequence
+
+import polars as pl
+
+from fantasy_premier_league.data_utils.file_loader import FileLoader, season_url
+from fantasy_premier_league.data_utils.file_loader import seasons as upstream_seasons
+from fantasy_premier_league.data_utils.parquet_mirror import ParquetMirror
+
+SEASON_COLUMN = "season"
+
+# Per-gameweek statistics summed by player_career_totals() by default
+CAREER_STATS = ("total_points", "minutes", "goals_scored", "assists", "clean_sheets", "bonus")
+
+
+def mirrored_seasons(mirror: ParquetMirror | None = None) -> list[str]:
+    """
+    List the seasons with a complete partition in the mirror.
+
+    Args:
+        mirror: Parquet mirror to inspect (defaults to the one in the local cache directory)
+
+    Returns:
+        Season names in chronological order
+    """
+    mirror = mirror if mirror is not None else ParquetMirror()
+    if not mirror.root.is_dir():
+        return []
+    seasons = (path.name.removeprefix("season=") for path in mirror.root.glob("season=*"))
+    return sorted(season for season in seasons if mirror.metadata(season) is not None)
+
+
+def _select_seasons(available: Iterable[str], first: str | None, last: str | None) -> list[str]:
+    # Season names ("2016-17") sort chronologically as strings
+    return [season for season in available if (first is None or season >= first) and (last is None or season <= last)]
+
+
+def scan_seasons(
+    seasons: Sequence[str] | None = None,
+    *,
+    first: str | None = None,
+    last: str | None = None,
+    mirror: ParquetMirror | None = None,
+    fetch_missing: bool = False,
+) -> pl.LazyFrame:
+    """
+    Scan several seasons as one lazy frame.
+
+    Each season is a separate Parquet scan tagged with a literal
+    ``season`` column, so column selections and filters on the data
+    columns reach every scan. Season pruning happens here: only the
+    seasons picked by ``seasons``/``first``/``last`` are scanned.
+    Columns missing from a season are null, and columns whose type
+    differs between seasons (e.g. Int64 in one, Float64 in another) are
+    widened to a common supertype.
+
+    Args:
+        seasons: Seasons to scan (defaults to every mirrored season, or every
+            upstream season when fetch_missing is set)
+        first: Earliest season to include (e.g., "2019-20")
+        last: Latest season to include
+        mirror: Parquet mirror to read (defaults to the one in the local cache directory)
+        fetch_missing: If True, download and mirror requested seasons that are not mirrored yet
+
+    Returns:
+        Lazy frame over the selected seasons
+
+    Raises:
+        LookupError: If no season is selected, or a selected season is not mirrored
+    """
+    mirror = mirror if mirror is not None else ParquetMirror()
+    if seasons is None:
+        seasons = upstream_seasons if fetch_missing else mirrored_seasons(mirror)
+    selected = _select_seasons(seasons, first, last)
+    if not selected:
+        raise LookupError("No mirrored seasons match the selection")
+
+    frames = []
+    for season in selected:
+        if mirror.metadata(season) is None:
+            if not fetch_missing:
+                raise LookupError(f"Season {season} is not in the Parquet mirror at {mirror.root}")
+            FileLoader(season_url(season), season, mirror=mirror).load_file()
+        frames.append(pl.scan_parquet(mirror.data_path(season)).with_columns(pl.lit(season).alias(SEASON_COLUMN)))
+
+    # Per-season scans rather than one hive scan: a hive scan cannot widen an
+    # integer column in one season to the float type it has in another
+    return pl.concat(frames, how="diagonal_relaxed")
+
+
+def player_key(column: str = "name") -> pl.Expr:
+    """
+    Build a season-independent player key from a name column.
+
+    Older seasons name players like "Aaron_Cresswell_402"; this strips
+    the underscores and ids and lowercases the result, so rows from
+    different seasons can be grouped or joined on the same player.
+
+    Args:
+        column: Name column to normalize
+
+    Returns:
+        Expression producing the player key
+    """
+    return (
+        pl.col(column)
+        .str.replace_all("_", " ", literal=True)
+        .str.replace_all(r"\d+", "")
+        .str.to_lowercase()
+        .str.strip_chars()
+    )
+
+
+def player_career_totals(
+    stats: Sequence[str] = CAREER_STATS,
+    *,
+    seasons: Sequence[str] | None = None,
+    first: str | None = None,
+    last: str | None = None,
+    mirror: ParquetMirror | None = None,
+) -> pl.DataFrame:
+    """
+    Sum gameweek statistics over each player's career.
+
+    Args:
+        stats: Numeric columns to sum
+        seasons: Seasons to include (defaults to every mirrored season)
+        first: Earliest season to include
+        last: Latest season to include
+        mirror: Parquet mirror to read
+
+    Returns:
+        One row per player with the number of seasons and gameweeks played
+        and the summed statistics, highest total_points (or first stat) first
+    """
+    frame = scan_seasons(seasons, first=first, last=last, mirror=mirror)
+    # Aggregate per raw name and season first, so the name normalization runs
+    # once per distinct name instead of once per gameweek row
+    per_season = frame.group_by("name", SEASON_COLUMN).agg(
+        pl.len().alias("gameweeks"), *(pl.col(stat).sum() for stat in stats)
+    )
+    totals = (
+        per_season.with_columns(player_key().alias("player"))
+        .group_by("player")
+        .agg(
+            pl.col(SEASON_COLUMN).n_unique().alias("seasons"),
+            pl.col("gameweeks").sum(),
+            *(pl.col(stat).sum() for stat in stats),
+        )
+    )
+    if stats:
+        totals = totals.sort(stats[0], descending=True, nulls_last=True)
+    return totals.collect()
@@ -0,0 +1,222 @@
+"""
+Staging-table writer that replaces a table's contents in one transaction.
+
+A reload COPYs the new rows into a temporary staging table shaped like
+the live table, before taking any lock on it. The live table is then
+emptied with TRUNCATE and refilled from the staging table with one
+INSERT ... SELECT in the same transaction. Readers see either the old
+rows or the complete new set, and the live table itself (grants,
+comments, triggers, dependent views, indexes) is never dropped or
+rebuilt. Columns the source does not carry, such as foreign keys filled
+by a later matching step, can be carried over from the stored rows by
+natural key.
+"""
+
+import json
+from collections.abc import Iterable
+from io import BytesIO
+from typing import Any
+
+import polars as pl
+from sqlalchemy import Boolean, Float, Integer, String, Table, UniqueConstraint
+
+from fantasy_premier_league.data_utils.bulk_writer import MergeRule, quote_identifier
+from fantasy_premier_league.data_utils.rejects import record_rejected_rows
+from fantasy_premier_league.models.column_plan import ColumnSpec, column_plan
+
+# PostgreSQL truncates identifiers longer than this
+MAX_IDENTIFIER_LENGTH = 63
+
+
+def _staging_name(name: str) -> str:
+    return f"stg_{name}"[:MAX_IDENTIFIER_LENGTH]
+
+
+def _polars_cast(spec: ColumnSpec) -> pl.Expr:
+    """Cast a frame column to the type COPY expects for a table column."""
+    column = pl.col(spec.name)
+    if isinstance(spec.type, Integer):
+        return column.cast(pl.Float64, strict=False).round(0).cast(pl.Int64, strict=False)
+    if isinstance(spec.type, Float):
+        return column.cast(pl.Float64, strict=False)
+    if isinstance(spec.type, Boolean):
+        return column.cast(pl.Boolean, strict=False)
+    if isinstance(spec.type, String):
+        return column.cast(pl.String)
+    return column
+
+
+def prepare_polars_frame(df: pl.DataFrame, table: Table) -> pl.DataFrame:
+    """
+    Restrict a Polars frame to a table's columns and cast them to its types.
+
+    Args:
+        df: Frame holding the rows to write
+        table: Target SQLAlchemy table
+
+    Returns:
+        Frame with the table's columns (those present in df) in table order
+    """
+    specs = [spec for spec in column_plan(table).columns if spec.name in df.columns]
+    return df.select([_polars_cast(spec) for spec in specs])
+
+
+def _unique_keys(table: Table) -> list[list[str]]:
+    return [
+        [column.name for column in constraint.columns]
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    ]
+
+
+def split_duplicate_keys(frame: pl.DataFrame, table: Table) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    Keep the last row for each value of the table's unique keys.
+
+    Rows with a NULL key part are kept, as the constraint does not apply to them.
+
+    Args:
+        frame: Rows to write, with the key columns typed as in the table
+        table: Target SQLAlchemy table
+
+    Returns:
+        Tuple of (rows to write, earlier rows whose key a later row repeats)
+    """
+    duplicates = frame.clear()
+    for key in _unique_keys(table):
+        if not set(key) <= set(frame.columns):
+            continue
+        keyed = pl.all_horizontal([pl.col(name).is_not_null() for name in key])
+        superseded = keyed & ~pl.struct(key).is_last_distinct()
+        duplicates = pl.concat([duplicates, frame.filter(superseded)])
+        frame = frame.filter(~superseded)
+    return frame, duplicates
+
+
+def duplicate_key_rejects(
+    duplicates: pl.DataFrame, table: Table, line_column: str
+) -> list[tuple[int | None, str, str | None]]:
+    """
+    Describe the rows split_duplicate_keys() left out as rejected rows.
+
+    Args:
+        duplicates: Rows returned as duplicates by split_duplicate_keys()
+        table: Target SQLAlchemy table
+        line_column: Column holding each row's source line
+
+    Returns:
+        (source line, error text, row JSON) per row, as record_rejected_rows() takes them
+    """
+    keys = "; ".join(", ".join(key) for key in _unique_keys(table))
+    error = f"duplicate key ({keys}): a later row with the same key was loaded"
+    return [(row.get(line_column), error, json.dumps(row, default=str)) for row in duplicates.iter_rows(named=True)]
+
+
+def _referencing_tables(cursor: Any, live: str) -> list[str]:
+    """Get the other tables with a foreign key to the live table (TRUNCATE refuses those)."""
+    cursor.execute(
+        """
+        SELECT DISTINCT conrelid::regclass::text
+        FROM pg_constraint
+        WHERE contype = 'f' AND confrelid = to_regclass(%s) AND conrelid <> confrelid
+        ORDER BY 1
+        """,
+        (live,),
+    )
+    return [name for (name,) in cursor.fetchall()]
+
+
+def _copy_polars_frame(cursor: Any, target: str, frame: pl.DataFrame) -> None:
+    """COPY a prepared Polars frame into an already quoted table name."""
+    if frame.is_empty():
+        return
+    buffer = BytesIO()
+    frame.write_csv(buffer, include_header=False)
+    buffer.seek(0)
+    column_list = ", ".join(quote_identifier(name) for name in frame.columns)
+    cursor.copy_expert(f"COPY {target} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _carry_over(cursor: Any, live: str, staging: str, table: Table, rule: MergeRule) -> None:
+    """Copy the primary key and the rule's excluded columns from stored rows with the same natural key."""
+    kept = [column.name for column in table.primary_key]
+    kept += [name for name in rule.exclude_from_update if name not in kept]
+    assignments = ", ".join(f"{quote_identifier(name)} = live.{quote_identifier(name)}" for name in kept)
+    matches = " AND ".join(
+        f"stage.{quote_identifier(name)} = live.{quote_identifier(name)}" for name in rule.conflict_columns
+    )
+    cursor.execute(f"UPDATE {staging} AS stage SET {assignments} FROM {live} AS live WHERE {matches}")
+
+
+def swap_in_frame(
+    connection: Any,
+    table: Table,
+    df: pl.DataFrame,
+    rule: MergeRule | None = None,
+    rejects: Iterable[tuple[int | None, str, str | None]] = (),
+) -> int:
+    """
+    Replace a table's contents with a Polars frame through a staging table.
+
+    The rows are COPY'd into a temporary table shaped like the live table.
+    With a rule, rows whose natural key is already stored keep the stored
+    primary key and the rule's excluded columns, as an upsert with the same
+    rule would leave them. The live table is then truncated and refilled
+    from the staging table. Everything, including recording the rejected
+    rows, runs in one transaction, committed here; on failure it is rolled
+    back and the live table is untouched.
+
+    Args:
+        connection: psycopg2 connection
+        table: Live SQLAlchemy table (must already exist in the database)
+        df: Rows that make up the table's new contents, without duplicate
+            keys (see split_duplicate_keys)
+        rule: Natural key and columns carried over from the stored rows
+        rejects: (source line, error text, row JSON) of rows left out of df,
+            recorded in rejected_rows in the same transaction
+
+    Returns:
+        Number of rows loaded
+
+    Raises:
+        LookupError: If the live table does not exist (migrations not applied)
+        RuntimeError: If other tables have foreign keys to the live table
+    """
+    live = quote_identifier(table.name)
+    staging = quote_identifier(_staging_name(table.name))
+    frame = prepare_polars_frame(df, table)
+    column_list = ", ".join(quote_identifier(name) for name in column_plan(table).names)
+
+    # Rows without ids get fresh UUIDs, as the ORM's client-side default would
+    generate_ids = "id" in column_plan(table).names and "id" not in frame.columns
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", (live,))
+            if cursor.fetchone()[0] is None:
+                raise LookupError(f"Table {table.name} does not exist; run the migrations first")
+            referencing = _referencing_tables(cursor, live)
+            if referencing:
+                raise RuntimeError(
+                    f"Cannot replace the contents of {table.name}: foreign keys of "
+                    f"{', '.join(referencing)} reference it; load it with an upsert instead"
+                )
+
+            # Load the rows into a temporary copy of the live table's columns
+            cursor.execute(f"CREATE TEMP TABLE {staging} (LIKE {live} INCLUDING DEFAULTS) ON COMMIT DROP")
+            if generate_ids:
+                cursor.execute(f"ALTER TABLE {staging} ALTER COLUMN id SET DEFAULT gen_random_uuid()")
+            _copy_polars_frame(cursor, staging, frame)
+            if rule is not None:
+                _carry_over(cursor, live, staging, table, rule)
+
+            # Readers block on TRUNCATE's lock and then see the complete new rows
+            cursor.execute(f"TRUNCATE {live}")
+            cursor.execute(f"INSERT INTO {live} ({column_list}) SELECT {column_list} FROM {staging}")
+            record_rejected_rows(cursor, table.name, rejects)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+
+    return frame.height
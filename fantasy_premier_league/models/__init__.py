@@ -7,15 +7,21 @@ including players, teams, gameweeks, and historical data.
 
 from .all_players import AllPlayers
 from .base import Base
+from .ingestion_state import IngestionState
 from .player import Player
+from .player_crawl_state import PlayerCrawlState
 from .player_history import PlayerGameweekHistory, PlayerSeasonHistory
+from .rejected_row import RejectedRow
 from .team import Team
 
 __all__ = [
     "AllPlayers",
     "Base",
+    "IngestionState",
     "Player",
+    "PlayerCrawlState",
     "PlayerGameweekHistory",
     "PlayerSeasonHistory",
+    "RejectedRow",
     "Team",
 ]
@@ -13,6 +13,8 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+from .column_plan import column_plan
+
 
 class Base(DeclarativeBase):
     """
@@ -34,14 +36,14 @@ class Base(DeclarativeBase):
             Dictionary representation of the model
         """
         result = {}
-        for column in self.__table__.columns:
-            value = getattr(self, column.name)
+        for name in column_plan(type(self)).names:
+            value = getattr(self, name)
             if isinstance(value, datetime):
-                result[column.name] = value.isoformat()
+                result[name] = value.isoformat()
             elif isinstance(value, uuid.UUID):
-                result[column.name] = str(value)
+                result[name] = str(value)
             else:
-                result[column.name] = value
+                result[name] = value
         return result
 
     def __repr__(self) -> str:
@@ -0,0 +1,136 @@
+"""
+Cached per-model column plans for Fantasy Premier League ORM models.
+
+A column plan holds what loaders and serializers need to know about a
+model's columns (names in table order, target Python types, nullability
+and defaults), computed once per table instead of being reflected from
+``__table__.columns`` for every row.
+"""
+
+from collections.abc import Callable, Mapping
+from datetime import datetime
+from functools import cache
+from typing import Any, NamedTuple
+
+from sqlalchemy import Table
+from sqlalchemy.types import TypeEngine
+
+
+class ColumnSpec(NamedTuple):
+    """
+    What a loader needs to know about one column.
+
+    Attributes:
+        name: Column name
+        type: SQLAlchemy column type
+        python_type: Python type values are converted to, if known
+        nullable: Whether the column accepts NULL
+        default: Scalar client-side default, if any
+        primary_key: Whether the column is part of the primary key
+    """
+
+    name: str
+    type: TypeEngine
+    python_type: type | None
+    nullable: bool
+    default: Any
+    primary_key: bool
+
+
+def _to_int(value: Any) -> int:
+    return int(float(value)) if isinstance(value, str) else int(value)
+
+
+def _to_datetime(value: Any) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if isinstance(value, str) else value
+
+
+# Converters applied to incoming values, keyed by the column's Python type
+_CONVERTERS: dict[type, Callable[[Any], Any]] = {
+    int: _to_int,
+    float: float,
+    datetime: _to_datetime,
+}
+
+
+class ColumnPlan:
+    """
+    Precomputed column information for one table.
+
+    Attributes:
+        columns: Column specs in table order
+        names: Column names in table order
+        data_names: Names of the non-primary-key columns
+    """
+
+    def __init__(self, table: Table) -> None:
+        """
+        Build the plan for a table.
+
+        Args:
+            table: SQLAlchemy table
+        """
+        self.columns = tuple(_column_spec(column) for column in table.columns)
+        self.names = tuple(spec.name for spec in self.columns)
+        self.data_names = tuple(spec.name for spec in self.columns if not spec.primary_key)
+        self._converters = {
+            spec.name: _CONVERTERS[spec.python_type]
+            for spec in self.columns
+            if spec.python_type in _CONVERTERS
+        }
+
+    def values_from(self, data: Mapping[str, Any]) -> dict[str, Any]:
+        """
+        Pick a record's values for the non-primary-key columns, converted to their Python types.
+
+        Args:
+            data: Record keyed by column name (e.g., an FPL API object)
+
+        Returns:
+            Values of the columns present in data
+        """
+        values = {}
+        for name in self.data_names:
+            if name not in data:
+                continue
+            value = data[name]
+            converter = self._converters.get(name)
+            values[name] = converter(value) if converter is not None and value is not None else value
+        return values
+
+
+def _column_spec(column: Any) -> ColumnSpec:
+    """Describe one SQLAlchemy column."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    return ColumnSpec(
+        name=column.name,
+        type=column.type,
+        python_type=python_type,
+        nullable=bool(column.nullable),
+        default=default,
+        primary_key=bool(column.primary_key),
+    )
+
+
+@cache
+def _plan_for_table(table: Table) -> ColumnPlan:
+    return ColumnPlan(table)
+
+
+def column_plan(target: type | Table) -> ColumnPlan:
+    """
+    Get the cached column plan of a model class or table.
+
+    Args:
+        target: ORM model class or SQLAlchemy table
+
+    Returns:
+        The table's column plan, built on first use
+    """
+    table = target if isinstance(target, Table) else target.__table__
+    return _plan_for_table(table)
@@ -0,0 +1,40 @@
+"""
+Ingestion state model for Fantasy Premier League application.
+
+This module defines the model that records how far each historical
+season has been loaded, so reruns only process new gameweeks.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class IngestionState(Base):
+    """
+    Per-season high-water mark for historical gameweek loads.
+
+    Attributes:
+        season: Season name (e.g., "2023-24")
+        last_round: Highest round loaded into the season table
+        content_digest: SHA-256 digest of the source file last loaded
+        rows_loaded: Number of rows in the season table after the last load
+        closed: True once a finished season has been fully loaded
+        updated_at: Time of the last load
+    """
+
+    __tablename__ = "ingestion_state"
+
+    season: Mapped[str] = mapped_column(String(10), nullable=False, unique=True, index=True)
+    last_round: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    content_digest: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    rows_loaded: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    closed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        """String representation of the ingestion state."""
+        return f"<IngestionState(season='{self.season}', last_round={self.last_round}, closed={self.closed})>"
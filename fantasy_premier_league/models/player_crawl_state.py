@@ -0,0 +1,45 @@
+"""
+Player crawl state model for Fantasy Premier League application.
+
+This module defines the model that checkpoints the element-summary
+crawl per player, so an interrupted crawl resumes where it stopped and
+recently fetched or unchanged players are not fetched again.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class PlayerCrawlState(Base):
+    """
+    Per-player checkpoint of the element-summary crawl.
+
+    Attributes:
+        fpl_id: FPL ID of the player
+        status: Outcome of the last attempt ("done", "not_found" or "failed")
+        content_digest: SHA-256 digest of the last element summary stored
+        element_digest: SHA-256 digest of the player's bootstrap-static counters at the last success
+        attempts: Attempts since the last success
+        last_error: Error of the last failed attempt, if any
+        last_success_at: Time the player's summary was last fetched successfully
+        updated_at: Time of the last attempt
+    """
+
+    __tablename__ = "player_crawl_state"
+
+    fpl_id: Mapped[int] = mapped_column(Integer, nullable=False, unique=True, index=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    content_digest: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    element_digest: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_success_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        """String representation of the crawl state."""
+        return f"<PlayerCrawlState(fpl_id={self.fpl_id}, status='{self.status}')>"
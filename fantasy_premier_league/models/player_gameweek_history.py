@@ -7,7 +7,15 @@ the performance history of players in individual gameweeks.
 
 from uuid import uuid4
 
-from sqlalchemy import UUID, BigInteger, Boolean, Float, Integer, String
+from sqlalchemy import (
+    UUID,
+    BigInteger,
+    Boolean,
+    Float,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -19,7 +27,15 @@ class PlayerGameweekHistory16_17(Base):
     """
 
     __tablename__ = "player_gameweek_history_2016_17"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint(
+            "element",
+            "fixture",
+            "round",
+            name="uq_player_gameweek_history_2016_17_element_fixture_round",
+        ),
+        {"extend_existing": True},
+    )
 
     id: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     name: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -75,7 +91,15 @@ class PlayerGameweekHistory17_18(Base):
     """
 
     __tablename__ = "player_gameweek_history_2017_18"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint(
+            "element",
+            "fixture",
+            "round",
+            name="uq_player_gameweek_history_2017_18_element_fixture_round",
+        ),
+        {"extend_existing": True},
+    )
 
     id: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     name: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -131,7 +155,15 @@ class PlayerGameweekHistory18_19(Base):
     """
 
     __tablename__ = "player_gameweek_history_2018_19"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint(
+            "element",
+            "fixture",
+            "round",
+            name="uq_player_gameweek_history_2018_19_element_fixture_round",
+        ),
+        {"extend_existing": True},
+    )
 
     id: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     name: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -187,7 +219,15 @@ class PlayerGameweekHistory19_20(Base):
     """
 
     __tablename__ = "player_gameweek_history_2019_20"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint(
+            "element",
+            "fixture",
+            "round",
+            name="uq_player_gameweek_history_2019_20_element_fixture_round",
+        ),
+        {"extend_existing": True},
+    )
 
     name: Mapped[str | None] = mapped_column(String, nullable=True)
     position: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -243,7 +283,15 @@ class PlayerGameweekHistory20_21(Base):
     """
 
     __tablename__ = "player_gameweek_history_2020_21"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint(
+            "element",
+            "fixture",
+            "round",
+            name="uq_player_gameweek_history_2020_21_element_fixture_round",
+        ),
+        {"extend_existing": True},
+    )
 
     id: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     name: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -299,7 +347,15 @@ class PlayerGameweekHistory21_22(Base):
     """
 
     __tablename__ = "player_gameweek_history_2021_22"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint(
+            "element",
+            "fixture",
+            "round",
+            name="uq_player_gameweek_history_2021_22_element_fixture_round",
+        ),
+        {"extend_existing": True},
+    )
 
     id: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     name: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -355,7 +411,15 @@ class PlayerGameweekHistory22_23(Base):
     """
 
     __tablename__ = "player_gameweek_history_2022_23"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint(
+            "element",
+            "fixture",
+            "round",
+            name="uq_player_gameweek_history_2022_23_element_fixture_round",
+        ),
+        {"extend_existing": True},
+    )
 
     id: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     name: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -411,7 +475,15 @@ class PlayerGameweekHistory23_24(Base):
     """
 
     __tablename__ = "player_gameweek_history_2023_24"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint(
+            "element",
+            "fixture",
+            "round",
+            name="uq_player_gameweek_history_2023_24_element_fixture_round",
+        ),
+        {"extend_existing": True},
+    )
 
     id: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     name: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -467,7 +539,15 @@ class PlayerGameweekHistory24_25(Base):
     """
 
     __tablename__ = "player_gameweek_history_2024_25"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint(
+            "element",
+            "fixture",
+            "round",
+            name="uq_player_gameweek_history_2024_25_element_fixture_round",
+        ),
+        {"extend_existing": True},
+    )
 
     id: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     name: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -15,6 +15,7 @@ from sqlalchemy import (
     ForeignKey,
     Integer,
     String,
+    UniqueConstraint,
     Uuid,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -60,6 +61,11 @@ class PlayerGameweekHistory(Base):
     """
 
     __tablename__ = "player_gameweek_history"
+    __table_args__ = (
+        UniqueConstraint(
+            "player_id", "gameweek", "season", name="uq_player_gameweek_season"
+        ),
+    )
 
     player_id: Mapped[Uuid] = mapped_column(Uuid, nullable=False)
     gameweek: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,38 @@
+"""
+Rejected row model for Fantasy Premier League application.
+
+This module defines the model that keeps source rows which could not
+be loaded, so bulk loads can isolate bad rows without losing them.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class RejectedRow(Base):
+    """
+    A source row that was rejected during a bulk load.
+
+    Attributes:
+        table_name: Table the row was meant for
+        source_line: Line of the row in the source file, if known
+        error: Reason the row was rejected
+        row_data: JSON of the row as it was sent to the database, if it got that far
+        created_at: Time the row was rejected
+    """
+
+    __tablename__ = "rejected_rows"
+
+    table_name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    source_line: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    error: Mapped[str] = mapped_column(Text, nullable=False)
+    row_data: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        """String representation of the rejected row."""
+        return f"<RejectedRow(table_name='{self.table_name}', source_line={self.source_line})>"
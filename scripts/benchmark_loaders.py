@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark the FPL API loaders against the local stand-in server.
+
+Starts a stand-in server (see fantasy_premier_league.data_utils.api_standin)
+replaying recorded or synthetic payloads, with optional injected latency,
+errors and 429 responses, and drives the loaders' fetch and mapping code
+against it:
+
+- crawl: the element-summary crawler, once per --max-concurrency value,
+  mapping each summary to player_gameweek_history/player_season_history rows
+- live: the event-live loader, fetching /fixtures/ and each gameweek's
+  /event/{gw}/live/ and mapping them with gameweek_rows()
+
+Nothing is written to the database, so the numbers measure the HTTP and
+mapping side. Reports requests/s, rows/s and p50/p99 request latency.
+The real loaders can be pointed at a server started with
+``python -m fantasy_premier_league.data_utils.api_standin serve`` through
+FPL_API_BASE_URL.
+
+Run this script from the project root directory.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from uuid import uuid4
+
+import polars as pl
+
+from fantasy_premier_league.data_utils.api_standin import FaultProfile, StandInServer, payload_path, synthetic_payloads
+from fantasy_premier_league.data_utils.element_crawler import CrawlerConfig, ElementSummaryCrawler
+from fantasy_premier_league.data_utils.gameweek_live import (
+    fetch_fixtures,
+    fetch_gameweek_live,
+    finished_gameweeks,
+    fixtures_frame,
+    gameweek_rows,
+    live_frame,
+)
+from fantasy_premier_league.data_utils.http_client import HttpClient, get_http_client
+from fantasy_premier_league.models.column_plan import column_plan
+from fantasy_premier_league.models.player_history import PlayerGameweekHistory, PlayerSeasonHistory
+
+BENCHMARK_SEASON = "2024-25"
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput and latency of one benchmark run."""
+
+    name: str
+    requests: int
+    failures: int
+    rows: int
+    seconds: float
+    p50: float
+    p99: float
+
+    def report(self) -> None:
+        """Print the run's numbers in one line."""
+        seconds = self.seconds or float("nan")
+        print(
+            f"  {self.name:<24} {self.requests / seconds:>9.1f} req/s {self.rows / seconds:>10.0f} rows/s   "
+            f"p50 {self.p50 * 1000:>6.1f} ms  p99 {self.p99 * 1000:>7.1f} ms   "
+            f"{self.requests} requests ({self.failures} failed), {self.rows} rows in {self.seconds:.2f}s"
+        )
+
+
+def _client_result(name: str, client: HttpClient, rows: int, seconds: float) -> BenchmarkResult:
+    stats = client.stats().values()
+    p50, p99 = client.latency_percentiles()
+    return BenchmarkResult(
+        name=name,
+        requests=sum(host.requests for host in stats),
+        failures=sum(host.failures for host in stats),
+        rows=rows,
+        seconds=seconds,
+        p50=p50,
+        p99=p99,
+    )
+
+
+def benchmark_crawl(element_ids: list[int], rate: float, max_concurrency: int) -> BenchmarkResult:
+    """
+    Crawl element summaries and map them to history rows.
+
+    Args:
+        element_ids: Players to crawl
+        rate: Maximum requests per second
+        max_concurrency: Upper bound on requests in flight
+
+    Returns:
+        The run's numbers
+    """
+    gw_plan = column_plan(PlayerGameweekHistory)
+    season_plan = column_plan(PlayerSeasonHistory)
+    rows = 0
+    lock = Lock()
+
+    def handle(player_id: int, summary: dict[str, Any] | None) -> None:
+        nonlocal rows
+        if summary is None:
+            return
+        mapped = [gw_plan.values_from(gw) for gw in summary.get("history", [])]
+        mapped += [season_plan.values_from(season) for season in summary.get("history_past", [])]
+        with lock:
+            rows += len(mapped)
+
+    crawler = ElementSummaryCrawler(
+        config=CrawlerConfig(rate=rate, burst=max_concurrency, max_concurrency=max_concurrency)
+    )
+    stats = crawler.crawl(element_ids, handle)
+    result = _client_result(f"crawl (concurrency {max_concurrency})", crawler.client, rows, stats.seconds)
+    print(
+        f"    fetched {stats.fetched}, not found {stats.not_found}, failed {stats.failed}, "
+        f"{stats.retries} retries, {stats.throttled} throttled, peak concurrency {stats.peak_concurrency:.1f}"
+    )
+    crawler.client.close()
+    return result
+
+
+def benchmark_live(players: pl.DataFrame) -> BenchmarkResult:
+    """
+    Fetch every played gameweek from the event-live endpoint and map it to history rows.
+
+    Args:
+        players: Players with fpl_id, id (UUID) and team_id columns, as the loader reads them
+
+    Returns:
+        The run's numbers
+    """
+    started = time.monotonic()
+    fixtures = fixtures_frame(fetch_fixtures())
+    rows = 0
+    for gameweek in finished_gameweeks(fixtures):
+        live = live_frame(fetch_gameweek_live(gameweek))
+        rows += gameweek_rows(live, fixtures, players, BENCHMARK_SEASON, gameweek)[0].height
+    return _client_result("live", get_http_client(), rows, time.monotonic() - started)
+
+
+def _stored_players(directory: Path) -> pl.DataFrame:
+    """Stand-in for the players table, built from the replayed bootstrap-static payload."""
+    elements = json.loads(payload_path(directory, "bootstrap-static/").read_text(encoding="utf-8"))["elements"]
+    return pl.DataFrame(
+        [(element["id"], str(uuid4()), element["team"]) for element in elements],
+        schema={"fpl_id": pl.Int64, "id": pl.String, "team_id": pl.Int64},
+        orient="row",
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the FPL API loaders against a local stand-in server")
+    parser.add_argument(
+        "--payloads", type=Path, default=None, help="Recorded payloads (defaults to a generated synthetic season)"
+    )
+    parser.add_argument("--players", type=int, default=700, help="Players in the synthetic season")
+    parser.add_argument("--gameweeks", type=int, default=10, help="Gameweeks in the synthetic season")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        action="append",
+        help="Crawler concurrency cap to run (repeatable; default 8, 32)",
+    )
+    parser.add_argument("--request-rate", type=float, default=1000.0, help="Crawler request rate limit per second")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the server adds to every response")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Up to this many extra seconds at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After of injected 429s, in whole seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = args.payloads
+        if directory is None:
+            directory = Path(scratch)
+            synthetic_payloads(directory, players=args.players, gameweeks=args.gameweeks)
+        element_ids = sorted(int(path.stem) for path in (directory / "element-summary").glob("*.json"))
+
+        faults = FaultProfile(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.retry_after, seed=0)
+        server = StandInServer(directory, faults=faults)
+        with server:
+            os.environ["FPL_API_BASE_URL"] = server.base_url
+            print(f"Stand-in server at {server.base_url}: {len(element_ids)} element summaries")
+            results = [
+                benchmark_crawl(element_ids, args.request_rate, concurrency)
+                for concurrency in args.max_concurrency or [8, 32]
+            ]
+            results.append(benchmark_live(_stored_players(directory)))
+
+        print("\nResults:")
+        for result in results:
+            result.report()
+        responses = ", ".join(f"{status}: {count}" for status, count in sorted(server.responses.items()))
+        print(f"\nServer responses by status: {responses}")
+
+
+if __name__ == "__main__":
+    main()
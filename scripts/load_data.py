@@ -14,10 +14,11 @@ import argparse
 import os
 from threading import Lock
 
-import requests
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from fantasy_premier_league.data_utils.http_client import fpl_api_url, http_get
+
 # Import the models
 from fantasy_premier_league.models.player import Player
 from fantasy_premier_league.models.team import Team
@@ -59,8 +60,8 @@ def load_teams_and_players(refresh: bool = False) -> None:
 
     try:
         # FPL API endpoint for general information
-        url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-        response = requests.get(url, timeout=10)
+        url = fpl_api_url("bootstrap-static/")
+        response = http_get(url)
         response.raise_for_status()  # Raise an exception for bad status codes
 
         data = response.json()
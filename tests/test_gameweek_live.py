@@ -0,0 +1,66 @@
+"""Tests for mapping event-live payloads to player_gameweek_history rows."""
+
+import polars as pl
+
+from fantasy_premier_league.data_utils.gameweek_live import fixtures_frame, gameweek_rows, live_frame
+
+SEASON = "2024-25"
+HOME_TEAM, AWAY_TEAM = 1, 2
+
+FIXTURES = [
+    {
+        "id": 1,
+        "event": 1,
+        "team_h": HOME_TEAM,
+        "team_a": AWAY_TEAM,
+        "team_h_score": 2,
+        "team_a_score": 0,
+        "kickoff_time": "2024-08-16T19:00:00Z",
+        "stats": [{"identifier": "bps", "h": [{"value": 30, "element": 10}], "a": [{"value": 12, "element": 20}]}],
+    }
+]
+
+# Player 10 played for team 1 in gameweek 1 and has since moved to team 3
+PLAYERS = pl.DataFrame(
+    {
+        "fpl_id": [10, 20, 30],
+        "id": [
+            "00000000-0000-0000-0000-000000000010",
+            "00000000-0000-0000-0000-000000000020",
+            "00000000-0000-0000-0000-000000000030",
+        ],
+        "team_id": [3, 2, 3],
+    }
+)
+
+
+def _live(*elements: tuple[int, int]) -> pl.DataFrame:
+    return live_frame(
+        {
+            "elements": [
+                {"id": element, "explain": [{"fixture": 1}], "stats": {"minutes": minutes, "total_points": 2}}
+                for element, minutes in elements
+            ]
+        }
+    )
+
+
+def test_transferred_player_keeps_the_side_they_played_for() -> None:
+    rows, rejected = gameweek_rows(_live((10, 90), (20, 90)), fixtures_frame(FIXTURES), PLAYERS, SEASON, 1)
+
+    by_player = {row["player_id"]: row for row in rows.iter_rows(named=True)}
+    transferred = by_player["00000000-0000-0000-0000-000000000010"]
+    assert transferred["was_home"] is True
+    assert transferred["opponent_team_id"] == AWAY_TEAM
+    assert by_player["00000000-0000-0000-0000-000000000020"]["was_home"] is False
+    assert rejected.is_empty()
+
+
+def test_unplaceable_players_are_rejected_with_a_reason() -> None:
+    # Player 30 had no minutes (no bps entry) and is now at neither team; 40 is not stored
+    rows, rejected = gameweek_rows(_live((30, 0), (40, 90)), fixtures_frame(FIXTURES), PLAYERS, SEASON, 1)
+
+    assert rows.is_empty()
+    reasons = dict(zip(rejected["element"], rejected["reason"], strict=True))
+    assert reasons[40] == "player not stored"
+    assert reasons[30].startswith("side unknown")